@@ -0,0 +1,207 @@
+"""In-process account store behind the account tools.
+
+Accounts get sequential ACC-### IDs. Emails are unique and indexed in a hash map
+(case-insensitive). Names are indexed by word: a hash map from each lower-cased name
+word to the accounts containing it, plus a sorted list of the distinct words, so a
+query like "jo do" is a binary search per query word for the words it prefixes,
+then the matches of the most selective word are intersected with the others. Distinct name words grow far slower than accounts, so
+the sorted list stays small at millions of accounts. All reads and writes take one lock.
+
+The store starts with the accounts the mock history and test prompt refer to. The tools
+use current(), which is ACCOUNTS unless scoped() set another store, as eval_runner does
+to give every iteration its own.
+
+    python -m benchmarks.bench_accounts --accounts 100000 1000000
+"""
+
+import bisect
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass
+
+
+SEED_ACCOUNTS = (
+    ("Michael Man", "mikeman@gmail.com"),
+    ("John Doe", "john@example.com"),
+)
+
+
+@dataclass
+class Account:
+    id: str
+    name: str
+    email: str
+
+    def __str__(self):
+        return f"{self.id} - {self.name} ({self.email})"
+
+
+def name_words(name):
+    """The distinct lower-cased words of a name, as indexed for search."""
+    return set(name.lower().split())
+
+
+def email_key(email):
+    """An email as indexed for uniqueness and lookup: stripped and lower-cased."""
+    return email.strip().lower()
+
+
+class AccountStore:
+    """Thread-safe account table with email and name-word indexes.
+
+    Args:
+        accounts: Optional (name, email) pairs to load first.
+    """
+
+    def __init__(self, accounts=()):
+        self._accounts = {}
+        self._by_email = {}
+        self._by_word = {}
+        self._words = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.bulk_load(accounts)
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def _index_name(self, account):
+        for word in name_words(account.name):
+            ids = self._by_word.get(word)
+            if ids is None:
+                self._by_word[word] = {account.id}
+                bisect.insort(self._words, word)
+            else:
+                ids.add(account.id)
+
+    def _unindex_name(self, account):
+        for word in name_words(account.name):
+            ids = self._by_word[word]
+            ids.discard(account.id)
+            if not ids:
+                del self._by_word[word]
+                del self._words[bisect.bisect_left(self._words, word)]
+
+    def _check_email(self, email, account_id=None):
+        existing = self._by_email.get(email_key(email))
+        if existing is not None and existing != account_id:
+            raise ValueError(f"An account already exists for {email.strip()}: {existing}")
+
+    def create(self, name, email):
+        """Add an account and return it. Raises ValueError if the email is taken."""
+        with self._lock:
+            self._check_email(email)
+            account = Account(f"ACC-{next(self._ids):03d}", name, email.strip())
+            self._accounts[account.id] = account
+            self._by_email[email_key(email)] = account.id
+            self._index_name(account)
+        return account
+
+    def bulk_load(self, accounts):
+        """Add many (name, email) pairs at once, sorting the word list once at the end.
+
+        Every email is checked before any account is added, so a ValueError leaves the
+        store unchanged.
+        """
+        accounts = [(name, email.strip()) for name, email in accounts]
+        with self._lock:
+            seen = set()
+            for name, email in accounts:
+                self._check_email(email)
+                if email_key(email) in seen:
+                    raise ValueError(f"{email} appears more than once")
+                seen.add(email_key(email))
+            for name, email in accounts:
+                account = Account(f"ACC-{next(self._ids):03d}", name, email)
+                self._accounts[account.id] = account
+                self._by_email[email_key(email)] = account.id
+                for word in name_words(name):
+                    self._by_word.setdefault(word, set()).add(account.id)
+            self._words = sorted(self._by_word)
+
+    def get(self, account_id):
+        return self._accounts.get(account_id.strip().upper())
+
+    def update(self, account_id, name=None, email=None):
+        """Change an account's name and/or email. Raises ValueError if it's missing or the email is taken."""
+        with self._lock:
+            account = self._accounts.get(account_id.strip().upper())
+            if account is None:
+                raise ValueError(f"No account found with ID {account_id}")
+            email = email and email.strip()
+            if email and email_key(email) != email_key(account.email):
+                self._check_email(email, account.id)
+                del self._by_email[email_key(account.email)]
+                self._by_email[email_key(email)] = account.id
+            if email:
+                account.email = email
+            if name and name != account.name:
+                self._unindex_name(account)
+                account.name = name
+                self._index_name(account)
+        return account
+
+    def _word_sets(self, prefix):
+        """The index sets of every name word starting with `prefix`."""
+        start = bisect.bisect_left(self._words, prefix)
+        sets = []
+        for word in itertools.islice(self._words, start, None):
+            if not word.startswith(prefix):
+                break
+            sets.append(self._by_word[word])
+        return sets
+
+    def search(self, name=None, email=None, limit=10):
+        """Accounts matching an exact email and/or a name whose words start with each query word.
+
+        Returns:
+            (number of matches, up to `limit` matching Accounts in ID order).
+        """
+        with self._lock:
+            if email:
+                account_id = self._by_email.get(email_key(email))
+                ids = {account_id} if account_id else set()
+            else:
+                ids = None
+            # Start from the query word with the fewest matches and intersect it with each
+            # other word's sets (set & set walks the smaller side), so the large sets of
+            # common words are never copied or unioned.
+            groups = sorted((self._word_sets(word) for word in name_words(name or "")),
+                            key=lambda sets: sum(map(len, sets)))
+            for sets in groups:
+                if ids is None:
+                    ids = sets[0] if len(sets) == 1 else set().union(*sets)
+                else:
+                    ids = set().union(*(ids & s for s in sets))
+                if not ids:
+                    break
+            ids = ids or set()
+            found = [self._accounts[i] for i in heapq.nsmallest(limit, ids, key=lambda i: int(i[4:]))]
+        return len(ids), found
+
+
+ACCOUNTS = AccountStore(SEED_ACCOUNTS)
+_SCOPED = contextvars.ContextVar("scoped_accounts", default=None)
+
+
+def current():
+    """The account store the tools use: the one set by scoped() in this context, else ACCOUNTS."""
+    store = _SCOPED.get()
+    return ACCOUNTS if store is None else store
+
+
+@contextlib.contextmanager
+def scoped(store):
+    """Make `store` the account store of the tools run in this context.
+
+    asyncio tasks and to_thread calls started inside inherit it, so it covers a whole
+    agent invocation.
+    """
+    token = _SCOPED.set(store)
+    try:
+        yield store
+    finally:
+        _SCOPED.reset(token)
@@ -0,0 +1,73 @@
+"""Account search latency at large account counts.
+
+Loads N synthetic accounts (names drawn from a few hundred first and last names, so
+many people share each word) and times email lookups, full-name searches and short
+prefix searches against the AccountStore indexes, plus single-account creation.
+
+    python -m benchmarks.bench_accounts --accounts 100000 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from accounts import AccountStore
+
+FIRST_NAMES = [f"{stem}{suffix}" for stem in ("jo", "ja", "mi", "sa", "al", "em", "da", "li", "ro", "ke")
+               for suffix in ("hn", "ne", "ck", "ra", "ex", "ma", "vid", "sa", "bert", "vin", "y", "n", "la",
+                              "ri", "so", "na", "ko", "ta", "mo", "za")]
+LAST_NAMES = [f"{a}{b}{c}" for a in ("b", "c", "d", "f", "g", "h", "m", "p", "r", "s")
+              for b in ("ar", "el", "in", "or", "un") for c in ("son", "ley", "ton", "ez", "man", "er")]
+
+
+def make_accounts(count, seed=0):
+    rng = random.Random(seed)
+    return [(f"{rng.choice(FIRST_NAMES).title()} {rng.choice(LAST_NAMES).title()}", f"user{i}@example.com")
+            for i in range(count)]
+
+
+def latencies(fn, queries):
+    times = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        times.append(time.perf_counter() - started)
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{len(FIRST_NAMES)} first names x {len(LAST_NAMES)} last names")
+    print(f"{'accounts':>9}  {'operation':<26}{'p50 us':>10}{'p99 us':>10}{'avg hits':>10}")
+    for count in args.accounts:
+        accounts = make_accounts(count)
+        started = time.perf_counter()
+        store = AccountStore(accounts)
+        print(f"{count:>9}  {'bulk load':<26}{(time.perf_counter() - started) * 1e6 / count:>10.2f}"
+              f"{'':>10}{'':>10}  (per account)")
+
+        rng = random.Random(1)
+        sample = [accounts[rng.randrange(count)] for _ in range(args.queries)]
+        cases = {
+            "email": (lambda q: store.search(email=q), [email for _, email in sample]),
+            "full name": (lambda q: store.search(name=q), [name for name, _ in sample]),
+            "two-word prefix": (lambda q: store.search(name=q),
+                                [" ".join(word[:3] for word in name.split()) for name, _ in sample]),
+            "last-name prefix": (lambda q: store.search(name=q), [name.split()[1][:4] for name, _ in sample]),
+            "name + email": (lambda q: store.search(name=q[0], email=q[1]), sample),
+        }
+        for label, (fn, queries) in cases.items():
+            times = latencies(fn, queries)
+            hits = statistics.mean(fn(q)[0] for q in queries[:200])
+            p99 = statistics.quantiles(times, n=100)[98]
+            print(f"{count:>9}  {label:<26}{statistics.median(times) * 1e6:>10.1f}{p99 * 1e6:>10.1f}{hits:>10.0f}")
+
+        new = [(f"New Person{i}", f"new{i}@example.com") for i in range(args.queries)]
+        times = latencies(lambda pair: store.create(*pair), new)
+        print(f"{count:>9}  {'create':<26}{statistics.median(times) * 1e6:>10.1f}"
+              f"{statistics.quantiles(times, n=100)[98] * 1e6:>10.1f}")
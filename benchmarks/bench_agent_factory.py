@@ -0,0 +1,88 @@
+"""Agent construction benchmark: agents created per second and memory per agent.
+
+Compares building a fresh BedrockModel for every agent against create_agent(shared=True),
+for both the agent.py and prompt_eng_agent.py variants. Each configuration runs in its
+own subprocess so RSS numbers don't leak between runs. No Bedrock calls are made; only
+client construction is measured, so any region works.
+
+    python -m benchmarks.bench_agent_factory --agents 50
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+VARIANTS = ("agent", "prompt_eng_agent")
+MODES = ("per_agent", "shared")
+
+
+def _rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(variant, mode, count):
+    """Create `count` agents and keep them alive; return throughput and memory figures."""
+    import importlib
+    module = importlib.import_module(variant)
+    shared = mode == "shared"
+    def new_agent(**kwargs):
+        # Models are built lazily on the first model call; build them here so client construction is measured.
+        agent = module.create_agent(callback_handler=None, shared=shared, **kwargs)
+        agent.model.load()
+        return agent
+
+    new_agent()  # warm imports and the shared model
+
+    def build():
+        return [new_agent(load_history=True) for _ in range(count)]
+
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+    agents = build()
+    elapsed = time.perf_counter() - started
+    rss_after = _rss_bytes()
+
+    # Heap is traced in a second pass because tracemalloc slows construction down.
+    tracemalloc.start()
+    more_agents = build()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "variant": variant,
+        "mode": mode,
+        "agents": len(agents) + len(more_agents),
+        "agents_per_second": count / elapsed,
+        "rss_kib_per_agent": (rss_after - rss_before) / count / 1024,
+        "heap_kib_per_agent": traced / count / 1024,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child, args.agents)))
+        sys.exit(0)
+
+    env = dict(os.environ)
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    print(f"{'variant':<18}{'mode':<11}{'agents/s':>10}{'RSS KiB/agent':>16}{'heap KiB/agent':>16}")
+    for variant in VARIANTS:
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_agent_factory", "--agents", str(args.agents),
+                 "--child", variant, mode],
+                capture_output=True, text=True, check=True, env=env,
+            ).stdout
+            row = json.loads(out.strip().splitlines()[-1])
+            print(f"{variant:<18}{mode:<11}{row['agents_per_second']:>10.1f}"
+                  f"{row['rss_kib_per_agent']:>16.1f}{row['heap_kib_per_agent']:>16.1f}")
@@ -0,0 +1,54 @@
+"""Agent-loop throughput benchmark against the offline ScriptedModel.
+
+Drives each of the nine tools in TOOLS through a full agent loop with no network,
+so the numbers are pure framework overhead (tool dispatch, hooks, history handling)
+plus whatever synthetic model latency is configured.
+
+    python -m benchmarks.bench_agent_loop --runs 50
+    python -m benchmarks.bench_agent_loop --runs 10 --ttft 0.2 --tokens-per-second 80
+"""
+
+import argparse
+import statistics
+import time
+
+from eval_runner import ToolCallRecorder, load_variant
+from local_model import ALL_TOOLS_PLAN, VEGAN_TEST_PLAN, ScriptedModel
+
+
+PLANS = {"all_tools": ALL_TOOLS_PLAN, "vegan_test": VEGAN_TEST_PLAN}
+
+
+def bench(variant, plan, runs, load_history, ttft, tokens_per_second):
+    module = load_variant(variant)
+    model = ScriptedModel.from_plan(plan, time_to_first_token=ttft, tokens_per_second=tokens_per_second)
+    durations = []
+    tool_calls = 0
+    for _ in range(runs):
+        recorder = ToolCallRecorder()
+        agent = module.create_agent(model=model, hooks=[recorder], callback_handler=None, load_history=load_history)
+        started = time.perf_counter()
+        agent("Go.")
+        durations.append(time.perf_counter() - started)
+        tool_calls += len(recorder.tool_calls)
+    return durations, tool_calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--variant", default="agent")
+    parser.add_argument("--plan", choices=sorted(PLANS), default="all_tools")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--no-history", action="store_true")
+    parser.add_argument("--ttft", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float)
+    args = parser.parse_args()
+
+    durations, tool_calls = bench(args.variant, PLANS[args.plan], args.runs, not args.no_history, args.ttft,
+                                  args.tokens_per_second)
+    total = sum(durations)
+    print(f"variant={args.variant} plan={args.plan} runs={args.runs} history={not args.no_history}")
+    print(f"  invocation p50: {statistics.median(durations) * 1000:.2f} ms")
+    print(f"  invocation max: {max(durations) * 1000:.2f} ms")
+    print(f"  invocations/s:  {args.runs / total:.1f}")
+    print(f"  tool calls/s:   {tool_calls / total:.1f}")
@@ -0,0 +1,112 @@
+"""Cold start of the agent entry points: import time, time to prompt and to first output.
+
+Each measurement runs in a fresh interpreter:
+
+- import: `python -X importtime -c "import <variant>"`, reporting the module's cumulative
+  import time, the slowest modules it pulls in (by self time) and whether strands was
+  imported at all.
+- prompt: `python -u <variant>.py --local` started until the "You:" prompt is shown.
+- first output: after the prompt, waits --typing-delay seconds (the user typing), sends a
+  message and times the first streamed output of the reply. The local ScriptedModel
+  answers with no model latency, so this is the time the agent itself adds.
+
+--max-import-ms makes the run exit with status 1 if any variant's import takes longer,
+for use as a regression check.
+
+    python -m benchmarks.bench_cold_start --runs 5 --max-import-ms 100
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+VARIANTS = ("agent", "prompt_eng_agent")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_times(variant):
+    """(cumulative ms of `variant`, {module: self ms}) from one -X importtime run.
+
+    Only modules imported under `variant` count; site's own imports are skipped.
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {variant}"],
+                            capture_output=True, text=True, check=True).stderr
+    modules = {}
+    for match in IMPORT_LINE.finditer(stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = int(self_us) / 1000
+        if not indent:  # children are listed before their top-level parent
+            if name == variant:
+                return int(cumulative_us) / 1000, modules
+            modules = {}
+    raise RuntimeError(f"no import time reported for {variant}")
+
+
+def _read_until(stream, marker, started):
+    """Read the unbuffered stdout until `marker` appears; return the elapsed seconds."""
+    seen = b""
+    while marker not in seen:
+        chunk = os.read(stream.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError(f"process exited before printing {marker!r}: {seen.decode()[-500:]}")
+        seen += chunk
+    return time.perf_counter() - started
+
+
+def session_times(variant, typing_delay):
+    """(seconds to the first prompt, seconds from sending a message to its first output)."""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-u", f"{variant}.py", "--local"],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        to_prompt = _read_until(process.stdout, b"You: ", started)
+        time.sleep(typing_delay)
+        sent = time.perf_counter()
+        process.stdin.write(b"Is the lava cake vegan?\n")
+        process.stdin.flush()
+        # The callback handler's first print is a newline before the first tool name or text.
+        to_output = _read_until(process.stdout, b"\n", sent)
+        process.stdin.write(b"quit\n")
+        process.stdin.flush()
+        process.wait(timeout=30)
+    finally:
+        process.kill()
+    return to_prompt, to_output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--typing-delay", type=float, default=1.0, help="Seconds between prompt and message")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imported modules to list per variant")
+    parser.add_argument("--max-import-ms", type=float, help="Exit with status 1 if an import takes longer")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'variant':<18}{'import p50':>12}{'strands':>9}{'prompt p50':>12}{'first output p50':>18}")
+    slowest = {}
+    for variant in VARIANTS:
+        imports = [import_times(variant) for _ in range(args.runs)]
+        sessions = [session_times(variant, args.typing_delay) for _ in range(args.runs)]
+        import_ms = statistics.median(total for total, _ in imports)
+        prompt_ms = statistics.median(to_prompt for to_prompt, _ in sessions) * 1000
+        output_ms = statistics.median(to_output for _, to_output in sessions) * 1000
+        modules = imports[-1][1]
+        print(f"{variant:<18}{import_ms:>9.1f} ms{'yes' if 'strands' in modules else 'no':>9}"
+              f"{prompt_ms:>9.0f} ms{output_ms:>15.0f} ms")
+        slowest[variant] = sorted(modules.items(), key=lambda item: -item[1])[:args.top]
+        if args.max_import_ms is not None and import_ms > args.max_import_ms:
+            over_budget.append(f"{variant}: {import_ms:.1f} ms > {args.max_import_ms:.0f} ms")
+
+    for variant, modules in slowest.items():
+        print(f"\nslowest imports of {variant} (self time):")
+        for name, ms in modules:
+            print(f"  {name:<40}{ms:>8.1f} ms")
+
+    if over_budget:
+        print("\nimport budget exceeded: " + "; ".join(over_budget))
+        sys.exit(1)
@@ -0,0 +1,80 @@
+"""Request size and turn latency under the sliding window vs the token budget.
+
+Runs a multi-turn session (the vegan test plan, repeated) on one agent that starts from
+a generated history of each size, once with the 200-message sliding window and once with
+a TokenBudgetConversationManager. The ScriptedModel charges a synthetic prefill delay
+per input token, so turn latency follows request size as it would on a real model.
+Reported: input tokens per model call, first-turn and median turn latency, and time spent
+in the conversation manager per call next to the cost of re-counting the whole history,
+which the per-message cache avoids.
+
+    python -m benchmarks.bench_conversation --history-tokens 20000 100000 --budget 8000
+"""
+
+import argparse
+import statistics
+import time
+
+from agent import create_agent
+from conversation import TokenBudgetConversationManager
+from eval_runner import TEST_PROMPT, TimingRecorder
+from history import SharedHistory, estimate_tokens, generate_history
+from local_model import VEGAN_TEST_PLAN, ScriptedModel
+
+
+def timed(manager):
+    """Wrap the manager's apply_management to record how long each call takes."""
+    times = []
+    apply_management = manager.apply_management
+
+    def wrapper(agent, **kwargs):
+        started = time.perf_counter()
+        apply_management(agent, **kwargs)
+        times.append(time.perf_counter() - started)
+
+    manager.apply_management = wrapper
+    return times
+
+
+def session(history, manager, turns, prefill_rate):
+    model = ScriptedModel.from_plan(VEGAN_TEST_PLAN, input_tokens_per_second=prefill_rate)
+    recorder = TimingRecorder()
+    agent = create_agent(model=model, hooks=[recorder], callback_handler=None, load_history=history,
+                         conversation_manager=manager)
+    manager_times = timed(agent.conversation_manager)
+    latencies = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        agent(TEST_PROMPT)
+        latencies.append(time.perf_counter() - started)
+    started = time.perf_counter()
+    estimate_tokens(agent.messages)
+    recount = time.perf_counter() - started
+    input_tokens = [call["input_tokens"] for call in recorder.model_calls]
+    return latencies, input_tokens, manager_times, recount, len(agent.messages)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history-tokens", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--budget", type=int, default=8000, help="Token budget for the token_budget manager")
+    parser.add_argument("--turns", type=int, default=5, help="User turns per session")
+    parser.add_argument("--prefill-rate", type=float, default=50000,
+                        help="Synthetic input tokens per second charged before each model reply")
+    args = parser.parse_args()
+
+    print(f"{'history':>8}  {'manager':<14}{'msgs':>6}{'in tok/call':>12}{'1st turn ms':>12}{'turn p50 ms':>12}"
+          f"{'mgr us/call':>12}{'recount us':>11}")
+    for target in args.history_tokens:
+        messages, _ = generate_history(target_tokens=target)
+        history = SharedHistory(messages)
+        managers = {
+            "sliding_window": "sliding_window",
+            f"budget {args.budget}": TokenBudgetConversationManager(args.budget),
+        }
+        for label, manager in managers.items():
+            latencies, input_tokens, manager_times, recount, final = session(history, manager, args.turns,
+                                                                              args.prefill_rate)
+            print(f"{target:>8}  {label:<14}{final:>6}{statistics.mean(input_tokens):>12,.0f}"
+                  f"{latencies[0] * 1000:>12.1f}{statistics.median(latencies) * 1000:>12.1f}{statistics.mean(manager_times) * 1e6:>12.1f}"
+                  f"{recount * 1e6:>11.1f}")
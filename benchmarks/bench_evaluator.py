@@ -0,0 +1,40 @@
+"""Evaluator scaling benchmark.
+
+Replicates the committed results into many synthetic models with many iterations each,
+then times the flatten step (the only per-call Python loop) and the vectorized metrics
+pass separately.
+
+    python -m benchmarks.bench_evaluator --models 12 --iterations 5000
+"""
+
+import argparse
+import time
+
+from evaluator import compute_metrics, flatten
+from results_io import iter_results
+
+SOURCES = ("sonnet_test_results.json", "opus_test_results.json", "kimi_test_results.json")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, default=12)
+    parser.add_argument("--iterations", type=int, default=5000, help="Iterations per model")
+    args = parser.parse_args()
+
+    recorded = [list(iter_results(path)) for path in SOURCES]
+    results_by_model = {}
+    for m in range(args.models):
+        source = recorded[m % len(recorded)]
+        results_by_model[f"model{m}"] = [source[i % len(source)] for i in range(args.iterations)]
+
+    started = time.perf_counter()
+    table = flatten(results_by_model)
+    flattened = time.perf_counter()
+    compute_metrics(table)
+    finished = time.perf_counter()
+
+    runs = args.models * args.iterations
+    print(f"{runs} iterations, {len(table.run)} tool calls across {args.models} models")
+    print(f"  flatten: {(flattened - started) * 1000:.1f} ms")
+    print(f"  metrics: {(finished - flattened) * 1000:.1f} ms")
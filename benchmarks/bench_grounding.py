@@ -0,0 +1,69 @@
+"""Response-grounding throughput over a large transcript corpus.
+
+Builds --transcripts transcripts from the recorded ones of the committed results files,
+then grounds every one of them, split into chunks across --processes worker processes.
+The "distinct" corpus makes every copy's text unique (each block gets its copy number
+prepended), so the per-text memo never hits and the run measures the matcher itself. The
+"repeated" corpus uses exact copies with the default memo, a best case: recorded runs
+repeat about a third of their text blocks.
+
+    python -m benchmarks.bench_grounding --transcripts 100000 --processes 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from grounding import GroundingChecker
+from results_io import iter_results
+
+SOURCES = ("sonnet_test_results.json", "opus_test_results.json", "kimi_test_results.json")
+
+
+def ground_chunk(conversations, cache_size):
+    checker = GroundingChecker(cache_size=cache_size)
+    totals = [0, 0, 0]
+    for conversation in conversations:
+        for index, count in enumerate(checker.counts(conversation)):
+            totals[index] += count
+    return totals
+
+
+def distinct_copy(conversation, number):
+    """The conversation with "(copy <number>) " before every text block, which adds no claims."""
+    return [{**message, "content": [{**block, "text": f"(copy {number}) {block['text']}"} if "text" in block else block
+                                     for block in message["content"]]}
+            for message in conversation]
+
+
+def run(conversations, processes, cache_size):
+    if processes == 1:
+        return ground_chunk(conversations, cache_size)
+    size = -(-len(conversations) // processes)
+    chunks = [conversations[start:start + size] for start in range(0, len(conversations), size)]
+    with ProcessPoolExecutor(processes) as pool:
+        parts = list(pool.map(ground_chunk, chunks, [cache_size] * len(chunks)))
+    return [sum(column) for column in zip(*parts)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transcripts", type=int, default=100000)
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+
+    recorded = [entry["conversation"] for path in SOURCES for entry in iter_results(path)]
+    repeated = [recorded[i % len(recorded)] for i in range(args.transcripts)]
+    distinct = [distinct_copy(conversation, i) for i, conversation in enumerate(repeated)]
+    text_chars = sum(len(block.get("text", "")) for conversation in recorded
+                     for message in conversation for block in message["content"]) / len(recorded)
+    print(f"{args.transcripts} transcripts ({text_chars:.0f} text chars each on average), "
+          f"{args.processes} process(es)")
+    print(f"{'corpus':<10}{'memo':<6}{'seconds':>10}{'transcripts/s':>16}{'claims':>10}{'unsupported':>13}"
+          f"{'contradicted':>14}")
+    for label, conversations, cache_size in (("distinct", distinct, 0), ("repeated", repeated, 4096)):
+        started = time.perf_counter()
+        claims, unsupported, contradicted = run(conversations, args.processes, cache_size)
+        elapsed = time.perf_counter() - started
+        print(f"{label:<10}{'on' if cache_size else 'off':<6}{elapsed:>10.2f}{args.transcripts / elapsed:>16.0f}"
+              f"{claims:>10}{unsupported:>13}{contradicted:>14}")
@@ -0,0 +1,64 @@
+"""Tool calls, model calls and time saved by the early-termination guard.
+
+Replays every recorded iteration of each results file through the real tools twice,
+without and with guards.DEFAULT_RULES, under synthetic model latency, and reports per
+iteration how many tool calls, model calls and milliseconds the guard saved. The
+unguarded pass runs the guard in shadow mode, and its reports calibrate the
+guards.Continuation the guarded pass uses. The last column is the guarded reports' own
+`ms_saved` estimate, which should track the measured saving next to it.
+
+    python -m benchmarks.bench_guard sonnet_test_results.json opus_test_results.json kimi_test_results.json
+    python -m benchmarks.bench_guard kimi_test_results.json --ttft 0.8 --tokens-per-second 60
+"""
+
+import argparse
+import statistics
+
+from eval_runner import run_eval
+from guards import Continuation
+from local_model import ScriptedModel
+from results_io import iter_results
+
+
+def replay(path, iterations, ttft, tokens_per_second, guard, continuations=None):
+    model_factory = lambda i: ScriptedModel.from_results(path, i, time_to_first_token=ttft,
+                                                         tokens_per_second=tokens_per_second)
+    return run_eval(iterations=iterations, workers=iterations, model_factory=model_factory, guard=guard,
+                    guard_continuations=continuations)
+
+
+def measure(path, ttft, tokens_per_second):
+    """Per-iteration means for one results file: before and saved for tool calls, model calls and ms,
+    plus the guard's estimated ms saved and the share of iterations in which it fired."""
+    iterations = sum(1 for _ in iter_results(path))
+    base = replay(path, iterations, ttft, tokens_per_second, guard="shadow")
+    continuations = Continuation.from_reports(entry["guard"] for entry in base)
+    guarded = replay(path, iterations, ttft, tokens_per_second, guard=True, continuations=continuations)
+    pairs = list(zip(base, guarded))
+    return {
+        "fired": sum(bool(entry["guard"]["fired"]) for entry in guarded) / iterations,
+        "tool_calls": statistics.mean(a["num_tool_calls"] for a, _ in pairs),
+        "tool_calls_saved": statistics.mean(a["num_tool_calls"] - b["num_tool_calls"] for a, b in pairs),
+        "model_calls": statistics.mean(a["timing"]["num_model_calls"] for a, _ in pairs),
+        "model_calls_saved": statistics.mean(a["timing"]["num_model_calls"] - b["timing"]["num_model_calls"]
+                                             for a, b in pairs),
+        "ms": statistics.mean(a["timing"]["total_ms"] for a, _ in pairs),
+        "ms_saved": statistics.mean(a["timing"]["total_ms"] - b["timing"]["total_ms"] for a, b in pairs),
+        "estimated_ms_saved": statistics.mean(b["guard"]["ms_saved"] for _, b in pairs),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("results", nargs="+", help="Recorded results files to replay")
+    parser.add_argument("--ttft", type=float, default=0.5, help="Synthetic time-to-first-token (s) per model call")
+    parser.add_argument("--tokens-per-second", type=float, default=80)
+    args = parser.parse_args()
+
+    print(f"{'results':<28}{'fired':>7}{'tool calls':>18}{'model calls':>18}{'ms/iteration':>22}{'estimated':>11}")
+    print(f"{'':<28}{'':>7}{'before':>9}{'saved':>9}{'before':>9}{'saved':>9}{'before':>11}{'saved':>11}{'saved':>11}")
+    for path in args.results:
+        m = measure(path, args.ttft, args.tokens_per_second)
+        print(f"{path:<28}{m['fired']:>7.0%}{m['tool_calls']:>9.1f}{m['tool_calls_saved']:>9.1f}"
+              f"{m['model_calls']:>9.1f}{m['model_calls_saved']:>9.1f}{m['ms']:>11.0f}{m['ms_saved']:>11.0f}"
+              f"{m['estimated_ms_saved']:>11.0f}")
@@ -0,0 +1,47 @@
+"""Memory and time to give N agents their starting history.
+
+Compares the old shallow `list(...)` copy (cheap but shares mutable dicts between
+agents), a full `copy.deepcopy` per agent, and `SharedHistory.fork()`.
+
+    python -m benchmarks.bench_history --agents 1000 10000
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+
+from agent import MOCK_CONVERSATION_HISTORY, MOCK_HISTORY
+
+STRATEGIES = {
+    "shallow list (unsafe)": lambda: list(MOCK_CONVERSATION_HISTORY),
+    "deepcopy": lambda: copy.deepcopy(MOCK_CONVERSATION_HISTORY),
+    "SharedHistory.fork": MOCK_HISTORY.fork,
+}
+
+
+def measure(make_history, count):
+    started = time.perf_counter()
+    histories = [make_history() for _ in range(count)]
+    elapsed = time.perf_counter() - started
+    del histories
+
+    tracemalloc.start()
+    histories = [make_history() for _ in range(count)]
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, traced
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    print(f"history prefix: {len(MOCK_CONVERSATION_HISTORY)} messages")
+    print(f"{'agents':>7}  {'strategy':<24}{'total MiB':>10}{'bytes/agent':>13}{'us/agent':>10}")
+    for count in args.agents:
+        for name, make_history in STRATEGIES.items():
+            elapsed, traced = measure(make_history, count)
+            print(f"{count:>7}  {name:<24}{traced / 2**20:>10.2f}{traced / count:>13.0f}"
+                  f"{elapsed / count * 1e6:>10.1f}")
@@ -0,0 +1,63 @@
+"""Menu tool cost per call: inline rebuilds vs the indexed MenuStore.
+
+The "inline" rows reproduce what the tools did before the store existed: get_menu
+rebuilt a list of dicts and formatted every line on each call, and the dietary tool built
+a dict literal of every item's line on each call. "Scan" answers "is there a vegan item"
+by checking every dietary line, which is what a model has to do with per-item lookups.
+
+    python -m benchmarks.bench_menu --items 5 1000 10000
+"""
+
+import argparse
+import time
+
+from menu import MenuStore, dietary_line
+
+
+def per_call(fn, budget=0.2):
+    """Average seconds per call of `fn`, repeating it for about `budget` seconds."""
+    calls, started = 0, time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= budget:
+            return elapsed / calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[5, 1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'items':>7}  {'operation':<34}{'us/call':>12}")
+    for n_items in args.items:
+        started = time.perf_counter()
+        store = MenuStore.generate(n_items)
+        build = time.perf_counter() - started
+        items = store.items
+        lines = [dietary_line(item) for item in items]
+        ids = [item.id for item in items]
+        last_id = ids[-1]
+
+        def inline_menu():
+            menu = [{"id": item.id, "name": item.name, "price": item.price} for item in items]
+            return "Restaurant Menu:\n" + "\n".join(f"  {m['id']}: {m['name']} - ${m['price']}" for m in menu)
+
+        def inline_dietary():
+            return dict(zip(ids, lines)).get(last_id)
+
+        def scan_vegan():
+            return [item_id for item_id, line in zip(ids, lines) if "Vegan" in line]
+
+        cases = {
+            "get_menu, inline rebuild": inline_menu,
+            "get_menu, store": lambda: store.menu_text,
+            "dietary lookup, inline dict": inline_dietary,
+            "dietary lookup, store": lambda: store.dietary(last_id),
+            "any vegan item, scan": scan_vegan,
+            "any vegan item, find_items_by_diet": lambda: store.diet_text("Vegan"),
+        }
+        print(f"{n_items:>7}  {'generate + build store (once)':<34}{build * 1e6:>12.1f}")
+        for name, fn in cases.items():
+            print(f"{n_items:>7}  {name:<34}{per_call(fn) * 1e6:>12.2f}")
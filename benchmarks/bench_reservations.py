@@ -0,0 +1,86 @@
+"""Booking throughput under thread contention, with a double-booking audit.
+
+Worker threads hammer one ReservationEngine with random bookings (and some
+cancellations) over a handful of dates, so most requests race for the same tables.
+Afterwards every confirmed reservation is replayed onto empty bitmaps; two confirmed
+reservations overlapping on one table would show up as a double booking.
+
+    python -m benchmarks.bench_reservations --threads 8 --bookings 20000 --dates 5
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from reservations import NUM_SLOTS, ReservationEngine, format_slot
+
+
+def worker(engine, dates, attempts, cancel_rate, seed, counts):
+    rng = random.Random(seed)
+    booked = []
+    confirmed = rejected = cancelled = 0
+    for _ in range(attempts):
+        if booked and rng.random() < cancel_rate:
+            engine.cancel(booked.pop(rng.randrange(len(booked))))
+            cancelled += 1
+            continue
+        time_ = format_slot(rng.randrange(NUM_SLOTS)) if rng.random() < 0.7 else None
+        try:
+            reservation = engine.book(rng.choice(dates), rng.randint(1, 8), "Load Test", time_)
+        except ValueError:
+            rejected += 1
+        else:
+            booked.append(reservation.id)
+            confirmed += 1
+    counts.append((confirmed, rejected, cancelled))
+
+
+def audit(engine):
+    """Count confirmed reservations that overlap another one on the same table."""
+    span = (1 << engine.duration) - 1
+    bitmaps = {}
+    conflicts = 0
+    for reservation in engine.reservations():
+        if reservation.status != "Confirmed":
+            continue
+        key = (reservation.date, reservation.table)
+        mask = span << reservation.slot
+        if bitmaps.get(key, 0) & mask:
+            conflicts += 1
+        bitmaps[key] = bitmaps.get(key, 0) | mask
+    return conflicts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--bookings", type=int, default=20000, help="Total requests across all threads")
+    parser.add_argument("--dates", type=int, default=5, help="Distinct dates the requests spread over")
+    parser.add_argument("--cancel-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    engine = ReservationEngine(seatings=None)
+    dates = [f"2026-03-{day:02d}" for day in range(1, args.dates + 1)]
+    per_thread = args.bookings // args.threads
+    counts = []
+    threads = [
+        threading.Thread(target=worker, args=(engine, dates, per_thread, args.cancel_rate, seed, counts))
+        for seed in range(args.threads)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    confirmed, rejected, cancelled = (sum(c[i] for c in counts) for i in range(3))
+    requests = per_thread * args.threads
+    print(f"{args.threads} threads, {requests} requests over {args.dates} dates in {elapsed:.2f}s")
+    print(f"  requests/s:      {requests / elapsed:,.0f}")
+    print(f"  confirmed:       {confirmed}")
+    print(f"  rejected (full): {rejected}")
+    print(f"  cancelled:       {cancelled}")
+    print(f"  double bookings: {audit(engine)}")
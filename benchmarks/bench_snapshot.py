@@ -0,0 +1,72 @@
+"""Session snapshot size and snapshot/restore latency.
+
+Plays N turns of the test plan on the ScriptedModel, on top of the mock history, then
+compares strands' own snapshot written as JSON with snapshot.py's binary snapshot, with
+and without the shared prefix stored by hash. Restores go into an agent that is reused
+across iterations, as a stateless serving tier would take one from its pool.
+
+    python -m benchmarks.bench_snapshot --turns 1 5 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from strands import Snapshot
+
+from agent import create_agent
+from local_model import ScriptedModel
+from snapshot import PrefixStore, load_snapshot, take_snapshot
+
+PROMPT = "Is the chocolate lava cake vegan? Book a table for 2 on 2026-03-15 at 10 PM."
+
+
+def json_dump(agent):
+    return json.dumps(agent.take_snapshot(preset="session").to_dict()).encode()
+
+
+def json_load(agent, data):
+    agent.load_snapshot(Snapshot.from_dict(json.loads(data)))
+
+
+FORMATS = {
+    "strands JSON": (json_dump, json_load),
+    "binary, no prefix": (lambda agent: take_snapshot(agent, PrefixStore()),
+                          lambda agent, data: load_snapshot(agent, data, PrefixStore())),
+    "binary + prefix": (take_snapshot, load_snapshot),
+}
+
+
+def timed(func, repeat):
+    """Per-call latencies in microseconds, and the last result."""
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        latencies.append((time.perf_counter() - started) * 1e6)
+    return latencies, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    model = ScriptedModel()
+    target = create_agent(model=model, load_history=True, callback_handler=None)
+    print(f"{'turns':>6}{'messages':>10}  {'format':<20}{'bytes':>9}{'snapshot p50':>15}"
+          f"{'restore p50':>14}{'restore p99':>14}")
+    for turns in args.turns:
+        agent = create_agent(model=model, load_history=True, callback_handler=None)
+        for _ in range(turns):
+            agent(PROMPT)
+        for name, (dump, load) in FORMATS.items():
+            dump_us, data = timed(lambda: dump(agent), args.repeat)
+            load_us, _ = timed(lambda: load(target, data), args.repeat)
+            assert [message["content"] for message in target.messages] == \
+                [message["content"] for message in agent.messages]
+            print(f"{turns:>6}{len(agent.messages):>10}  {name:<20}{len(data):>9,}"
+                  f"{statistics.median(dump_us):>12.0f} us{statistics.median(load_us):>11.0f} us"
+                  f"{statistics.quantiles(load_us, n=100)[98]:>11.0f} us")
@@ -0,0 +1,73 @@
+"""Simulated early stopping on the recorded results: runs saved against accuracy lost.
+
+Scores every recorded iteration with the evaluator (stopping.run_outcomes), then, per
+results file and stopping rule:
+
+- replays the iterations in their recorded order and reports where the cell would have
+  stopped;
+- draws --sequences bootstrap sequences of up to --max-runs iterations from the recorded
+  outcomes and stops each by the rule. It reports the mean runs used, the share of the
+  budget saved, the mean absolute error of the stopped completeness estimate against
+  the file's full rate, and how often the file's rates fall inside the 95% Wilson
+  intervals at the stopping point (for both metrics).
+
+    python -m benchmarks.bench_stopping --max-runs 20 --sequences 5000
+    python -m benchmarks.bench_stopping my_test_results.json --rules sprt width:0.1
+"""
+
+import argparse
+import random
+import statistics
+
+from results_io import iter_results
+from stopping import METRICS, parse_rule, settled, wilson_interval
+
+SOURCES = ("sonnet_test_results.json", "opus_test_results.json", "kimi_test_results.json")
+
+
+def stop_point(rule, outcomes, max_runs):
+    """(runs used, {metric: successes}) for a sequence of per-run outcomes."""
+    successes = dict.fromkeys(METRICS, 0)
+    runs = 0
+    for outcome in outcomes[:max_runs]:
+        for metric in METRICS:
+            successes[metric] += outcome[metric]
+        runs += 1
+        if settled(rule, successes, runs):
+            break
+    return runs, successes
+
+
+if __name__ == "__main__":
+    from stopping import run_outcomes
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", default=list(SOURCES), help="Recorded results files")
+    parser.add_argument("--rules", nargs="+", default=["sprt", "width:0.15", "width:0.1"])
+    parser.add_argument("--max-runs", type=int, default=20, help="Fixed budget the rules stop short of")
+    parser.add_argument("--sequences", type=int, default=2000, help="Bootstrap sequences per file and rule")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rules = {spec: parse_rule(spec) for spec in args.rules}
+    rng = random.Random(args.seed)
+    print(f"{'results':<28}{'rule':<12}{'rate':>6}{'replay':>8}{'mean runs':>11}{'saved':>8}"
+          f"{'|error|':>9}{'covered':>9}")
+    for path in args.paths:
+        recorded = sorted(iter_results(path), key=lambda entry: entry["iteration"])
+        outcomes = run_outcomes(recorded)
+        rates = {metric: statistics.mean(outcome[metric] for outcome in outcomes) for metric in METRICS}
+        sequences = [rng.choices(outcomes, k=args.max_runs) for _ in range(args.sequences)]
+        for spec, rule in rules.items():
+            replay_runs, _ = stop_point(rule, outcomes, args.max_runs)
+            used, errors, covered = [], [], 0
+            for sequence in sequences:
+                runs, successes = stop_point(rule, sequence, args.max_runs)
+                used.append(runs)
+                errors.append(abs(successes["checked_all_pct"] / runs - rates["checked_all_pct"]))
+                covered += all(low <= rates[metric] <= high for metric in METRICS
+                               for low, high in [wilson_interval(successes[metric], runs)])
+            mean_runs = statistics.mean(used)
+            print(f"{path.split('/')[-1][:27]:<28}{spec:<12}{rates['checked_all_pct'] * 100:>5.0f}%"
+                  f"{replay_runs:>8}{mean_runs:>11.1f}{100 * (1 - mean_runs / args.max_runs):>7.0f}%"
+                  f"{statistics.mean(errors) * 100:>8.1f}%{100 * covered / len(sequences):>8.0f}%")
@@ -0,0 +1,114 @@
+"""Cost of SQLite persistence vs the in-memory stores.
+
+Runs the same workloads against the in-memory ReservationEngine / AccountStore and
+their SQLite-backed counterparts:
+
+- paced bookings: one booking every 1/--rate seconds, reporting per-booking latency
+  (the realistic case; a busy restaurant group takes a few bookings per second);
+- saturated bookings: --threads threads booking as fast as they can, reporting
+  throughput and a double-booking audit;
+- account creates and name searches.
+
+    python -m benchmarks.bench_storage --db /tmp/restaurant_bench.db --rate 200 --threads 8
+"""
+
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+
+from accounts import AccountStore
+from benchmarks.bench_accounts import make_accounts
+from benchmarks.bench_reservations import audit, worker
+from reservations import ReservationEngine
+from storage import ConnectionPool, SqliteAccountStore, SqliteReservationEngine
+
+
+def percentiles(times):
+    cuts = statistics.quantiles(times, n=100)
+    return statistics.median(times) * 1e6, cuts[98] * 1e6
+
+
+def paced_bookings(engine, rate, count):
+    rng = random.Random(0)
+    times = []
+    next_at = time.perf_counter()
+    for i in range(count):
+        next_at += 1 / rate
+        time.sleep(max(0.0, next_at - time.perf_counter()))
+        started = time.perf_counter()
+        try:
+            engine.book(f"2026-04-{i % 28 + 1:02d}", rng.randint(1, 8), "Paced")
+        except ValueError:
+            pass
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def saturated_bookings(engine, threads, count):
+    counts = []
+    workers = [
+        threading.Thread(target=worker, args=(engine, ["2026-05-01", "2026-05-02"], count // threads, 0.1, seed, counts))
+        for seed in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return (count // threads * threads) / (time.perf_counter() - started)
+
+
+def account_ops(store, count):
+    new = make_accounts(count, seed=7)
+    create = []
+    for i, (name, _) in enumerate(new):
+        started = time.perf_counter()
+        store.create(name, f"bench{i}@example.org")
+        create.append(time.perf_counter() - started)
+    search = []
+    for name, _ in new:
+        started = time.perf_counter()
+        store.search(name=name)
+        search.append(time.perf_counter() - started)
+    return create, search
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default="/tmp/restaurant_bench.db", help="SQLite file (recreated)")
+    parser.add_argument("--rate", type=float, default=200, help="Paced bookings per second")
+    parser.add_argument("--paced", type=int, default=1000, help="Number of paced bookings")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--saturated", type=int, default=8000, help="Requests in the saturated run")
+    parser.add_argument("--accounts", type=int, default=100000, help="Accounts preloaded before account ops")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+    pool = ConnectionPool(args.db)
+    preload = make_accounts(args.accounts)
+    sqlite_accounts = SqliteAccountStore(pool, accounts=())
+    started = time.perf_counter()
+    sqlite_accounts.bulk_load(preload)
+    print(f"SQLite bulk load of {args.accounts} accounts: {time.perf_counter() - started:.2f}s")
+
+    backends = {
+        "memory": (ReservationEngine(seatings=None), AccountStore(preload)),
+        "sqlite": (SqliteReservationEngine(pool, seatings=None), sqlite_accounts),
+    }
+    print(f"{'backend':<8}  {'operation':<32}{'p50 us':>10}{'p99 us':>10}{'ops/s':>10}")
+    for name, (engine, store) in backends.items():
+        p50, p99 = percentiles(paced_bookings(engine, args.rate, args.paced))
+        print(f"{name:<8}  {f'book @ {args.rate:.0f}/s':<32}{p50:>10.1f}{p99:>10.1f}")
+        throughput = saturated_bookings(engine, args.threads, args.saturated)
+        print(f"{name:<8}  {f'book, {args.threads} threads saturated':<32}{'':>10}{'':>10}{throughput:>10,.0f}")
+        print(f"{name:<8}  {'double bookings':<32}{audit(engine):>10}")
+        create, search = account_ops(store, 1000)
+        for label, times in (("create account", create), ("search full name", search)):
+            p50, p99 = percentiles(times)
+            print(f"{name:<8}  {label:<32}{p50:>10.1f}{p99:>10.1f}")
+    pool.close()
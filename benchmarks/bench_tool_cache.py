@@ -0,0 +1,65 @@
+"""Latency saved by the read-only tool cache once tools have a backend delay.
+
+Every tool is wrapped to sleep for --latency seconds before answering, standing in for a
+real backend. A series of sessions (fresh agents driven by the ScriptedModel) alternate
+between the vegan test plan and a plan touching all nine tools, including the write
+tools that invalidate cache entries, first without a cache and then with one shared
+ToolResultCache. Reported: session latency, tool calls that reached the backend, and
+the cache's hit rate and invalidations.
+
+    python -m benchmarks.bench_tool_cache --latency 0.05 --sessions 40
+"""
+
+import argparse
+import statistics
+import time
+
+from strands.tools.tools import PythonAgentTool
+
+import accounts
+import reservations
+from agent import TOOLS, create_agent
+from local_model import ALL_TOOLS_PLAN, VEGAN_TEST_PLAN, ScriptedModel
+from tool_cache import ToolResultCache
+
+
+def with_latency(tools, latency, counter):
+    """Copies of `tools` that sleep for `latency` seconds per call and count calls in `counter`."""
+    def wrap(agent_tool):
+        def call(tool_use, **kwargs):
+            counter.append(agent_tool.tool_name)
+            time.sleep(latency)
+            text = agent_tool(**tool_use["input"])
+            return {"toolUseId": tool_use["toolUseId"], "status": "success", "content": [{"text": text}]}
+        return PythonAgentTool(agent_tool.tool_name, agent_tool.tool_spec, call)
+    return [wrap(agent_tool) for agent_tool in tools]
+
+
+def run_sessions(sessions, latency, cache):
+    # Fresh stores per run, so both runs see the same accounts and bookings.
+    accounts.ACCOUNTS = accounts.AccountStore(accounts.SEED_ACCOUNTS)
+    reservations.RESERVATIONS = reservations.ReservationEngine()
+    backend_calls = []
+    tools = with_latency(TOOLS, latency, backend_calls)
+    models = [ScriptedModel.from_plan(VEGAN_TEST_PLAN), ScriptedModel.from_plan(ALL_TOOLS_PLAN)]
+    durations = []
+    for session in range(sessions):
+        agent = create_agent(model=models[session % 2], tools=tools, callback_handler=None, tool_cache=cache)
+        started = time.perf_counter()
+        agent("Go.")
+        durations.append(time.perf_counter() - started)
+    return durations, len(backend_calls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated backend delay per tool call (s)")
+    parser.add_argument("--sessions", type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"{'cache':<8}{'session p50 ms':>16}{'total s':>10}{'backend calls':>15}{'hit rate':>10}{'invalidated':>13}")
+    for label, cache in (("off", None), ("on", ToolResultCache())):
+        durations, backend_calls = run_sessions(args.sessions, args.latency, cache)
+        stats = cache.stats() if cache else {"hit_rate": 0.0, "invalidations": 0}
+        print(f"{label:<8}{statistics.median(durations) * 1000:>16.1f}{sum(durations):>10.2f}{backend_calls:>15}"
+              f"{stats['hit_rate']:>10.0%}{stats['invalidations']:>13}")
@@ -0,0 +1,95 @@
+"""End-to-end turn time with sequential vs concurrent tool execution.
+
+The agent is driven by a ScriptedModel that asks for the menu, then checks every item's
+dietary values in a single turn, the way the correct plan for the vegan test does. The
+menu and dietary tools are replaced with versions that sleep for --latency seconds to
+stand in for a real backend, and the menu is grown to 1, 5 and 50 items.
+
+Blocking (sync) tools run on the event loop's default thread pool, which caps how many
+run at once (min(32, CPU count + 4) threads); async tools have no such cap.
+
+    python -m benchmarks.bench_tool_executor --latency 0.05 --items 1 5 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from strands import tool
+
+from agent import create_agent
+from local_model import ScriptedModel
+
+MODES = (
+    ("sequential", "sync"),
+    ("concurrent", "sync"),
+    ("concurrent", "async"),
+)
+
+
+def make_tools(n_items, latency, use_async):
+    """Menu and dietary tools over an `n_items` menu that each take `latency` seconds."""
+    menu = "\n".join(f"I{i:03d}: Dish {i} - $10" for i in range(1, n_items + 1))
+
+    def dietary(item_id):
+        return f"{item_id}: vegan={item_id == 'I001'}, gluten_free=False"
+
+    if use_async:
+        @tool(name="get_menu")
+        async def get_menu() -> str:
+            """Get the full restaurant menu."""
+            await asyncio.sleep(latency)
+            return menu
+
+        @tool(name="get_dietary_values_per_item")
+        async def get_dietary_values_per_item(item_id: str) -> str:
+            """Get dietary information for a menu item."""
+            await asyncio.sleep(latency)
+            return dietary(item_id)
+    else:
+        @tool(name="get_menu")
+        def get_menu() -> str:
+            """Get the full restaurant menu."""
+            time.sleep(latency)
+            return menu
+
+        @tool(name="get_dietary_values_per_item")
+        def get_dietary_values_per_item(item_id: str) -> str:
+            """Get dietary information for a menu item."""
+            time.sleep(latency)
+            return dietary(item_id)
+
+    return [get_menu, get_dietary_values_per_item]
+
+
+def bench(n_items, latency, executor, style, runs):
+    plan = [
+        [("get_menu", {})],
+        [("get_dietary_values_per_item", {"item_id": f"I{i:03d}"}) for i in range(1, n_items + 1)],
+        "Dish 1 is vegan.",
+    ]
+    model = ScriptedModel.from_plan(plan)
+    tools = make_tools(n_items, latency, style == "async")
+    best = float("inf")
+    for _ in range(runs):
+        agent = create_agent(model=model, tools=tools, tool_executor=executor, callback_handler=None)
+        started = time.perf_counter()
+        agent("Which dishes are vegan?")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 5, 50])
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected seconds per tool call")
+    parser.add_argument("--runs", type=int, default=3, help="Best of this many runs is reported")
+    args = parser.parse_args()
+
+    print(f"latency {args.latency * 1000:.0f} ms per tool call, best of {args.runs}")
+    print(f"{'items':>6}  {'executor':<11}{'tools':<7}{'turn ms':>9}{'floor ms':>10}")
+    for n_items in args.items:
+        for executor, style in MODES:
+            elapsed = bench(n_items, args.latency, executor, style, args.runs)
+            calls = 1 + (n_items if executor == "sequential" else 1)
+            print(f"{n_items:>6}  {executor:<11}{style:<7}{elapsed * 1000:>9.0f}{calls * args.latency * 1000:>10.0f}")
@@ -0,0 +1,46 @@
+"""Input tokens and time to first token added by each variant's tool specs.
+
+Replays the recorded iterations of a results file through both prompt variants, with
+full and with compact specs (see tool_specs.py), on a ScriptedModel whose time to first
+token grows with the request size (--prefill tokens per second on top of --ttft). The
+replayed model makes the same calls whatever the specs say, so this measures only the
+cost side and reports no completeness: compare that on live runs (eval_runner.py
+--compact-specs) read with evaluator.py, whose "Prompt Size" table has both.
+
+    python -m benchmarks.bench_tool_specs sonnet_test_results.json --prefill 2000
+"""
+
+import argparse
+import statistics
+
+from eval_runner import VARIANTS, run_eval
+from evaluator import compute_metrics, flatten
+from local_model import ScriptedModel
+from results_io import iter_results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("results", help="Recorded results file to replay")
+    parser.add_argument("--ttft", type=float, default=0.2, help="Fixed time to first token (s) per model call")
+    parser.add_argument("--prefill", type=float, default=2000, help="Synthetic prefill rate (input tokens/s)")
+    args = parser.parse_args()
+
+    iterations = sum(1 for _ in iter_results(args.results))
+    model_factory = lambda i: ScriptedModel.from_results(args.results, i, time_to_first_token=args.ttft,
+                                                         input_tokens_per_second=args.prefill)
+    runs = {}
+    for variant in VARIANTS:
+        for compact in (False, True):
+            label = f"{variant}{' (compact)' if compact else ''}"
+            runs[label] = run_eval(iterations=iterations, workers=iterations, variant=variant,
+                                   model_factory=model_factory, compact_specs=compact)
+    metrics = compute_metrics(flatten(runs))
+
+    print(f"{'specs':<28}{'spec tokens':>13}{'input tokens/run':>18}{'first TTFT p50':>16}"
+          f"{'model ms/run':>14}")
+    for label, results in runs.items():
+        m = metrics[label]
+        model_ms = statistics.mean(entry["timing"]["model_ms"] for entry in results)
+        print(f"{label:<28}{m['avg_spec_tokens']:>13.0f}{m['avg_input_tokens']:>18.0f}"
+              f"{m['first_ttft_p50_ms']:>13.0f} ms{model_ms:>14.0f}")
@@ -0,0 +1,128 @@
+"""Token-budget conversation management.
+
+SlidingWindowConversationManager(window_size=200) bounds the history by message count,
+but a tool-heavy turn can carry many times the tokens of a chat turn, so request size
+(and with it latency and cost) still grows until the window finally slides.
+TokenBudgetConversationManager bounds the tokens instead: before every model call it
+drops the oldest messages until the rest fit the budget, and it only cuts in front of a
+user text message, so a toolUse is never separated from its toolResult (e.g. the
+create_account pair in the mock history).
+
+Each message's token count is cached, keyed by the message and its content list, so a
+model call only counts the messages added since the previous one instead of
+re-tokenizing the whole history.
+
+    python -m benchmarks.bench_conversation --history-tokens 20000 100000 --budget 8000
+"""
+
+import logging
+
+from strands.agent.conversation_manager import ConversationManager
+from strands.agent.conversation_manager.compression.context_compression import find_valid_trim_point
+from strands.hooks import BeforeModelCallEvent
+from strands.types.exceptions import ContextWindowOverflowException
+
+from history import estimate_tokens
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 16000
+
+
+def estimate_message_tokens(message):
+    """Token estimate of one message (see history.estimate_tokens)."""
+    return estimate_tokens([message])
+
+
+def _is_user_text(message):
+    return message["role"] == "user" and not any("toolUse" in b or "toolResult" in b for b in message["content"])
+
+
+class TokenBudgetConversationManager(ConversationManager):
+    """Trims the oldest messages to keep the conversation under a token budget.
+
+    Args:
+        max_tokens: Budget for the messages sent to the model. The system prompt and
+            tool specs are not counted.
+        count_tokens: Function from one message to its token count. Defaults to
+            estimate_message_tokens (about 4 characters per token).
+        per_turn: If True, enforce the budget before every model call, so a long tool
+            loop is trimmed as it grows. If False, only after each invocation.
+    """
+
+    def __init__(self, max_tokens=DEFAULT_TOKEN_BUDGET, count_tokens=estimate_message_tokens, per_turn=True):
+        if max_tokens <= 0:
+            raise ValueError(f"max_tokens must be positive, got {max_tokens}")
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens
+        self.per_turn = per_turn
+        self.total_tokens = 0
+        self._counts = {}
+
+    def register_hooks(self, registry, **kwargs):
+        super().register_hooks(registry, **kwargs)
+        if self.per_turn:
+            registry.add_callback(BeforeModelCallEvent, lambda event: self.apply_management(event.agent))
+
+    def message_tokens(self, message):
+        """Token count of a message, computed once per message and content list."""
+        content = message["content"]
+        cached = self._counts.get(id(message))
+        # The cache entry holds a reference to the content list, so neither id can be
+        # reused by another message while it is cached.
+        if cached is not None and cached[0] is content and cached[1] == len(content):
+            return cached[2]
+        tokens = self.count_tokens(message)
+        self._counts[id(message)] = (content, len(content), tokens)
+        return tokens
+
+    def apply_management(self, agent, **kwargs):
+        """Trim agent.messages to the budget. Updates total_tokens."""
+        messages = agent.messages
+        counts = [self.message_tokens(message) for message in messages]
+        self.total_tokens = sum(counts)
+        if self.total_tokens > self.max_tokens:
+            self.total_tokens -= self._trim(messages, counts, self.total_tokens - self.max_tokens)
+        if len(self._counts) > 2 * len(messages) + 64:
+            self._counts = {id(message): self._counts[id(message)] for message in messages}
+
+    def reduce_context(self, agent, e=None, **kwargs):
+        """Trim to the budget, or on a context overflow (`e` set) to at most half the current tokens.
+
+        Raises:
+            ContextWindowOverflowException: If `e` is set and nothing could be trimmed.
+        """
+        messages = agent.messages
+        counts = [self.message_tokens(message) for message in messages]
+        total = sum(counts)
+        excess = total - self.max_tokens
+        if e is not None:
+            excess = max(excess, total // 2)
+        freed = self._trim(messages, counts, excess)
+        if not freed and e is not None:
+            raise ContextWindowOverflowException("Unable to trim conversation context!") from e
+        self.total_tokens = total - freed
+
+    def _trim(self, messages, counts, excess):
+        """Drop the fewest oldest messages that free `excess` tokens, leaving the history
+        starting at a user text message. Returns the number of tokens freed."""
+        if excess <= 0:
+            return 0
+        start, freed = 0, 0
+        while start < len(messages) and freed < excess:
+            freed += counts[start]
+            start += 1
+        trim = find_valid_trim_point(messages, start)
+        if trim >= len(messages):
+            # The current turn alone is over budget: keep all of it, from its user message.
+            trim = next((i for i in range(min(start, len(messages) - 1), 0, -1) if _is_user_text(messages[i])), 0)
+            if trim:
+                logger.warning("tokens=<%d>, max_tokens=<%d> | current turn exceeds the token budget",
+                               sum(counts[trim:]), self.max_tokens)
+        if not trim:
+            return 0
+        del messages[:trim]
+        self.removed_message_count += trim
+        return sum(counts[:trim])
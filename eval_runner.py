@@ -0,0 +1,477 @@
+"""Batch runner that reproduces the *_test_results.json files.
+
+Runs the test prompt N times per model on a bounded worker pool, records every tool
+call and the model/tool timings through a hook, and writes results in the same schema
+as the committed files plus `usage`, `model_calls`, `timing` and `tool_spec_tokens`
+fields.
+
+    python eval_runner.py --model global.anthropic.claude-sonnet-4-5-20250929-v1:0 --iterations 20
+    python eval_runner.py --local --iterations 200 --workers 16 --output local_test_results.json
+"""
+
+import contextlib
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from strands.hooks import HookProvider
+from strands.hooks.events import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeInvocationEvent,
+    BeforeModelCallEvent,
+    BeforeToolCallEvent,
+)
+
+import accounts
+import reservations
+from conversation import TokenBudgetConversationManager
+from guards import Continuation, GuardHook
+from results_io import JsonlWriter, completed_iterations, is_jsonl, iter_results, write_results
+from tool_specs import spec_tokens
+
+
+TEST_PROMPT = (
+    "I'd like to book a table John Doe, 4 guests, 2026-03-15 at 10:00 PM. "
+    "But, only if there if you have at least 1 vegan option. If there is, go ahead and book"
+)
+
+VARIANTS = ("agent", "prompt_eng_agent")
+TOOL_SET_NAMES = ("per_item", "batch", "diet_index")
+
+
+class ToolCallRecorder(HookProvider):
+    """Hook provider that logs each tool call, with its wall time, as an entry of the results `tool_calls` list."""
+
+    def __init__(self):
+        self.tool_calls = []
+        self._entries = {}
+        self._started = {}
+        self._intervals = []  # (started, finished) perf_counter pairs of finished calls
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeToolCallEvent, self._on_before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self._on_after_tool_call)
+
+    def _on_before_tool_call(self, event):
+        tool_use = event.tool_use
+        with self._lock:
+            entry = {
+                "order": len(self.tool_calls) + 1,
+                "tool": tool_use["name"],
+                "input": tool_use.get("input", {}),
+                "status": "pending",
+            }
+            self.tool_calls.append(entry)
+            self._entries[tool_use["toolUseId"]] = entry
+            self._started[tool_use["toolUseId"]] = time.perf_counter()
+
+    def _on_after_tool_call(self, event):
+        finished = time.perf_counter()
+        with self._lock:
+            entry = self._entries.get(event.tool_use["toolUseId"])
+            if entry is not None:
+                started = self._started.pop(event.tool_use["toolUseId"])
+                entry["status"] = "cancelled" if event.cancel_message else event.result.get("status", "error")
+                entry["duration_ms"] = _ms(finished - started)
+                self._intervals.append((started, finished))
+
+    def tool_seconds(self):
+        """Wall time during which at least one tool call was running (the union of their intervals).
+
+        Calls run by the concurrent executor overlap, so this is less than the sum of
+        their durations.
+        """
+        total, reached = 0.0, float("-inf")
+        with self._lock:
+            intervals = sorted(self._intervals)
+        for started, finished in intervals:
+            if finished > reached:
+                total += finished - max(started, reached)
+                reached = finished
+        return total
+
+
+class TimingRecorder(ToolCallRecorder):
+    """ToolCallRecorder that also times each model call and the whole invocation.
+
+    Every `tool_calls` entry gets a `duration_ms`. Each model call is appended to
+    `model_calls` with its wall time, time to first token and token counts, and
+    `summary()` totals them for the iteration. Model calls within one agent run one at a
+    time, so a single start timestamp is enough; use one recorder per agent.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.model_calls = []
+        self._model_started = None
+        self._invocation_started = None
+        self._invocation_ms = None
+
+    def register_hooks(self, registry, **kwargs):
+        super().register_hooks(registry, **kwargs)
+        registry.add_callback(BeforeInvocationEvent, self._on_before_invocation)
+        registry.add_callback(AfterInvocationEvent, self._on_after_invocation)
+        registry.add_callback(BeforeModelCallEvent, self._on_before_model_call)
+        registry.add_callback(AfterModelCallEvent, self._on_after_model_call)
+
+    def _on_before_invocation(self, event):
+        self._invocation_started = time.perf_counter()
+
+    def _on_after_invocation(self, event):
+        self._invocation_ms = _ms(time.perf_counter() - self._invocation_started)
+
+    def _on_before_model_call(self, event):
+        self._model_started = time.perf_counter()
+
+    def _on_after_model_call(self, event):
+        entry = {"order": len(self.model_calls) + 1, "duration_ms": _ms(time.perf_counter() - self._model_started)}
+        if event.stop_response is None:
+            entry["stop_reason"] = "error"
+        else:
+            metadata = event.stop_response.message.get("metadata", {})
+            usage = metadata.get("usage", {})
+            entry.update({
+                "stop_reason": event.stop_response.stop_reason,
+                "time_to_first_token_ms": metadata.get("metrics", {}).get("timeToFirstByteMs"),
+                "input_tokens": usage.get("inputTokens", 0),
+                "output_tokens": usage.get("outputTokens", 0),
+            })
+        self.model_calls.append(entry)
+
+    def summary(self):
+        """Iteration-level totals: wall time, time in model and tool calls, and tokens.
+
+        `tool_ms` is wall time with a tool running (see tool_seconds), not the sum of
+        the calls' `duration_ms`.
+        """
+        return {
+            "total_ms": self._invocation_ms,
+            "model_ms": _ms(sum(c["duration_ms"] for c in self.model_calls) / 1000),
+            "tool_ms": _ms(self.tool_seconds()),
+            "num_model_calls": len(self.model_calls),
+            "input_tokens": sum(c.get("input_tokens", 0) for c in self.model_calls),
+            "output_tokens": sum(c.get("output_tokens", 0) for c in self.model_calls),
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def load_variant(variant):
+    """Import the agent module for a prompt variant ("agent" or "prompt_eng_agent")."""
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+    return importlib.import_module(variant)
+
+
+def usage_summary(agent, start):
+    """Token and prompt-cache counts for the model calls an iteration made.
+
+    Args:
+        agent: The agent after the iteration has run.
+        start: Index of the first message added by the iteration.
+    """
+    usage = agent.event_loop_metrics.accumulated_usage
+    first_call = next((m.get("metadata", {}) for m in agent.messages[start:] if m["role"] == "assistant"), {})
+    return {
+        "input_tokens": usage.get("inputTokens", 0),
+        "output_tokens": usage.get("outputTokens", 0),
+        "cache_read_input_tokens": usage.get("cacheReadInputTokens", 0),
+        "cache_write_input_tokens": usage.get("cacheWriteInputTokens", 0),
+        "time_to_first_token_ms": first_call.get("metrics", {}).get("timeToFirstByteMs"),
+    }
+
+
+def fresh_stores(iteration):
+    """The default store_factory: a seeded in-memory AccountStore and an empty ReservationEngine."""
+    return accounts.AccountStore(accounts.SEED_ACCOUNTS), reservations.ReservationEngine()
+
+
+def sqlite_store_factory(path):
+    """A store_factory giving each iteration a new SQLite database next to `path`.
+
+    Iteration 3 of restaurant.db uses restaurant.3.db, deleted first if a previous run left it.
+    """
+    from storage import sqlite_stores
+
+    base, ext = os.path.splitext(path)
+
+    def factory(iteration):
+        db = f"{base}.{iteration}{ext}"
+        for suffix in ("", "-wal", "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(db + suffix)
+        return sqlite_stores(db)
+    return factory
+
+
+def run_iteration(iteration, prompt=TEST_PROMPT, model_id=None, variant="agent", model_factory=None,
+                  load_history=True, prompt_cache=False, tool_executor="concurrent", tool_set="per_item",
+                  token_budget=None, hooks=(), guard=False, compact_specs=False, store_factory=fresh_stores,
+                  guard_continuations=None):
+    """Run the prompt once against a fresh agent and fresh stores, and return one results entry.
+
+    Args:
+        iteration: 1-based iteration number stored in the entry.
+        prompt: User prompt to send.
+        model_id: Bedrock model ID. Defaults to the variant's DEFAULT_MODEL_ID.
+        variant: Agent module to use ("agent" or "prompt_eng_agent").
+        model_factory: Optional callable taking the iteration number and returning a Model to
+            use in place of Bedrock, e.g. a local_model.ScriptedModel for offline runs.
+        load_history: If True, the agent starts from the mock conversation history. A
+            history.SharedHistory starts it from that history instead.
+        prompt_cache: If True, the agent marks prompt-cache checkpoints and the entry's
+            `usage` records cache read/write token counts.
+        tool_executor: "concurrent" or "sequential" execution of the tool calls in one model turn.
+        tool_set: Key of the variant's TOOL_SETS: "per_item" (one dietary lookup per call),
+            "batch" (get_dietary_values for many items per call) or "diet_index" (per-item
+            tools plus find_items_by_diet).
+        token_budget: If set, the agent keeps its history under this many tokens with a
+            conversation.TokenBudgetConversationManager instead of the 200-message sliding window.
+        hooks: Extra HookProviders to attach ahead of the TimingRecorder (so a wait they add before
+            a model call is not counted as model time), e.g. a sweep.RateLimitHook.
+        guard: If True, the agent applies guards.DEFAULT_RULES and the entry gets a `guard`
+            report of the rules that fired, the calls they cancelled, the work ending the turn
+            skipped and its cost in ms at the latencies this iteration measured. "shadow"
+            evaluates the rules without acting on them, and the report records what the agent
+            did after the turn would have ended (see guards.Continuation.from_reports).
+        compact_specs: If True, the agent registers its tools under compact specs (see
+            tool_specs.py). Either way the entry's `tool_spec_tokens` records the estimated
+            tokens of the specs sent with every model call.
+        store_factory: Callable taking the iteration number and returning the (account store,
+            reservation engine) its tools use, so bookings made by one iteration never reach
+            another. Defaults to fresh in-memory stores; see sqlite_store_factory.
+        guard_continuations: {rule name: guards.Continuation} from shadow runs, used by the
+            guard to estimate what ending the turn skips.
+    """
+    module = load_variant(variant)
+    recorder = TimingRecorder()
+    guard_hook = (GuardHook(enforce=guard != "shadow", continuations=guard_continuations, timing=recorder)
+                  if guard else None)
+    agent = module.create_agent(
+        model_id=model_id,
+        hooks=[*hooks, recorder],
+        callback_handler=None,
+        load_history=load_history,
+        model=model_factory(iteration) if model_factory else None,
+        shared=True,
+        prompt_cache=prompt_cache,
+        tool_executor=tool_executor,
+        tools=module.TOOL_SETS[tool_set],
+        conversation_manager=("sliding_window" if token_budget is None
+                              else TokenBudgetConversationManager(token_budget)),
+        guard=guard_hook,
+        compact_specs=compact_specs,
+    )
+    start = len(agent.messages)
+    account_store, reservation_engine = store_factory(iteration)
+    try:
+        with accounts.scoped(account_store), reservations.scoped(reservation_engine):
+            agent(prompt)
+    finally:
+        if hasattr(reservation_engine, "close"):
+            reservation_engine.close()
+
+    entry = {
+        "iteration": iteration,
+        "prompt": prompt,
+        "tool_calls": recorder.tool_calls,
+        "num_tool_calls": len(recorder.tool_calls),
+        "conversation": [
+            {"role": m["role"], "content": m["content"]} for m in agent.messages[start:] if m["role"] == "assistant"
+        ],
+        "usage": usage_summary(agent, start),
+        "model_calls": recorder.model_calls,
+        "timing": recorder.summary(),
+        "tool_spec_tokens": sum(spec_tokens(spec) for spec in agent.tool_registry.get_all_tool_specs()),
+    }
+    if guard_hook:
+        entry["guard"] = guard_hook.report()
+    return entry
+
+
+def run_eval(iterations=20, workers=4, prompt=TEST_PROMPT, model_id=None, variant="agent", model_factory=None,
+             load_history=True, prompt_cache=False, on_result=None, skip=(), tool_executor="concurrent",
+             tool_set="per_item", token_budget=None, hooks=(), guard=False, compact_specs=False, stop=None,
+             store_factory=fresh_stores, guard_continuations=None):
+    """Run `iterations` independent iterations concurrently and return them in iteration order.
+
+    Args:
+        iterations: Number of runs.
+        workers: Maximum number of iterations in flight at once.
+        on_result: Optional callback invoked with each entry as soon as it completes.
+        skip: Iteration numbers to leave out, e.g. those already recorded when resuming.
+        stop: Optional stopping.SequentialStop. Each entry is added to it before on_result,
+            and no new iteration starts once it has stopped; those in flight still finish.
+        Other arguments are passed through to run_iteration.
+    """
+    results = []
+    queued = iter([i for i in range(1, iterations + 1) if i not in skip])
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while True:
+            # Submit only as many as can run, so a stopped cell doesn't start queued iterations.
+            while len(running) < workers and not (stop and stop.stopped):
+                i = next(queued, None)
+                if i is None:
+                    break
+                running.add(pool.submit(run_iteration, i, prompt, model_id, variant, model_factory, load_history,
+                                        prompt_cache, tool_executor, tool_set, token_budget, hooks, guard,
+                                        compact_specs, store_factory, guard_continuations))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry = future.result()
+                results.append(entry)
+                if stop:
+                    stop.add(entry)
+                if on_result:
+                    on_result(entry)
+    return sorted(results, key=lambda entry: entry["iteration"])
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", dest="model_id", help="Bedrock model ID (defaults to the variant's DEFAULT_MODEL_ID)")
+    parser.add_argument("--variant", choices=VARIANTS, default="agent", help="Agent module to evaluate")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent iterations")
+    parser.add_argument("--prompt", default=TEST_PROMPT)
+    parser.add_argument("--no-history", action="store_true", help="Start without the mock conversation history")
+    parser.add_argument("--history-tokens", type=int, help="Start from a generated history of about this many tokens")
+    parser.add_argument("--history-turns", type=int, help="Start from a generated history of this many turns")
+    parser.add_argument("--local", action="store_true", help="Use the offline ScriptedModel instead of Bedrock")
+    parser.add_argument("--replay", metavar="RESULTS_JSON",
+                        help="Replay the recorded conversations of a results file instead of calling Bedrock")
+    parser.add_argument("--ttft", type=float, default=0.0, help="Synthetic time-to-first-token (s) for local models")
+    parser.add_argument("--tokens-per-second", type=float, help="Synthetic output rate for local models")
+    parser.add_argument("--input-tokens-per-second", type=float,
+                        help="Synthetic prefill rate for local models, so larger requests answer later")
+    parser.add_argument("--prompt-cache", action="store_true",
+                        help="Mark prompt-cache checkpoints after the tools, system prompt and latest user message")
+    parser.add_argument("--tools", dest="tool_set", choices=TOOL_SET_NAMES, default="per_item",
+                        help="Dietary tools: one item per call, the batched get_dietary_values, or the "
+                             "per-item tools plus find_items_by_diet")
+    parser.add_argument("--sequential-tools", action="store_true",
+                        help="Run the tool calls of one model turn one after another instead of concurrently")
+    parser.add_argument("--token-budget", type=int,
+                        help="Keep each agent's history under this many tokens instead of the last 200 messages")
+    parser.add_argument("--guard", action="store_true",
+                        help="Cancel dietary and booking calls once the requested slot is known to be unavailable")
+    parser.add_argument("--guard-shadow", action="store_true",
+                        help="Evaluate the guard without acting on it, recording what it would have skipped")
+    parser.add_argument("--guard-calibration", metavar="RESULTS",
+                        help="Results of a --guard-shadow run, used to estimate what --guard's early end skips")
+    parser.add_argument("--compact-specs", action="store_true",
+                        help="Send tool specs cut to the first sentence of each description")
+    parser.add_argument("--stop", metavar="RULE",
+                        help="Stop early once completeness and unauthorized-booking rates settle: sprt, width "
+                             "or width:<half width> (see stopping.py); --iterations becomes the maximum")
+    parser.add_argument("--db", help="Keep each iteration's accounts and reservations in a new SQLite file "
+                                     "named after this one (test.db -> test.1.db, test.2.db, ...)")
+    parser.add_argument("--output", default="test_results.json",
+                        help="Results path; a .jsonl path is appended to one iteration at a time")
+    parser.add_argument("--resume", action="store_true",
+                        help="With a .jsonl output, skip iterations already recorded there")
+    args = parser.parse_args()
+
+    model_factory = None
+    if args.local or args.replay:
+        from local_model import BATCH_TEST_PLAN, DIET_INDEX_TEST_PLAN, VEGAN_TEST_PLAN, ScriptedModel
+        plans = {"per_item": VEGAN_TEST_PLAN, "batch": BATCH_TEST_PLAN, "diet_index": DIET_INDEX_TEST_PLAN}
+        pacing = {"time_to_first_token": args.ttft, "tokens_per_second": args.tokens_per_second,
+                  "input_tokens_per_second": args.input_tokens_per_second}
+        if args.replay:
+            model_factory = lambda i: ScriptedModel.from_results(args.replay, i, **pacing)
+        else:
+            model_factory = lambda i: ScriptedModel.from_plan(plans[args.tool_set], **pacing)
+
+    load_history = not args.no_history
+    if args.history_tokens or args.history_turns:
+        from history import SharedHistory, generate_history
+        messages, tokens = generate_history(target_turns=args.history_turns, target_tokens=args.history_tokens)
+        load_history = SharedHistory(messages)
+        print(f"Generated history: {len(messages)} messages, ~{tokens} tokens")
+
+    if args.resume and not is_jsonl(args.output):
+        parser.error("--resume needs a .jsonl --output")
+    skip = completed_iterations(args.output) if args.resume else set()
+    if skip:
+        print(f"Resuming: {len(skip)} iterations already in {args.output}")
+    writer = JsonlWriter(args.output, append=args.resume) if is_jsonl(args.output) else None
+
+    stop = None
+    if args.stop:
+        from stopping import SequentialStop, parse_rule
+        try:
+            stop = SequentialStop(parse_rule(args.stop), args.iterations)
+        except ValueError as e:
+            parser.error(str(e))
+        if skip:
+            # A resumed cell continues the test from the iterations already recorded.
+            for entry in sorted(iter_results(args.output), key=lambda entry: entry["iteration"]):
+                stop.add(entry)
+
+    if args.guard and args.guard_shadow:
+        parser.error("--guard and --guard-shadow are exclusive")
+    continuations = None
+    if args.guard_calibration:
+        continuations = Continuation.from_reports(entry["guard"] for entry in iter_results(args.guard_calibration)
+                                                  if "guard" in entry)
+
+    def on_result(entry):
+        if writer:
+            writer.append(entry)
+        guarded = ""
+        if "guard" in entry:
+            report = entry["guard"]
+            mode = "guard" if report["enforced"] else "guard (shadow)"
+            guarded = (f", {mode}: {report['cancelled_calls']} calls cancelled,"
+                       f" {report['skipped']['model_calls']:.1f} model calls skipped, ~{report['ms_saved']:.0f} ms saved")
+        print(f"iteration {entry['iteration']}: {entry['num_tool_calls']} tool calls"
+              f" in {entry['timing']['total_ms']:.0f} ms{guarded}")
+
+    started = time.perf_counter()
+    results = run_eval(
+        iterations=args.iterations,
+        workers=args.workers,
+        prompt=args.prompt,
+        model_id=args.model_id,
+        variant=args.variant,
+        model_factory=model_factory,
+        load_history=load_history,
+        prompt_cache=args.prompt_cache,
+        on_result=on_result,
+        skip=skip,
+        tool_executor="sequential" if args.sequential_tools else "concurrent",
+        tool_set=args.tool_set,
+        token_budget=args.token_budget,
+        guard="shadow" if args.guard_shadow else args.guard,
+        guard_continuations=continuations,
+        compact_specs=args.compact_specs,
+        stop=stop,
+        store_factory=sqlite_store_factory(args.db) if args.db else fresh_stores,
+    )
+    if writer:
+        writer.close()
+    else:
+        write_results(results, args.output)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {len(results)} iterations to {args.output} in {elapsed:.1f}s")
+    cache_read = sum(r["usage"]["cache_read_input_tokens"] for r in results)
+    cache_write = sum(r["usage"]["cache_write_input_tokens"] for r in results)
+    input_tokens = sum(r["usage"]["input_tokens"] for r in results)
+    print(f"Input tokens: {input_tokens} uncached, {cache_read} cache read, {cache_write} cache write")
+    print(f"Tool specs: ~{results[0]['tool_spec_tokens'] if results else 0} tokens per model call")
+    if stop:
+        saved = args.iterations - len(results) - len(skip)
+        decision = f"stopped at {stop.runs} ({stop.reason})" if stop.stopped else "did not stop"
+        print(f"Early stopping: {decision}; {saved} of {args.iterations} iterations saved")
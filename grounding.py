@@ -0,0 +1,325 @@
+"""Response grounding: do the dietary claims in the assistant's text match the tool data?
+
+README check 4. Every assistant text block in an iteration's `conversation` is scanned
+once by a single precompiled pattern that matches, in one left-to-right pass, menu item
+names, distinctive name words ("pizza") and IDs (including IDs not on the menu), the
+dietary terms, negations, hedges ("could be made vegan") and clause boundaries. All the
+phrases share one trie and a dictionary gives each its kind. A small
+state machine turns the token stream into claims: each dietary term in a clause is a
+claim about the items mentioned in that clause, or about the menu as a whole if none
+is ("I don't see any vegan options"). Clauses that state an intent or a question ("Let
+me check whether...") make no claim.
+
+Each claim is then judged against the tool data the transcript had seen by that point:
+dietary calls in earlier assistant messages (whose results are the menu data) and any
+toolResult blocks. A claim is
+
+- contradicted if it asserts something the menu data says is false (a hedged claim is
+  never contradicted, since it asserts nothing),
+- supported if the tool data seen so far backs it,
+- unsupported otherwise, e.g. a correct guess made without calling the tool.
+
+    python grounding.py sonnet_test_results.json kimi_test_results.json
+    python -m benchmarks.bench_grounding --transcripts 100000
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from menu import DIET_TAGS, IMPLIED_TAGS, MENU, item_tags
+
+
+SUPPORTED, UNSUPPORTED, CONTRADICTED = "supported", "unsupported", "contradicted"
+
+# Dietary phrases -> (tag, forced polarity). None keeps the clause's polarity.
+DIET_TERMS = {
+    "vegan": ("Vegan", None),
+    "plant-based": ("Vegan", None),
+    "plant based": ("Vegan", None),
+    "vegetarian": ("Vegetarian", None),
+    "gluten-free": ("Gluten-Free", None),
+    "gluten free": ("Gluten-Free", None),
+    "contains gluten": ("Gluten-Free", False),
+    "dairy-free": ("Dairy-Free", None),
+    "dairy free": ("Dairy-Free", None),
+    "contains dairy": ("Dairy-Free", False),
+}
+# Any other "...n't" word is matched by its "n't".
+NEGATIONS = ("not", "no", "non", "none", "never", "neither", "nor", "without", "lack", "lacks", "isn't", "aren't",
+             "don't", "doesn't", "didn't", "can't", "cannot")
+# "made" is not a hedge on its own ("made with fresh basil"); "could be made vegan" is hedged by "could".
+HEDGES = ("could", "might", "may", "possibly", "potentially", "perhaps", "modified", "modify", "substitute",
+          "substituted", "omit", "remove", "removing", "request", "likely", "probably", "typically", "usually")
+INTENTS = ("let me", "i'll", "i will", "i'm going to", "check", "checking", "see if", "see what", "find out",
+           "look into", "whether", "if", "ask", "asked", "confirm", "confirming", "looking for", "would you like",
+           "let's", "want", "wanted", "prefer", "sure", "tell")
+ANAPHORS = ("it", "it's", "its", "this", "that", "these", "they", "both", "neither", "either", "which")
+# Clauses opened by a dash or ", and" continue the previous clause's subject.
+CONTINUATIONS = r"[ \t][-\u2013\u2014][ \t]|,\s+and\b"
+BOUNDARIES = r"[.!;:](?=[\s*]|$)|\?|\n"
+BOUNDARY_WORDS = ("but", "however", "while")
+# Markdown headings ("**Vegan Options:**", "## Dietary info") label a topic; they claim nothing.
+HEADING = r"\*\*[^*\n]*(?::\*\*|\*\*:)|^[ \t]*\*\*[^*\n]*\*\*[ \t]*$|^[ \t]*#+[^\n]*"
+ID_PATTERN = r"m\d{3}"  # a whole word of the lower-cased text
+
+
+def _trie(phrases):
+    """Regex matching any of the lower-case phrases, compiled as a character trie.
+
+    Each branch point is a single alternation keyed on the next character, so a word that
+    starts no phrase fails on its first letter instead of being tried against every
+    phrase. Spaces match any whitespace; the longest phrase wins.
+    """
+    root = {}
+    for phrase in phrases:
+        node = root
+        for char in phrase.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [(r"\s+" if char == " " else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(root)
+
+
+class Claim(NamedTuple):
+    message: int
+    item: str | None
+    tag: str
+    positive: bool
+    hedged: bool
+    status: str
+    text: str
+
+
+class GroundingChecker:
+    """Extracts dietary claims from transcripts and judges them against the tool data.
+
+    Args:
+        menu: MenuStore whose items, names and tags are the ground truth.
+        cache_size: Distinct text blocks whose extracted claims are memoized (models
+            repeat themselves: a third of the recorded Sonnet text blocks are
+            duplicates). 0 disables the memo.
+    """
+
+    def __init__(self, menu=MENU, cache_size=4096):
+        self.truth = {item.id: item_tags(item) for item in menu.items}
+        self.tagged = {tag: {i for i, tags in self.truth.items() if tag in tags} for tag in DIET_TAGS}
+        # Full names, plus name words that belong to exactly one item ("pizza", "salmon").
+        self.names = {item.name.lower(): item.id for item in menu.items}
+        words = {}
+        for item in menu.items:
+            for word in item.name.lower().split():
+                words.setdefault(word, set()).add(item.id)
+        for word, ids in words.items():
+            if len(ids) == 1 and len(word) > 3:
+                self.names.setdefault(word, next(iter(ids)))
+        # Every phrase goes into one trie and is classified by a dictionary lookup, so a word
+        # start costs one branch on its first letter; the first kind listed wins a phrase.
+        self.kinds = {}
+        for kind, phrases in (("item", self.names), ("diet", DIET_TERMS), ("neg", NEGATIONS), ("hedge", HEDGES),
+                              ("intent", INTENTS), ("anaphor", ANAPHORS), ("boundary", BOUNDARY_WORDS)):
+            for phrase in phrases:
+                self.kinds.setdefault(phrase, kind)
+        # Punctuation alternatives sit behind one lookahead, so most letters fail on a single test.
+        self.pattern = re.compile(
+            rf"\b(?:(?P<id>{ID_PATTERN})|(?P<word>{_trie(self.kinds)})(?P<plural>s)?)\b"
+            rf"|(?=[-*#\s,.!;:?n\u2013\u2014])(?:(?P<heading>{HEADING})"
+            rf"|(?P<continuation>{CONTINUATIONS})"
+            rf"|(?P<boundary>{BOUNDARIES})"
+            rf"|(?P<neg>\Bn't\b))",
+            re.MULTILINE,
+        )
+        self._extract = lru_cache(maxsize=cache_size)(self._scan) if cache_size else self._scan
+
+    @staticmethod
+    def _lower(text):
+        return text.lower().replace("\u2019", "'")
+
+    def _tokens(self, lowered):
+        """(kind, match) for each matched token of a lower-cased text; a phrase's kind is looked up."""
+        kinds = self.kinds
+        for match in self.pattern.finditer(lowered):
+            kind = match.lastgroup
+            if kind == "plural" or kind == "word":
+                phrase = match.group("word")
+                kind = kinds.get(phrase) or kinds[" ".join(phrase.split())]
+                if kind != "item" and match.group("plural"):
+                    continue  # only item names take a plural "s"
+            yield kind, match
+
+    def _items(self, lowered):
+        """Item IDs mentioned in a lower-cased text, in order."""
+        return [match.group().upper() if kind == "id" else self.names[" ".join(match.group("word").split())]
+                for kind, match in self._tokens(lowered) if kind in ("id", "item")]
+
+    def extract(self, text):
+        """Raw claims in a text: (item ID or None, tag, positive, hedged, clause text) tuples.
+
+        A clause without items of its own is about the last items named (the subject) if
+        it continues the previous clause after a dash or ", and", uses a pronoun ("so it's
+        not vegan") or only says what something contains; otherwise its claims are about
+        the menu as a whole.
+        """
+        return self._extract(text)
+
+    def _scan(self, text):
+        lowered = self._lower(text)
+        if len(lowered) != len(text):
+            text = lowered  # lower() changed the length, so offsets would not line up
+        claims = []
+        subject = []
+        items, diets = [], []
+        negated = hedged = intent = refers = False
+        start = 0
+        for kind, match in self._tokens(lowered):
+            if kind in ("boundary", "continuation", "heading"):
+                if diets and not intent and match.group() != "?":
+                    self._close(claims, items, subject, refers, diets, hedged, text[start:match.start()])
+                if items:
+                    subject = items
+                if kind == "heading":
+                    subject = self._items(match.group()) or subject
+                items, diets = [], []
+                negated = hedged = intent = False
+                refers = kind == "continuation"
+                start = match.end()
+            elif kind == "id":
+                items.append(match.group().upper())
+            elif kind == "item":
+                items.append(self.names[" ".join(match.group("word").split())])
+            elif kind == "diet":
+                tag, forced = DIET_TERMS[" ".join(match.group("word").split())]
+                diets.append((tag, (not negated) if forced is None else forced, forced is not None))
+            elif kind == "hedge":
+                hedged = True
+            elif kind == "intent":
+                intent = True
+            elif kind == "anaphor":
+                refers = True
+            else:
+                negated = True
+                refers = refers or match.group() in ANAPHORS  # "neither"
+        if diets and not intent:
+            self._close(claims, items, subject, refers, diets, hedged, text[start:])
+        return tuple(claims)
+
+    @staticmethod
+    def _close(claims, items, subject, refers, diets, hedged, clause):
+        if not items and (refers or all(forced for _, _, forced in diets)):
+            items = subject
+        clause = " ".join(clause.split())
+        for tag, positive, forced in dict.fromkeys(diets):
+            # "contains dairy" describes something, never the menu as a whole.
+            for item in dict.fromkeys(items) or (() if forced else (None,)):
+                claims.append((item, tag, positive, hedged, clause))
+
+    def _record_call(self, name, tool_input, facts):
+        """Facts (item, tag) -> bool that a tool call's result revealed."""
+        if name == "get_dietary_values_per_item":
+            item_ids = [tool_input.get("item_id")]
+        elif name == "get_dietary_values":
+            item_ids = tool_input.get("item_ids") or []
+            if "all" in item_ids:
+                item_ids = list(self.truth)
+        elif name == "find_items_by_diet":
+            tag = next((t for t in DIET_TAGS if t.lower() == str(tool_input.get("diet", "")).lower()), None)
+            if tag is not None:
+                for item_id, tags in self.truth.items():
+                    facts[item_id, tag] = tag in tags
+            return
+        else:
+            return
+        for item_id in item_ids:
+            tags = self.truth.get(item_id)
+            if tags is not None:
+                for tag in DIET_TAGS:
+                    facts[item_id, tag] = tag in tags
+
+    def _record_result(self, text, facts):
+        """Facts from a toolResult's text: each dietary line names one item and lists its labels."""
+        for line in text.splitlines():
+            if " cal " not in line:
+                continue
+            mentions = self._items(self._lower(line))
+            if len(set(mentions)) != 1:
+                continue
+            item_id = mentions[0]
+            labels = {label.strip() for label in line.rpartition("|")[2].split(",")}
+            tags = {tag for tag in DIET_TAGS if tag in labels}
+            for tag in list(tags):
+                tags.update(IMPLIED_TAGS.get(tag, ()))
+            for tag in DIET_TAGS:
+                facts[item_id, tag] = tag in tags
+
+    def _judge(self, item, tag, positive, hedged, facts):
+        if item is None:
+            actual = bool(self.tagged[tag])
+            if positive:
+                backed = any(facts.get((i, tag)) for i in self.truth)
+            else:
+                backed = all(facts.get((i, tag)) is False for i in self.truth)
+        else:
+            if item not in self.truth:
+                return CONTRADICTED
+            actual = tag in self.truth[item]
+            backed = facts.get((item, tag)) is positive
+        if positive != actual and not hedged:
+            return CONTRADICTED
+        return SUPPORTED if backed else UNSUPPORTED
+
+    def check(self, conversation):
+        """Judge every claim in a transcript (a list of messages). Returns a list of Claims."""
+        facts = {}
+        claims = []
+        for index, message in enumerate(conversation):
+            content = message["content"]
+            if message["role"] == "assistant":
+                for block in content:
+                    if "text" in block:
+                        for item, tag, positive, hedged, clause in self.extract(block["text"]):
+                            status = self._judge(item, tag, positive, hedged, facts)
+                            claims.append(Claim(index, item, tag, positive, hedged, status, clause))
+            for block in content:
+                if "toolUse" in block:
+                    self._record_call(block["toolUse"]["name"], block["toolUse"].get("input") or {}, facts)
+                elif "toolResult" in block:
+                    text = " ".join(c.get("text", "") for c in block["toolResult"].get("content", []))
+                    self._record_result(text, facts)
+        return claims
+
+    def counts(self, conversation):
+        """(claims, unsupported, contradicted) for a transcript."""
+        claims = self.check(conversation)
+        return (len(claims), sum(c.status == UNSUPPORTED for c in claims),
+                sum(c.status == CONTRADICTED for c in claims))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from results_io import iter_results
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+", help="Results files with a `conversation` field")
+    parser.add_argument("--all", action="store_true", help="Also list supported claims")
+    args = parser.parse_args()
+
+    checker = GroundingChecker()
+    for path in args.paths:
+        print(f"## {path}")
+        for entry in iter_results(path):
+            for claim in checker.check(entry.get("conversation", [])):
+                if args.all or claim.status != SUPPORTED:
+                    subject = claim.item or "menu"
+                    polarity = "" if claim.positive else "not "
+                    hedge = " (hedged)" if claim.hedged else ""
+                    print(f"  iteration {entry['iteration']}: {claim.status:<12} {subject} {polarity}{claim.tag}"
+                          f"{hedge}: {claim.text[:100]}")
@@ -0,0 +1,323 @@
+"""Early-termination guard: declarative rules that stop tool calls once a request is impossible.
+
+The short-circuit failure in the README: after `check_availability` shows the requested
+time isn't open, models keep calling the dietary tools, even though nothing they learn
+can lead to a booking. A GuardRule names the tool whose result it inspects, a condition
+that returns a reason when the request has become impossible, and the tools to refuse
+from then on. GuardHook applies the rules through strands hooks: once a rule fires,
+forbidden calls are cancelled (the model sees an error result carrying the reason) and,
+if the rule says so, the agent loop ends after the current tool batch with the reason as
+the final reply, without another model call.
+
+Calls that were already running when the rule fired (e.g. dietary checks issued in the
+same turn as `check_availability` under the concurrent executor) still complete.
+
+What ending the turn saves depends on what the model would have done next: one more
+round trip to reply, or another round of dietary calls first. That can't be seen from
+the guarded run, so it is measured. GuardHook(enforce=False) evaluates the rules without
+acting on them and reports the model calls, output tokens and tool calls the agent made
+after the rule fired; Continuation.from_reports() averages those per rule. An enforcing
+GuardHook prices the cancelled calls and that continuation with the model and tool
+latency its TimingRecorder measured in the same run. Without a continuation for the
+rule, it counts only the one round trip that reading the batch's results takes.
+
+    agent = create_agent(guard=True)
+    python eval_runner.py --replay sonnet_test_results.json --guard-shadow --output shadow.json
+    python eval_runner.py --replay sonnet_test_results.json --guard --guard-calibration shadow.json
+"""
+
+import re
+import statistics
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+
+from strands.hooks import HookProvider
+from strands.hooks.events import (AfterModelCallEvent, AfterToolCallEvent, AfterToolsEvent, BeforeInvocationEvent,
+                                  BeforeModelCallEvent, BeforeToolCallEvent)
+
+from reservations import format_slot, parse_time
+
+
+DATE_PATTERN = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+TIME_PATTERN = re.compile(r"\b(\d{1,2}(?::\d{2})?\s*[AaPp]\.?[Mm]\.?)")
+
+
+@dataclass(frozen=True)
+class GuardRule:
+    """A condition on one tool's result that forbids other tools for the rest of the invocation.
+
+    Attributes:
+        name: Identifier recorded when the rule fires.
+        after: Tool whose results the rule inspects.
+        when: Function (prompt, tool input, result text) -> reason string if the request can
+            no longer succeed, else None. `prompt` is the latest user text message.
+        forbid: Tools to cancel from then on.
+        end_turn: If True, end the agent loop after the tool batch in which the rule fired,
+            replying with the reason.
+    """
+
+    name: str
+    after: str
+    when: Callable[[str, dict, str], str | None]
+    forbid: tuple[str, ...]
+    end_turn: bool = True
+
+
+def requested_slot(prompt):
+    """(date, display time) requested in a prompt, e.g. ("2026-03-15", "10:00 PM"). Either may be None."""
+    date = DATE_PATTERN.search(prompt)
+    time = TIME_PATTERN.search(prompt)
+    if time is not None:
+        try:
+            time = format_slot(parse_time(time.group(1).replace(".", "")))
+        except ValueError:
+            time = None
+    return date and date.group(1), time
+
+
+def slot_unavailable(prompt, tool_input, result):
+    """Reason the requested time can't be booked, given a check_availability result for its date."""
+    date, time = requested_slot(prompt)
+    if time is None or (date is not None and tool_input.get("date") != date):
+        return None
+    _, _, listed = result.partition(": ")
+    slots = listed.split(", ") if result.startswith("Available slots") else []
+    if time in slots:
+        return None
+    available = f" Available times: {', '.join(slots)}." if slots else ""
+    return (f"{time} isn't available on {tool_input.get('date')} for {tool_input.get('number_of_guests')} "
+            f"guests, so I can't make that booking.{available}")
+
+
+DIETARY_TOOLS = ("get_menu", "get_dietary_values_per_item", "get_dietary_values", "find_items_by_diet")
+
+REQUESTED_SLOT_UNAVAILABLE = GuardRule(
+    name="requested_slot_unavailable",
+    after="check_availability",
+    when=slot_unavailable,
+    forbid=DIETARY_TOOLS + ("create_booking",),
+)
+
+DEFAULT_RULES = (REQUESTED_SLOT_UNAVAILABLE,)
+
+
+@dataclass(frozen=True)
+class Continuation:
+    """What an unguarded agent did after a rule fired, i.e. what ending the turn there skips.
+
+    The default is the one model call that reading the tool batch's results always takes.
+
+    Attributes:
+        model_calls: Mean model calls made after the tool batch in which the rule fired.
+        output_tokens: Mean output tokens per such call. None prices them as average calls.
+        tool_calls: Mean calls per tool made after that batch, by tool name.
+    """
+
+    model_calls: float = 1.0
+    output_tokens: float | None = None
+    tool_calls: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_reports(cls, reports):
+        """{rule name: mean Continuation} from the reports of GuardHook(enforce=False) runs."""
+        by_rule = {}
+        for report in reports:
+            if not report["enforced"] and report["ending_rule"] is not None:
+                by_rule.setdefault(report["ending_rule"], []).append(report["skipped"])
+        continuations = {}
+        for rule, seen in by_rule.items():
+            model_calls = sum(skipped["model_calls"] for skipped in seen)
+            tools = {}
+            for skipped in seen:
+                for tool, count in skipped["tool_calls"].items():
+                    tools[tool] = tools.get(tool, 0) + count
+            continuations[rule] = cls(
+                model_calls=model_calls / len(seen),
+                output_tokens=sum(skipped["output_tokens"] for skipped in seen) / model_calls if model_calls else None,
+                tool_calls={tool: count / len(seen) for tool, count in tools.items()},
+            )
+        return continuations
+
+
+def _latest_prompt(messages):
+    for message in reversed(messages):
+        if message["role"] == "user":
+            texts = [block["text"] for block in message["content"] if "text" in block]
+            if texts:
+                return " ".join(texts)
+    return ""
+
+
+def _result_text(result):
+    return " ".join(item.get("text", "") for item in result.get("content", []))
+
+
+class GuardHook(HookProvider):
+    """Applies GuardRules to an agent, one invocation at a time.
+
+    After each invocation, `report()` lists the rules that fired, the calls cancelled,
+    whether the loop was ended early, the work that saved (`skipped`) and, given a
+    TimingRecorder, its cost in `ms_saved`. Use one GuardHook per agent.
+
+    With enforce=False nothing is cancelled or ended: `cancelled` lists the calls the
+    guard would have cancelled and `skipped` what the agent actually did after the
+    turn would have ended, which is what Continuation.from_reports() averages.
+
+    Args:
+        rules: GuardRules to apply. Defaults to DEFAULT_RULES.
+        enforce: If False, only record what the rules would have done.
+        continuations: {rule name: Continuation} measured in enforce=False runs, used to
+            estimate what ending the turn skips. Rules without one skip one model call.
+        timing: The agent's eval_runner.TimingRecorder (or anything with its `model_calls`
+            and `tool_calls` lists), whose measured latencies price `ms_saved`. Without
+            it `ms_saved` is None.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, enforce=True, continuations=None, timing=None):
+        self.rules = tuple(rules)
+        self.enforce = enforce
+        self.continuations = dict(continuations or {})
+        self.timing = timing
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, event=None):
+        with self._lock:
+            self.fired = []
+            self.cancelled = []
+            self.ended_turn = False
+            self._forbidden = {}
+            self._end_turn = None
+            self._ending_rule = None
+            self._after_end = {"model_calls": 0, "output_tokens": 0, "tool_calls": {}}
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeInvocationEvent, self._reset)
+        registry.add_callback(BeforeModelCallEvent, self._on_before_model_call)
+        registry.add_callback(AfterModelCallEvent, self._on_after_model_call)
+        registry.add_callback(BeforeToolCallEvent, self._on_before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self._on_after_tool_call)
+        registry.add_callback(AfterToolsEvent, self._on_after_tools)
+
+    # Model and tool calls after an ending rule fired only happen with enforce=False; they
+    # are what ending the turn would have skipped.
+
+    def _on_before_model_call(self, event):
+        with self._lock:
+            if self._ending_rule is not None:
+                self._after_end["model_calls"] += 1
+
+    def _on_after_model_call(self, event):
+        with self._lock:
+            if self._ending_rule is not None and self._after_end["model_calls"] and event.stop_response is not None:
+                usage = event.stop_response.message.get("metadata", {}).get("usage", {})
+                self._after_end["output_tokens"] += usage.get("outputTokens", 0)
+
+    def _on_before_tool_call(self, event):
+        name = event.tool_use["name"]
+        with self._lock:
+            if self._after_end["model_calls"]:
+                tools = self._after_end["tool_calls"]
+                tools[name] = tools.get(name, 0) + 1
+                return
+            reason = self._forbidden.get(name)
+            if reason is not None:
+                if self.enforce:
+                    event.cancel_tool = f"Not called: {reason}"
+                self.cancelled.append({"tool": name, "input": event.tool_use["input"]})
+
+    def _on_after_tool_call(self, event):
+        if event.cancel_message is not None or not isinstance(event.result, dict):
+            return
+        rules = [rule for rule in self.rules if rule.after == event.tool_use["name"]]
+        if not rules:
+            return
+        prompt = _latest_prompt(event.agent.messages)
+        text = _result_text(event.result)
+        for rule in rules:
+            reason = rule.when(prompt, event.tool_use["input"], text)
+            if reason is None:
+                continue
+            with self._lock:
+                self.fired.append(rule.name)
+                for name in rule.forbid:
+                    self._forbidden.setdefault(name, reason)
+                if rule.end_turn and self._end_turn is None:
+                    self._end_turn = reason
+                    self._ending_rule = rule.name
+
+    def _on_after_tools(self, event):
+        with self._lock:
+            if self.enforce and self._end_turn is not None and not self.ended_turn:
+                event.end_turn = self._end_turn
+                self.ended_turn = True
+
+    def _skipped(self):
+        """Model calls, output tokens and tool calls skipped by ending the turn: observed, or estimated."""
+        if self._ending_rule is None or (self.enforce and not self.ended_turn):
+            return {"model_calls": 0, "output_tokens": 0, "tool_calls": {}}
+        if not self.enforce:
+            return {**self._after_end, "tool_calls": dict(self._after_end["tool_calls"])}
+        continuation = self.continuations.get(self._ending_rule, Continuation())
+        return {
+            "model_calls": continuation.model_calls,
+            "output_tokens": (None if continuation.output_tokens is None
+                              else continuation.output_tokens * continuation.model_calls),
+            "tool_calls": dict(continuation.tool_calls),
+        }
+
+    def cost_ms(self, model_calls=0, output_tokens=None, tool_calls=None):
+        """What `model_calls` model calls (with `output_tokens` tokens in all) and `tool_calls`
+        ({tool: count}) take at the latencies `timing` measured, in ms. None without timing.
+
+        A model call costs the mean measured time to first token plus output tokens at the
+        measured generation rate; with no token count, or no time-to-first-token
+        measurements, it costs the mean measured model call. A tool call costs the mean
+        measured duration of that tool, or of all tools if it wasn't called.
+        """
+        if self.timing is None:
+            return None
+        calls = [call for call in self.timing.model_calls if call.get("stop_reason") != "error"]
+        ms = 0.0
+        if model_calls and calls:
+            first_token = [call.get("time_to_first_token_ms") for call in calls]
+            generated = sum(call.get("output_tokens", 0) for call in calls)
+            if output_tokens is None or None in first_token or not generated:
+                ms += model_calls * statistics.mean(call["duration_ms"] for call in calls)
+            else:
+                per_token = (sum(call["duration_ms"] for call in calls) - sum(first_token)) / generated
+                ms += model_calls * statistics.mean(first_token) + output_tokens * per_token
+        durations = {}
+        for call in self.timing.tool_calls:
+            if call["status"] not in ("cancelled", "pending") and "duration_ms" in call:
+                durations.setdefault(call["tool"], []).append(call["duration_ms"])
+        every = [duration for measured in durations.values() for duration in measured]
+        for tool, count in (tool_calls or {}).items():
+            if count and every:
+                ms += count * statistics.mean(durations.get(tool, every))
+        return round(ms, 3)
+
+    def report(self):
+        """What the guard did during the last invocation, for a results entry.
+
+        `skipped` is what ending the turn saved (observed with enforce=False, estimated
+        from the rule's Continuation otherwise) and `ms_saved` the cost of it plus the
+        cancelled calls.
+        """
+        with self._lock:
+            cancelled = list(self.cancelled)
+            report = {
+                "enforced": self.enforce,
+                "fired": list(self.fired),
+                "ending_rule": self._ending_rule,
+                "cancelled_calls": len(cancelled),
+                "cancelled": cancelled,
+                "ended_turn": self.ended_turn,
+                "skipped": self._skipped(),
+            }
+        tools = dict(report["skipped"]["tool_calls"])
+        for call in cancelled:
+            tools[call["tool"]] = tools.get(call["tool"], 0) + 1
+        report["ms_saved"] = self.cost_ms(report["skipped"]["model_calls"], report["skipped"]["output_tokens"], tools)
+        return report
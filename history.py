@@ -0,0 +1,305 @@
+"""Mock conversation histories: turn templates, a length-targeted generator, and
+structurally shared prefixes for agents that start from the same history.
+
+The mock history used by `--history` is assembled from SMALL_TALK_TURNS (played twice)
+plus ACCOUNT_TURN. generate_history() builds histories of a target turn or token count
+from the same templates, including tool-use turns, for context-length sweeps:
+
+    python history.py --tokens 1000 10000 100000
+
+`list(MOCK_CONVERSATION_HISTORY)` hands every agent the same message dicts, so one
+agent mutating a message silently changes it for all of them, while a deep copy per
+agent costs every content list and block dict again. SharedHistory freezes the prefix
+once and forks it per agent: each fork gets its own list and its own top-level message
+dicts (the level strands writes to, e.g. `message["content"] = ...` when truncating),
+while the content lists and blocks underneath stay shared and read-only. Writing to a
+shared block raises TypeError instead of corrupting other agents; replacing a message's
+content gives that agent its own copy, i.e. copy-on-write per message.
+"""
+
+import copy
+import json
+import math
+from typing import NamedTuple
+
+
+class ToolExchange(NamedTuple):
+    """A tool call made inside a turn, with the result the tool returned."""
+
+    name: str
+    input: dict
+    result: str
+    tool_use_id: str = None
+
+
+class Turn(NamedTuple):
+    """One user message and the assistant's reply, optionally via a tool call."""
+
+    user: str
+    assistant: str
+    tool: ToolExchange = None
+
+
+SMALL_TALK_TURNS = [
+    Turn(
+        "Hey how are you?",
+        "Hello! I'm doing great, thank you for asking! Welcome to Vino's Italian Restaurant! How can I help you today? Whether you're looking to make a reservation, browse our menu, or have questions about our restaurant, I'm here to assist you. What would you like to do?",
+    ),
+    Turn(
+        "Oh cool where are you located?",
+        "We're located at 55 Main St. in Smallsville, Kentucky. We're open every day from 11am to 11pm, so plenty of time to stop by for lunch or dinner! Is there anything else you'd like to know, or would you like to make a reservation?",
+    ),
+    Turn(
+        "Wow everyday? that's a lot! You never get a day off?",
+        "You're right, that is a lot! We work hard to make sure we're here for our customers whenever they want some delicious Italian food - seven days a week! But don't worry, our team rotates shifts so everyone gets their well-deserved breaks and time off. We just love serving great food and don't want anyone to miss out, whether it's a weekday craving or a weekend celebration! Is there anything I can help you with today? Maybe a reservation or checking out our menu?",
+    ),
+    Turn(
+        "Who is Vino? Tell me about him",
+        "That's a great question! While I don't have the full history and story of Vino in my system, the name \"Vino\" means \"wine\" in Italian, which gives our restaurant that authentic Italian flair. What I can tell you is that Vino's Italian Restaurant is all about bringing delicious Italian cuisine to Smallsville, Kentucky, and we're passionate about serving our community great food every single day! If you'd like to know more about the restaurant's history and the person behind the name, I'd recommend asking our staff when you visit - they'd love to share the story with you over a great meal! Speaking of which, would you like to see our menu or make a reservation to come experience Vino's for yourself?",
+    ),
+    Turn(
+        "Super cool, so like where are you located again? Sorry I forgot",
+        "No problem at all! We're located at 55 Main St. in Smallsville, Kentucky. Open every day from 11am to 11pm! Feel free to ask if you need anything else!",
+    ),
+    Turn(
+        "Oooh smallsville, that's not too far from me. It's like 30 mins away. Do you know if there are any other restaurants like you around?",
+        "That's great that we're only about 30 minutes away from you! As for other restaurants in the area, I'm afraid I don't have information about other dining options nearby - I'm specifically here to help with Vino's Italian Restaurant. But hey, I'd love to think we're the best Italian spot around! Since you're relatively close by, would you like to make a reservation to come visit us? Or maybe take a look at our menu to see what we have to offer? I'd be happy to help you plan a visit!",
+    ),
+    Turn(
+        "Do you know about snowmen?",
+        "Ha! That's a fun question! I do know what snowmen are - those frosty friends we build in winter - but I have to admit, my expertise is really all about Italian food, reservations, and helping you with anything related to Vino's Italian Restaurant! Is there something specific you'd like help with today? Maybe planning a cozy dinner reservation for after a day out in the snow? Or checking out our menu for some warm, comforting Italian dishes?",
+    ),
+    Turn(
+        "I have a good friend Jenny she's super cool. She likes italian food and japanese food",
+        "Jenny sounds like she has great taste! Italian and Japanese food are both amazing cuisines. Well, I can definitely help with the Italian food part! Vino's has lots of delicious options that Jenny might love. Would you like to see our menu to check out what we offer? Or make a reservation for you and Jenny? Or get information about any dietary options for specific menu items? It could be a fun outing for you two! What do you think?",
+    ),
+    Turn(
+        "No no just chatting in general. How's the weather been like lately?",
+        "I appreciate the chat! Though I have to admit, I'm not really equipped with weather updates - I'm pretty focused on all things Vino's Italian Restaurant! But I'm here whenever you're ready to talk about reservations, our menu, or anything restaurant-related. Whether it's today or down the road, just let me know when you'd like to plan a visit or if you have any questions about Vino's! Is there anything else about the restaurant I can help you with?",
+    ),
+]
+
+ACCOUNT_TURN = Turn(
+    "Yeah actually, can you create an account for me? My name is Michael Man and my email is mikeman@gmail.com",
+    "Your account has been created successfully! Here are your details:\n\n- Name: Michael Man\n- Email: mikeman@gmail.com\n- Account ID: ACC-001\n\nYou're all set! Would you like to make a reservation or check out our menu?",
+    ToolExchange(
+        "create_account",
+        {"name": "Michael Man", "email": "mikeman@gmail.com"},
+        "Account created for Michael Man (mikeman@gmail.com) with ID: ACC-001",
+        "tooluse_mock0createaccount001",
+    ),
+)
+
+TOOL_TURNS = [
+    ACCOUNT_TURN,
+    Turn(
+        "Can you show me the menu?",
+        "Here's our menu:\n\n- M001: Grilled Salmon - $24.99\n- M002: Caesar Salad - $12.99\n- M003: Margherita Pizza - $16.99\n- M004: Beef Tenderloin - $34.99\n- M005: Chocolate Lava Cake - $9.99\n\nAnything catch your eye?",
+        ToolExchange(
+            "get_menu",
+            {},
+            "Restaurant Menu:\n  M001: Grilled Salmon - $24.99\n  M002: Caesar Salad - $12.99\n  M003: Margherita Pizza - $16.99\n  M004: Beef Tenderloin - $34.99\n  M005: Chocolate Lava Cake - $9.99",
+        ),
+    ),
+    Turn(
+        "What's open on 2026-04-02 for two people?",
+        "On April 2nd, 2026 we have tables for two at 12:00 PM, 2:00 PM and 6:30 PM. Would you like me to book one of those?",
+        ToolExchange(
+            "check_availability",
+            {"date": "2026-04-02", "number_of_guests": 2},
+            "Available slots on 2026-04-02 for 2 guests: 12:00 PM, 2:00 PM, 6:30 PM",
+        ),
+    ),
+    Turn(
+        "Is there an account under john@example.com?",
+        "Yes, that email belongs to John Doe's account, ACC-002. Is there anything you'd like to update on it?",
+        ToolExchange(
+            "search_account",
+            {"email": "john@example.com"},
+            "Found 1 account matching email=john@example.com: ACC-002 - John Doe (john@example.com)",
+        ),
+    ),
+]
+
+
+def turn_messages(turn, tool_use_id=None):
+    """Expand a Turn into its Bedrock-format messages (2 for chat, 4 with a tool call)."""
+    if turn.tool is None:
+        return [
+            {"role": "user", "content": [{"text": turn.user}]},
+            {"role": "assistant", "content": [{"text": turn.assistant}]},
+        ]
+    tool_use_id = turn.tool.tool_use_id or tool_use_id
+    return [
+        {"role": "user", "content": [{"text": turn.user}]},
+        {"role": "assistant", "content": [{"toolUse": {
+            "toolUseId": tool_use_id, "name": turn.tool.name, "input": turn.tool.input,
+        }}]},
+        {"role": "user", "content": [{"toolResult": {
+            "toolUseId": tool_use_id, "content": [{"text": turn.tool.result}], "status": "success",
+        }}]},
+        {"role": "assistant", "content": [{"text": turn.assistant}]},
+    ]
+
+
+def build_history(turns):
+    """Expand a sequence of Turns into one messages list, giving each tool call a unique ID."""
+    messages = []
+    for index, turn in enumerate(turns):
+        messages.extend(turn_messages(turn, tool_use_id=f"tooluse_hist{index:06d}"))
+    return messages
+
+
+def estimate_tokens(messages):
+    """Estimate the token count of a messages list (about 4 characters per token)."""
+    chars = 0
+    for message in messages:
+        for block in message["content"]:
+            if "text" in block:
+                chars += len(block["text"])
+            elif "toolUse" in block:
+                chars += len(block["toolUse"]["name"]) + len(json.dumps(block["toolUse"]["input"]))
+            elif "toolResult" in block:
+                chars += sum(len(item.get("text", "")) for item in block["toolResult"]["content"])
+    return math.ceil(chars / 4)
+
+
+def generate_history(target_turns=None, target_tokens=None, tool_turn_every=5, chat_turns=None,
+                     tool_turns=None):
+    """Generate a history of a target length by cycling through turn templates.
+
+    Exactly one of `target_turns` or `target_tokens` must be given. With `target_tokens`,
+    turns are added until the estimate (see estimate_tokens) reaches the target.
+
+    Args:
+        target_turns: Number of user/assistant turns to produce.
+        target_tokens: Approximate number of tokens to produce.
+        tool_turn_every: Every Nth turn is a tool-use turn. 0 disables tool turns.
+        chat_turns: Plain chat templates. Defaults to SMALL_TALK_TURNS.
+        tool_turns: Tool-use templates. Defaults to TOOL_TURNS.
+
+    Returns:
+        A (messages, token_estimate) tuple.
+    """
+    if (target_turns is None) == (target_tokens is None):
+        raise ValueError("Pass exactly one of target_turns or target_tokens")
+    chat_turns = chat_turns or SMALL_TALK_TURNS
+    tool_turns = tool_turns or TOOL_TURNS
+
+    messages = []
+    tokens = 0
+    index = 0
+    while (index < target_turns) if target_turns is not None else (tokens < target_tokens):
+        if tool_turn_every and index % tool_turn_every == tool_turn_every - 1:
+            # Drop any fixed tool_use_id so repeated templates still get unique IDs.
+            template = tool_turns[(index // tool_turn_every) % len(tool_turns)]
+            turn = template._replace(tool=template.tool._replace(tool_use_id=None))
+        else:
+            turn = chat_turns[index % len(chat_turns)]
+        new_messages = turn_messages(turn, tool_use_id=f"tooluse_hist{index:06d}")
+        messages.extend(new_messages)
+        tokens += estimate_tokens(new_messages)
+        index += 1
+    return messages, tokens
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is shared between agents and cannot be modified; replace it instead")
+
+
+def thaw(value):
+    """Return a plain, mutable deep copy of a frozen structure."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+class FrozenList(list):
+    """Read-only list. Copies (copy, deepcopy, pickle) come back as plain lists."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+class FrozenDict(dict):
+    """Read-only dict. Copies (copy, deepcopy, pickle) come back as plain dicts."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def freeze(value):
+    """Recursively convert dicts and lists into their read-only counterparts."""
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+class SharedHistory:
+    """An immutable message prefix that many agents can start from cheaply.
+
+    Args:
+        messages: The prefix messages. They are copied and frozen once, so later changes
+            to the original list don't leak into forks.
+    """
+
+    def __init__(self, messages):
+        self._messages = tuple(freeze(copy.deepcopy(list(messages))))
+
+    def __len__(self):
+        return len(self._messages)
+
+    @property
+    def messages(self):
+        """The frozen prefix messages, shared by every fork."""
+        return self._messages
+
+    def fork(self):
+        """Return a new messages list for one agent.
+
+        Cost is one list plus one small dict per message, independent of how much text
+        or how many content blocks the prefix holds.
+        """
+        return [dict(message) for message in self._messages]
+
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--tokens", type=int, nargs="+", help="Target token counts")
+    group.add_argument("--turns", type=int, nargs="+", help="Target turn counts")
+    parser.add_argument("--tool-turn-every", type=int, default=5, help="Every Nth turn uses a tool (0 disables)")
+    args = parser.parse_args()
+
+    print(f"{'target':>10}{'turns':>8}{'messages':>10}{'tokens':>10}")
+    for target in args.tokens or args.turns:
+        kwargs = {"target_tokens": target} if args.tokens else {"target_turns": target}
+        messages, tokens = generate_history(tool_turn_every=args.tool_turn_every, **kwargs)
+        turns = sum(1 for m in messages if m["role"] == "user" and "text" in m["content"][0])
+        print(f"{target:>10}{turns:>8}{len(messages):>10}{tokens:>10}")
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""Deferred imports and construction for a fast agent cold start.
+
+Importing strands costs most of a second, and building a BedrockModel (which creates its
+boto client) about another 100-150 ms. agent.py and prompt_eng_agent.py only need
+either once an agent actually talks to a model, so this module lets them be imported,
+and the interactive prompt shown, without paying for them:
+
+- `tool` is a drop-in for strands' @tool that returns a LazyTool: it can be called
+  like the function and reports its name without strands, and turns into the real
+  strands tool the first time anything else (its spec, streaming it) is needed.
+  create_agent passes its tools through resolve_tools().
+- LazyModel stands in for a model and builds it on the first model call.
+- deferred() is a zero-argument factory that imports a class when first called, for
+  the executor and conversation-manager tables.
+- bedrock_model() builds the BedrockModel behind a LazyModel, including its prompt-cache
+  config.
+
+The stdlib-only modules (accounts, reservations, menu, history) are cheap and imported
+eagerly.
+
+    python -X importtime agent.py --local
+    python -m benchmarks.bench_cold_start
+"""
+
+import functools
+import importlib
+import threading
+
+
+class LazyTool:
+    """A function that becomes a strands tool (strands.tool(func)) on first use."""
+
+    def __init__(self, func):
+        functools.update_wrapper(self, func)
+        self._tool = None
+        self._lock = threading.Lock()
+
+    @property
+    def tool_name(self):
+        return self.__wrapped__.__name__
+
+    def resolve(self):
+        """The strands DecoratedFunctionTool, built (and strands imported) on the first call."""
+        if self._tool is None:
+            with self._lock:
+                if self._tool is None:
+                    from strands import tool
+                    self._tool = tool(self.__wrapped__)
+        return self._tool
+
+    def __call__(self, *args, **kwargs):
+        return self.__wrapped__(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
+def tool(func):
+    """Decorator: like strands.tool, but deferred until the tool is first used (see LazyTool)."""
+    return LazyTool(func)
+
+
+def resolve_tools(tools):
+    """The tools ready to register with an Agent: LazyTools resolved, anything else as-is."""
+    return [agent_tool.resolve() if isinstance(agent_tool, LazyTool) else agent_tool for agent_tool in tools]
+
+
+class LazyModel:
+    """A model built by `factory` on first use, e.g. at the agent's first model call.
+
+    Reading or updating the config doesn't build it; anything else (stream,
+    count_tokens, ...) does, once, and is then forwarded to the built model.
+
+    Args:
+        factory: Zero-argument callable returning the model.
+        config: The config the model will have, reported until it is built.
+    """
+
+    def __init__(self, factory, config=None):
+        self._factory = factory
+        self._config = dict(config or {})
+        self._updates = {}
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        return self._model is not None
+
+    def load(self):
+        """Build the model now (e.g. in a background thread while the user types) and return it."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    model = self._factory()
+                    if self._updates:
+                        model.update_config(**self._updates)
+                    self._model = model
+        return self._model
+
+    @property
+    def stateful(self):
+        return self._model.stateful if self._model is not None else False
+
+    @property
+    def config(self):
+        return self._model.config if self._model is not None else self._config
+
+    def get_config(self):
+        return self._model.get_config() if self._model is not None else self._config
+
+    def update_config(self, **model_config):
+        if self._model is not None:
+            self._model.update_config(**model_config)
+        else:
+            self._config.update(model_config)
+            self._updates.update(model_config)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+
+def deferred(module, name, **kwargs):
+    """Zero-argument factory for module.name(**kwargs) that imports the module on its first call."""
+    def factory():
+        return getattr(importlib.import_module(module), name)(**kwargs)
+    return factory
+
+
+
+def bedrock_model(prompt_cache=False, **model_kwargs):
+    """A strands BedrockModel(**model_kwargs).
+
+    With prompt_cache, strands places the cache points: after the tool specs, after the
+    system prompt and in the latest user message, whose cached prefix includes any
+    pre-loaded history. The "anthropic" strategy places them without checking the model
+    ID, so callers only enable it for models that support Bedrock prompt caching.
+    """
+    from strands.models import BedrockModel, CacheConfig
+    if prompt_cache:
+        model_kwargs["cache_config"] = CacheConfig(strategy="anthropic", tools_ttl=True)
+    return BedrockModel(**model_kwargs)
@@ -0,0 +1,217 @@
+"""Local stand-in models that let the agent run without Bedrock.
+
+A ScriptedModel answers every request from a fixed list of assistant turns, so the
+full agent loop (tool dispatch, hooks, history handling) can be exercised offline.
+Turns can come from a compact tool-call plan or be replayed from the `conversation`
+arrays in the recorded *_test_results.json files, and synthetic time-to-first-token
+and token rate can be layered on top to approximate a real model.
+"""
+
+import asyncio
+import json
+import math
+import re
+import time
+
+from strands.models import Model
+
+
+# The correct plan for the vegan test prompt: menu, all five dietary checks,
+# then availability, then a final answer without booking (10:00 PM is not open).
+VEGAN_TEST_PLAN = [
+    [("get_menu", {})],
+    [("get_dietary_values_per_item", {"item_id": f"M00{i}"}) for i in range(1, 6)],
+    [("check_availability", {"date": "2026-03-15", "number_of_guests": 4})],
+    "The Chocolate Lava Cake is vegan, but 10:00 PM isn't available on 2026-03-15, so I haven't booked.",
+]
+
+# The same plan for the batch tool set: one get_dietary_values call covers every item.
+BATCH_TEST_PLAN = [
+    [("get_menu", {})],
+    [("get_dietary_values", {"item_ids": ["all"]})],
+    VEGAN_TEST_PLAN[2],
+    VEGAN_TEST_PLAN[3],
+]
+
+# The same plan for the diet_index tool set: one indexed lookup answers the vegan question.
+DIET_INDEX_TEST_PLAN = [
+    [("find_items_by_diet", {"diet": "Vegan"})],
+    VEGAN_TEST_PLAN[2],
+    VEGAN_TEST_PLAN[3],
+]
+
+# Touches each of the nine tools in TOOLS once, for loop-overhead benchmarks.
+ALL_TOOLS_PLAN = [
+    [("create_account", {"name": "Jane Roe", "email": "jane@example.com"})],
+    [("search_account", {"email": "jane@example.com"})],
+    [("update_account", {"account_id": "ACC-001", "name": "Jane Smith"})],
+    [("get_menu", {})],
+    [("get_dietary_values_per_item", {"item_id": "M005"})],
+    [("check_availability", {"date": "2026-03-15", "number_of_guests": 4})],
+    [("create_booking", {"date": "2026-03-15", "number_of_guests": 4, "name": "Jane Smith"})],
+    [("check_reservation_details", {"reservation_id": "RES-101"})],
+    [("cancel_reservation", {"reservation_id": "RES-101"})],
+    "All set, Jane.",
+]
+
+_CHUNK_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def _estimate_tokens(value):
+    """Rough token estimate (4 characters per token) used for synthetic usage metrics."""
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return math.ceil(len(text) / 4)
+
+
+def plan_to_turns(plan):
+    """Convert a compact plan into assistant message content lists.
+
+    Args:
+        plan: List of steps. A string step is a text reply; a list step is a batch of
+            (tool_name, tool_input) pairs emitted together in one assistant turn.
+    """
+    turns = []
+    for step_index, step in enumerate(plan):
+        if isinstance(step, str):
+            turns.append([{"text": step}])
+            continue
+        content = []
+        for call_index, (name, tool_input) in enumerate(step):
+            tool_use_id = f"tooluse_local{step_index:03d}{call_index:03d}"
+            content.append({"toolUse": {"toolUseId": tool_use_id, "name": name, "input": tool_input}})
+        turns.append(content)
+    return turns
+
+
+def load_recorded_turns(path, iteration=1):
+    """Read the assistant turns of one iteration from a *_test_results.json file."""
+    with open(path) as f:
+        results = json.load(f)
+    for entry in results:
+        if entry["iteration"] == iteration:
+            return [m["content"] for m in entry.get("conversation", []) if m["role"] == "assistant"]
+    raise ValueError(f"Iteration {iteration} not found in {path}")
+
+
+class ScriptedModel(Model):
+    """Model that replays a fixed sequence of assistant turns.
+
+    The turn to emit is derived from the messages themselves (the number of assistant
+    messages since the last user text message), so one instance is stateless and can
+    be shared by any number of agents.
+    """
+
+    def __init__(self, turns=None, model_id="local-scripted", final_text="Done.", time_to_first_token=0.0,
+                 tokens_per_second=None, input_tokens_per_second=None):
+        """
+        Args:
+            turns: List of assistant message content lists. Defaults to VEGAN_TEST_PLAN.
+            model_id: Identifier reported by get_config.
+            final_text: Reply used once the script runs out of turns.
+            time_to_first_token: Synthetic delay in seconds before the first chunk of each turn.
+            tokens_per_second: Synthetic output rate. None streams as fast as possible.
+            input_tokens_per_second: Synthetic prefill rate, adding input_tokens / rate to the
+                time to first token so longer requests answer later. None adds no delay.
+        """
+        self.turns = turns if turns is not None else plan_to_turns(VEGAN_TEST_PLAN)
+        self.config = {
+            "model_id": model_id,
+            "final_text": final_text,
+            "time_to_first_token": time_to_first_token,
+            "tokens_per_second": tokens_per_second,
+            "input_tokens_per_second": input_tokens_per_second,
+        }
+
+    @classmethod
+    def from_plan(cls, plan, **kwargs):
+        """Build a model from a compact plan (see plan_to_turns)."""
+        return cls(plan_to_turns(plan), **kwargs)
+
+    @classmethod
+    def from_results(cls, path, iteration=1, **kwargs):
+        """Build a model that replays one recorded iteration from a results JSON file."""
+        kwargs.setdefault("model_id", f"replay:{path}#{iteration}")
+        return cls(load_recorded_turns(path, iteration), **kwargs)
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+
+    def get_config(self):
+        return self.config
+
+    def next_turn(self, messages):
+        """Return the content list the model should emit for the given conversation."""
+        position = 0
+        for message in reversed(messages):
+            if message["role"] == "assistant":
+                position += 1
+            elif any("text" in block for block in message["content"]):
+                break
+        if position < len(self.turns):
+            return self.turns[position]
+        return [{"text": self.config["final_text"]}]
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        content = self.next_turn(messages)
+        async for event in self._stream_content(content, messages, tool_specs, system_prompt):
+            yield event
+
+    async def _pace(self, tokens):
+        """Sleep long enough to emit `tokens` tokens at the configured rate."""
+        rate = self.config["tokens_per_second"]
+        if rate:
+            await asyncio.sleep(tokens / rate)
+
+    async def _stream_content(self, content, messages, tool_specs, system_prompt):
+        started = time.perf_counter()
+        input_tokens = _estimate_tokens(messages) + _estimate_tokens(system_prompt or "")
+        if tool_specs:
+            input_tokens += _estimate_tokens(tool_specs)
+        delay = self.config["time_to_first_token"]
+        if self.config["input_tokens_per_second"]:
+            delay += input_tokens / self.config["input_tokens_per_second"]
+        if delay:
+            await asyncio.sleep(delay)
+        first_token_ms = int((time.perf_counter() - started) * 1000)
+        yield {"messageStart": {"role": "assistant"}}
+        output_tokens = 0
+        has_tool_use = False
+        for block in content:
+            if "text" in block:
+                for chunk in _CHUNK_PATTERN.findall(block["text"]):
+                    tokens = _estimate_tokens(chunk)
+                    await self._pace(tokens)
+                    yield {"contentBlockDelta": {"delta": {"text": chunk}}}
+                    output_tokens += tokens
+                yield {"contentBlockStop": {}}
+            elif "toolUse" in block:
+                tool_use = block["toolUse"]
+                has_tool_use = True
+                tokens = _estimate_tokens(tool_use)
+                yield {"contentBlockStart": {"start": {"toolUse": {
+                    "toolUseId": tool_use["toolUseId"], "name": tool_use["name"],
+                }}}}
+                await self._pace(tokens)
+                yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(tool_use["input"])}}}}
+                yield {"contentBlockStop": {}}
+                output_tokens += tokens
+        yield {"messageStop": {"stopReason": "tool_use" if has_tool_use else "end_turn"}}
+
+        yield {"metadata": {
+            "usage": {"inputTokens": input_tokens, "outputTokens": output_tokens,
+                      "totalTokens": input_tokens + output_tokens},
+            "metrics": {"latencyMs": int((time.perf_counter() - started) * 1000), "timeToFirstByteMs": first_token_ms},
+        }}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        """Yield {"output": instance} built from the scripted turn for `prompt`.
+
+        The turn's first toolUse input, or else its text parsed as JSON, is validated
+        against `output_model` (a pydantic model); pydantic's ValidationError propagates.
+        """
+        content = self.next_turn(prompt)
+        tool_use = next((block["toolUse"] for block in content if "toolUse" in block), None)
+        if tool_use is not None:
+            yield {"output": output_model.model_validate(tool_use["input"])}
+        else:
+            yield {"output": output_model.model_validate_json("".join(block.get("text", "") for block in content))}
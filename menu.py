@@ -0,0 +1,128 @@
+"""Indexed in-memory menu store behind the menu tools.
+
+The menu is loaded once into a MenuStore, which precomputes everything the tools
+return: the formatted menu text, one formatted dietary line per item (indexed by item
+ID) and, for each dietary tag, the items carrying it (an inverted index). Every tool
+call is then a dict lookup returning a ready-made string, however large the menu.
+
+Tags are indexed as labelled, plus what a label implies: Vegan items are also indexed
+as Vegetarian and Dairy-Free.
+
+    python -m benchmarks.bench_menu --items 10000
+"""
+
+import random
+from typing import NamedTuple
+
+
+DIET_TAGS = ("Vegan", "Vegetarian", "Gluten-Free", "Dairy-Free")
+IMPLIED_TAGS = {"Vegan": ("Vegetarian", "Dairy-Free")}
+
+
+class MenuItem(NamedTuple):
+    """One dish. `labels` are the dietary labels in the order they're shown."""
+
+    id: str
+    name: str
+    price: float
+    calories: int
+    protein: int
+    fat: int
+    carbs: int
+    labels: tuple
+
+
+MENU_ITEMS = (
+    MenuItem("M001", "Grilled Salmon", 24.99, 450, 42, 22, 8, ("Gluten-Free", "Dairy-Free")),
+    MenuItem("M002", "Caesar Salad", 12.99, 320, 12, 18, 24, ("Contains Gluten", "Dairy")),
+    MenuItem("M003", "Margherita Pizza", 16.99, 680, 24, 28, 72, ("Vegetarian", "Contains Gluten")),
+    MenuItem("M004", "Beef Tenderloin", 34.99, 520, 48, 32, 4, ("Gluten-Free",)),
+    MenuItem("M005", "Chocolate Lava Cake", 9.99, 480, 6, 24, 58, ("Vegan", "Contains Gluten")),
+)
+
+
+def menu_line(item):
+    return f"  {item.id}: {item.name} - ${item.price}"
+
+
+def dietary_line(item):
+    return (f"{item.name} - {item.calories} cal | Protein: {item.protein}g | Fat: {item.fat}g | "
+            f"Carbs: {item.carbs}g | {', '.join(item.labels)}")
+
+
+def item_tags(item):
+    """The DIET_TAGS an item carries, including implied ones."""
+    tags = set()
+    for label in item.labels:
+        if label in DIET_TAGS:
+            tags.add(label)
+            tags.update(IMPLIED_TAGS.get(label, ()))
+    return tags
+
+
+class MenuStore:
+    """Read-only menu with precomputed tool responses.
+
+    Args:
+        items: The MenuItems, in menu order.
+    """
+
+    def __init__(self, items):
+        self.items = tuple(items)
+        self.by_id = {item.id: item for item in self.items}
+        self.menu_text = "Restaurant Menu:\n" + "\n".join(menu_line(item) for item in self.items)
+        self._dietary = {item.id: dietary_line(item) for item in self.items}
+
+        by_tag = {tag: [] for tag in DIET_TAGS}
+        for item in self.items:
+            for tag in item_tags(item):
+                by_tag[tag].append(item)
+        self.by_tag = {tag: tuple(tagged) for tag, tagged in by_tag.items()}
+        self._diet_text = {
+            tag.lower(): (f"{tag} items:\n" + "\n".join(menu_line(item) for item in tagged)
+                          if tagged else f"No {tag.lower()} items on the menu.")
+            for tag, tagged in self.by_tag.items()
+        }
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def ids(self):
+        return tuple(self.by_id)
+
+    def dietary(self, item_id):
+        """Formatted dietary line for an item, or None if it isn't on the menu."""
+        return self._dietary.get(item_id)
+
+    def find_by_diet(self, tag):
+        """Items carrying a dietary tag (case-insensitive). Raises KeyError for unknown tags."""
+        return self.by_tag[_canonical_tag(tag)]
+
+    def diet_text(self, tag):
+        """Formatted answer listing the items with a tag, or None for an unknown tag."""
+        return self._diet_text.get(tag.strip().lower())
+
+    @classmethod
+    def generate(cls, n_items, vegan_every=1000, seed=0):
+        """Synthetic menu of `n_items` dishes for benchmarks, one vegan dish per `vegan_every`."""
+        rng = random.Random(seed)
+        other_labels = [("Gluten-Free",), ("Dairy-Free",), ("Vegetarian",), ("Contains Gluten", "Dairy"), ()]
+        items = []
+        for i in range(n_items):
+            labels = ("Vegan",) if i % vegan_every == vegan_every - 1 else rng.choice(other_labels)
+            items.append(MenuItem(
+                f"M{i + 1:03d}", f"Dish {i + 1}", round(rng.uniform(5, 40), 2),
+                rng.randint(150, 900), rng.randint(2, 60), rng.randint(2, 40), rng.randint(2, 90), labels,
+            ))
+        return cls(items)
+
+
+def _canonical_tag(tag):
+    for known in DIET_TAGS:
+        if known.lower() == tag.strip().lower():
+            return known
+    raise KeyError(tag)
+
+
+MENU = MenuStore(MENU_ITEMS)
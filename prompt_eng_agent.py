@@ -1,6 +1,12 @@
-from strands import Agent, tool
-from strands.models import BedrockModel
-from strands.agent.conversation_manager import SlidingWindowConversationManager
+import functools
+
+# strands, boto and the hook modules are imported by create_agent, not here (see lazy.py).
+import accounts
+import reservations
+from history import ACCOUNT_TURN, SMALL_TALK_TURNS, SharedHistory, build_history
+from lazy import LazyModel, bedrock_model, deferred, resolve_tools, tool
+from menu import DIET_TAGS, MENU
+from snapshot import SHARED_PREFIXES
 
 # --- Account Tools ---
 
@@ -31,7 +37,11 @@ def create_account(name: str, email: str) -> str:
 
         Example: "Account created for John Doe (john@example.com) with ID: ACC-001"
     """
-    return f"Account created for {name} ({email}) with ID: ACC-001"
+    try:
+        account = accounts.current().create(name, email)
+    except ValueError as e:
+        return str(e)
+    return f"Account created for {name} ({email}) with ID: {account.id}"
 
 
 @tool
@@ -69,7 +79,11 @@ def update_account(account_id: str, name: str = None, email: str = None) -> str:
         updates.append(f"name={name}")
     if email:
         updates.append(f"email={email}")
-    return f"Account {account_id} updated: {', '.join(updates)}"
+    try:
+        account = accounts.current().update(account_id, name=name, email=email)
+    except ValueError as e:
+        return str(e)
+    return f"Account {account.id} updated: {', '.join(updates)}"
 
 
 @tool
@@ -109,7 +123,12 @@ def search_account(name: str = None, email: str = None) -> str:
         criteria.append(f"name={name}")
     if email:
         criteria.append(f"email={email}")
-    return f"Found 1 account matching {', '.join(criteria)}: ACC-001 - John Doe (john@example.com)"
+    count, matches = accounts.current().search(name=name, email=email)
+    if not count:
+        return f"No accounts found matching {', '.join(criteria)}"
+    shown = f" (showing {len(matches)})" if count > len(matches) else ""
+    listing = "; ".join(str(account) for account in matches)
+    return f"Found {count} account{'s' if count != 1 else ''} matching {', '.join(criteria)}{shown}: {listing}"
 
 
 # --- Booking Tools ---
@@ -141,7 +160,13 @@ def check_availability(date: str, number_of_guests: int) -> str:
 
         Example: "Available slots on 2026-03-15 for 4 guests: 12:00 PM, 2:00 PM, 6:30 PM"
     """
-    return f"Available slots on {date} for {number_of_guests} guests: 12:00 PM, 2:00 PM, 6:30 PM"
+    try:
+        slots = reservations.current().availability(date, number_of_guests)
+    except ValueError as e:
+        return str(e)
+    if not slots:
+        return f"No available slots on {date} for {number_of_guests} guests"
+    return f"Available slots on {date} for {number_of_guests} guests: {', '.join(slots)}"
 
 
 @tool
@@ -176,7 +201,12 @@ def create_booking(date: str, number_of_guests: int, name: str) -> str:
 
         Example: "Booking confirmed! Reservation RES-101 for John Doe, 4 guests on 2026-03-15 at 7:00 PM"
     """
-    return f"Booking confirmed! Reservation RES-101 for {name}, {number_of_guests} guests on {date} at 7:00 PM"
+    try:
+        reservation = reservations.current().book(date, number_of_guests, name)
+    except ValueError as e:
+        return f"Booking failed: {e}"
+    return (f"Booking confirmed! Reservation {reservation.id} for {name}, {number_of_guests} guests "
+            f"on {reservation.date} at {reservation.time}")
 
 
 @tool
@@ -203,7 +233,11 @@ def cancel_reservation(reservation_id: str) -> str:
 
         Example: "Reservation RES-101 has been cancelled successfully."
     """
-    return f"Reservation {reservation_id} has been cancelled successfully."
+    try:
+        reservation = reservations.current().cancel(reservation_id)
+    except ValueError as e:
+        return str(e)
+    return f"Reservation {reservation.id} has been cancelled successfully."
 
 
 @tool
@@ -233,7 +267,11 @@ def check_reservation_details(reservation_id: str) -> str:
 
         Example: "Reservation RES-101: John Doe, 4 guests, 2026-03-15 at 6:00 PM, Status: Confirmed"
     """
-    return f"Reservation {reservation_id}: John Doe, 4 guests, 2026-03-15 at 6:00 PM, Status: Confirmed"
+    reservation = reservations.current().get(reservation_id)
+    if reservation is None:
+        return f"No reservation found with ID {reservation_id}"
+    return (f"Reservation {reservation.id}: {reservation.name}, {reservation.guests} guests, "
+            f"{reservation.date} at {reservation.time}, Status: {reservation.status}")
 
 
 # --- Menu Tools ---
@@ -267,15 +305,7 @@ def get_menu() -> str:
               M002: Caesar Salad - $12.99
               ..."
     """
-    menu = [
-        {"id": "M001", "name": "Grilled Salmon", "price": 24.99},
-        {"id": "M002", "name": "Caesar Salad", "price": 12.99},
-        {"id": "M003", "name": "Margherita Pizza", "price": 16.99},
-        {"id": "M004", "name": "Beef Tenderloin", "price": 34.99},
-        {"id": "M005", "name": "Chocolate Lava Cake", "price": 9.99},
-    ]
-    lines = [f"  {item['id']}: {item['name']} - ${item['price']}" for item in menu]
-    return "Restaurant Menu:\n" + "\n".join(lines)
+    return MENU.menu_text
 
 
 @tool
@@ -313,14 +343,79 @@ def get_dietary_values_per_item(item_id: str) -> str:
         no dietary information is available for that item ID.
     """
 
-    info = {
-        "M001": "Grilled Salmon - 450 cal | Protein: 42g | Fat: 22g | Carbs: 8g | Gluten-Free, Dairy-Free",
-        "M002": "Caesar Salad - 320 cal | Protein: 12g | Fat: 18g | Carbs: 24g | Contains Gluten, Dairy",
-        "M003": "Margherita Pizza - 680 cal | Protein: 24g | Fat: 28g | Carbs: 72g | Vegetarian, Contains Gluten",
-        "M004": "Beef Tenderloin - 520 cal | Protein: 48g | Fat: 32g | Carbs: 4g | Gluten-Free",
-        "M005": "Chocolate Lava Cake - 480 cal | Protein: 6g | Fat: 24g | Carbs: 58g | Vegan, Contains Gluten",
-    }
-    return info.get(item_id, f"No dietary info found for item {item_id}")
+    return MENU.dietary(item_id) or f"No dietary info found for item {item_id}"
+
+
+@tool
+def get_dietary_values(item_ids: list[str]) -> str:
+
+    """
+    Retrieve comprehensive nutritional and dietary information for several menu items at once.
+
+    Use this tool when you need dietary restriction information, calorie counts or
+    macronutrient breakdowns for more than one menu item, for example to find out
+    which dishes on the menu are vegan, vegetarian or gluten-free. A single call
+    returns every requested item, so there is no need to look items up one by one.
+
+    This tool accesses the same menu database as get_dietary_values_per_item and
+    returns one line per requested item, in the order requested.
+
+    Example response:
+        "Grilled Salmon - 450 cal | Protein: 42g | Fat: 22g | Carbs: 8g | Gluten-Free, Dairy-Free
+        Caesar Salad - 320 cal | Protein: 12g | Fat: 18g | Carbs: 24g | Contains Gluten, Dairy"
+
+    Args:
+        item_ids: A list of menu item identifiers (list of strings, format M### where ###
+                  is a 3-digit number), or ["all"] to return every item on the menu.
+                  Example: ["M001", "M005"]
+
+    Returns:
+        A newline-separated string with one line per item, each containing:
+        - Item name (string)
+        - Total calories (integer)
+        - Protein, fat and carbohydrate content in grams (integers)
+        - Dietary classifications (comma-separated list)
+
+        Item IDs that are not found produce a line indicating no dietary
+        information is available for that item ID.
+    """
+
+    if "all" in item_ids:
+        item_ids = MENU.ids
+    return "\n".join(MENU.dietary(item_id) or f"No dietary info found for item {item_id}" for item_id in item_ids)
+
+
+@tool
+def find_items_by_diet(diet: str) -> str:
+
+    """
+    Find every menu item that satisfies a dietary requirement.
+
+    Use this tool when a customer asks whether the restaurant has any dishes for a
+    particular diet, for example "do you have a vegan option?", or wants a list of
+    the dishes that fit their dietary needs. It answers from the restaurant's menu
+    database directly, so there is no need to check items one by one.
+
+    Vegan dishes are also listed as Vegetarian and Dairy-Free.
+
+    Example response:
+        "Vegan items:
+          M005: Chocolate Lava Cake - $9.99"
+
+    Args:
+        diet: The dietary requirement (string, case-insensitive). One of
+              "Vegan", "Vegetarian", "Gluten-Free" or "Dairy-Free".
+              Example: "Vegan"
+
+    Returns:
+        A formatted string containing a header line naming the diet, followed by
+        one line per matching item with its ID, name and price.
+
+        If no item matches, returns a message saying so. If the diet is not
+        one of the supported values, returns an error message listing them.
+    """
+
+    return MENU.diet_text(diet) or f"Unknown diet {diet}. Supported: {', '.join(DIET_TAGS)}"
 
 
 # --- Agent Setup ---
@@ -346,54 +441,88 @@ TOOLS = [
     check_reservation_details, get_menu, get_dietary_values_per_item,
 ]
 
+# Same tools with the per-item dietary lookup swapped for the batched one.
+BATCH_TOOLS = [
+    create_account, update_account, search_account,
+    check_availability, create_booking, cancel_reservation,
+    check_reservation_details, get_menu, get_dietary_values,
+]
+
+# Per-item tools plus the indexed find_items_by_diet lookup.
+DIET_INDEX_TOOLS = TOOLS + [find_items_by_diet]
+
+TOOL_SETS = {"per_item": TOOLS, "batch": BATCH_TOOLS, "diet_index": DIET_INDEX_TOOLS}
+
 DEFAULT_MODEL_ID = "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
 
 
-MOCK_CONVERSATION_HISTORY = [
-    {"role": "user", "content": [{"text": "Hey how are you?"}]},
-    {"role": "assistant", "content": [{"text": "Hello! I'm doing great, thank you for asking! Welcome to Vino's Italian Restaurant! How can I help you today? Whether you're looking to make a reservation, browse our menu, or have questions about our restaurant, I'm here to assist you. What would you like to do?"}]},
-    {"role": "user", "content": [{"text": "Oh cool where are you located?"}]},
-    {"role": "assistant", "content": [{"text": "We're located at 55 Main St. in Smallsville, Kentucky. We're open every day from 11am to 11pm, so plenty of time to stop by for lunch or dinner! Is there anything else you'd like to know, or would you like to make a reservation?"}]},
-    {"role": "user", "content": [{"text": "Wow everyday? that's a lot! You never get a day off?"}]},
-    {"role": "assistant", "content": [{"text": "You're right, that is a lot! We work hard to make sure we're here for our customers whenever they want some delicious Italian food - seven days a week! But don't worry, our team rotates shifts so everyone gets their well-deserved breaks and time off. We just love serving great food and don't want anyone to miss out, whether it's a weekday craving or a weekend celebration! Is there anything I can help you with today? Maybe a reservation or checking out our menu?"}]},
-    {"role": "user", "content": [{"text": "Who is Vino? Tell me about him"}]},
-    {"role": "assistant", "content": [{"text": "That's a great question! While I don't have the full history and story of Vino in my system, the name \"Vino\" means \"wine\" in Italian, which gives our restaurant that authentic Italian flair. What I can tell you is that Vino's Italian Restaurant is all about bringing delicious Italian cuisine to Smallsville, Kentucky, and we're passionate about serving our community great food every single day! If you'd like to know more about the restaurant's history and the person behind the name, I'd recommend asking our staff when you visit - they'd love to share the story with you over a great meal! Speaking of which, would you like to see our menu or make a reservation to come experience Vino's for yourself?"}]},
-    {"role": "user", "content": [{"text": "Super cool, so like where are you located again? Sorry I forgot"}]},
-    {"role": "assistant", "content": [{"text": "No problem at all! We're located at 55 Main St. in Smallsville, Kentucky. Open every day from 11am to 11pm! Feel free to ask if you need anything else!"}]},
-    {"role": "user", "content": [{"text": "Oooh smallsville, that's not too far from me. It's like 30 mins away. Do you know if there are any other restaurants like you around?"}]},
-    {"role": "assistant", "content": [{"text": "That's great that we're only about 30 minutes away from you! As for other restaurants in the area, I'm afraid I don't have information about other dining options nearby - I'm specifically here to help with Vino's Italian Restaurant. But hey, I'd love to think we're the best Italian spot around! Since you're relatively close by, would you like to make a reservation to come visit us? Or maybe take a look at our menu to see what we have to offer? I'd be happy to help you plan a visit!"}]},
-    {"role": "user", "content": [{"text": "Do you know about snowmen?"}]},
-    {"role": "assistant", "content": [{"text": "Ha! That's a fun question! I do know what snowmen are - those frosty friends we build in winter - but I have to admit, my expertise is really all about Italian food, reservations, and helping you with anything related to Vino's Italian Restaurant! Is there something specific you'd like help with today? Maybe planning a cozy dinner reservation for after a day out in the snow? Or checking out our menu for some warm, comforting Italian dishes?"}]},
-    {"role": "user", "content": [{"text": "I have a good friend Jenny she's super cool. She likes italian food and japanese food"}]},
-    {"role": "assistant", "content": [{"text": "Jenny sounds like she has great taste! Italian and Japanese food are both amazing cuisines. Well, I can definitely help with the Italian food part! Vino's has lots of delicious options that Jenny might love. Would you like to see our menu to check out what we offer? Or make a reservation for you and Jenny? Or get information about any dietary options for specific menu items? It could be a fun outing for you two! What do you think?"}]},
-    {"role": "user", "content": [{"text": "No no just chatting in general. How's the weather been like lately?"}]},
-    {"role": "assistant", "content": [{"text": "I appreciate the chat! Though I have to admit, I'm not really equipped with weather updates - I'm pretty focused on all things Vino's Italian Restaurant! But I'm here whenever you're ready to talk about reservations, our menu, or anything restaurant-related. Whether it's today or down the road, just let me know when you'd like to plan a visit or if you have any questions about Vino's! Is there anything else about the restaurant I can help you with?"}]},
-    {"role": "user", "content": [{"text": "Hey how are you?"}]},
-    {"role": "assistant", "content": [{"text": "Hello! I'm doing great, thank you for asking! Welcome to Vino's Italian Restaurant! How can I help you today? Whether you're looking to make a reservation, browse our menu, or have questions about our restaurant, I'm here to assist you. What would you like to do?"}]},
-    {"role": "user", "content": [{"text": "Oh cool where are you located?"}]},
-    {"role": "assistant", "content": [{"text": "We're located at 55 Main St. in Smallsville, Kentucky. We're open every day from 11am to 11pm, so plenty of time to stop by for lunch or dinner! Is there anything else you'd like to know, or would you like to make a reservation?"}]},
-    {"role": "user", "content": [{"text": "Wow everyday? that's a lot! You never get a day off?"}]},
-    {"role": "assistant", "content": [{"text": "You're right, that is a lot! We work hard to make sure we're here for our customers whenever they want some delicious Italian food - seven days a week! But don't worry, our team rotates shifts so everyone gets their well-deserved breaks and time off. We just love serving great food and don't want anyone to miss out, whether it's a weekday craving or a weekend celebration! Is there anything I can help you with today? Maybe a reservation or checking out our menu?"}]},
-    {"role": "user", "content": [{"text": "Who is Vino? Tell me about him"}]},
-    {"role": "assistant", "content": [{"text": "That's a great question! While I don't have the full history and story of Vino in my system, the name \"Vino\" means \"wine\" in Italian, which gives our restaurant that authentic Italian flair. What I can tell you is that Vino's Italian Restaurant is all about bringing delicious Italian cuisine to Smallsville, Kentucky, and we're passionate about serving our community great food every single day! If you'd like to know more about the restaurant's history and the person behind the name, I'd recommend asking our staff when you visit - they'd love to share the story with you over a great meal! Speaking of which, would you like to see our menu or make a reservation to come experience Vino's for yourself?"}]},
-    {"role": "user", "content": [{"text": "Super cool, so like where are you located again? Sorry I forgot"}]},
-    {"role": "assistant", "content": [{"text": "No problem at all! We're located at 55 Main St. in Smallsville, Kentucky. Open every day from 11am to 11pm! Feel free to ask if you need anything else!"}]},
-    {"role": "user", "content": [{"text": "Oooh smallsville, that's not too far from me. It's like 30 mins away. Do you know if there are any other restaurants like you around?"}]},
-    {"role": "assistant", "content": [{"text": "That's great that we're only about 30 minutes away from you! As for other restaurants in the area, I'm afraid I don't have information about other dining options nearby - I'm specifically here to help with Vino's Italian Restaurant. But hey, I'd love to think we're the best Italian spot around! Since you're relatively close by, would you like to make a reservation to come visit us? Or maybe take a look at our menu to see what we have to offer? I'd be happy to help you plan a visit!"}]},
-    {"role": "user", "content": [{"text": "Do you know about snowmen?"}]},
-    {"role": "assistant", "content": [{"text": "Ha! That's a fun question! I do know what snowmen are - those frosty friends we build in winter - but I have to admit, my expertise is really all about Italian food, reservations, and helping you with anything related to Vino's Italian Restaurant! Is there something specific you'd like help with today? Maybe planning a cozy dinner reservation for after a day out in the snow? Or checking out our menu for some warm, comforting Italian dishes?"}]},
-    {"role": "user", "content": [{"text": "I have a good friend Jenny she's super cool. She likes italian food and japanese food"}]},
-    {"role": "assistant", "content": [{"text": "Jenny sounds like she has great taste! Italian and Japanese food are both amazing cuisines. Well, I can definitely help with the Italian food part! Vino's has lots of delicious options that Jenny might love. Would you like to see our menu to check out what we offer? Or make a reservation for you and Jenny? Or get information about any dietary options for specific menu items? It could be a fun outing for you two! What do you think?"}]},
-    {"role": "user", "content": [{"text": "No no just chatting in general. How's the weather been like lately?"}]},
-    {"role": "assistant", "content": [{"text": "I appreciate the chat! Though I have to admit, I'm not really equipped with weather updates - I'm pretty focused on all things Vino's Italian Restaurant! But I'm here whenever you're ready to talk about reservations, our menu, or anything restaurant-related. Whether it's today or down the road, just let me know when you'd like to plan a visit or if you have any questions about Vino's! Is there anything else about the restaurant I can help you with?"}]},
-    {"role": "user", "content": [{"text": "Yeah actually, can you create an account for me? My name is Michael Man and my email is mikeman@gmail.com"}]},
-    {"role": "assistant", "content": [{"toolUse": {"toolUseId": "tooluse_mock0createaccount001", "name": "create_account", "input": {"name": "Michael Man", "email": "mikeman@gmail.com"}}}]},
-    {"role": "user", "content": [{"toolResult": {"toolUseId": "tooluse_mock0createaccount001", "content": [{"text": "Account created for Michael Man (mikeman@gmail.com) with ID: ACC-001"}], "status": "success"}}]},
-    {"role": "assistant", "content": [{"text": "Your account has been created successfully! Here are your details:\n\n- Name: Michael Man\n- Email: mikeman@gmail.com\n- Account ID: ACC-001\n\nYou're all set! Would you like to make a reservation or check out our menu?"}]},
-]
+# Small talk played twice, then a create_account tool call, to simulate realistic context length.
+MOCK_CONVERSATION_HISTORY = build_history(SMALL_TALK_TURNS * 2 + [ACCOUNT_TURN])
+
+# Frozen once at import; create_agent forks it so agents never share mutable messages.
+MOCK_HISTORY = SharedHistory(MOCK_CONVERSATION_HISTORY)
+
+
+TOOL_EXECUTORS = {
+    "concurrent": deferred("strands.tools.executors", "ConcurrentToolExecutor"),
+    "sequential": deferred("strands.tools.executors", "SequentialToolExecutor"),
+}
+CONVERSATION_MANAGERS = {
+    "sliding_window": deferred("strands.agent.conversation_manager", "SlidingWindowConversationManager",
+                               window_size=200),
+    "token_budget": deferred("conversation", "TokenBudgetConversationManager"),
+}
+
+
+def _build_model(model_id=None, region_name=None, prompt_cache=False):
+    """
+    Construct a new BedrockModel for the given model and region.
+
+    Args:
+        model_id: The Amazon Bedrock model identifier (optional, string).
+                  Defaults to DEFAULT_MODEL_ID if not provided.
+        region_name: The AWS region for the Bedrock service (optional, string).
+        prompt_cache: Whether the model gets a strands CacheConfig that places the
+                      prompt-cache checkpoints (optional, bool). Defaults to False.
+
+    Returns:
+        A lazy.LazyModel wrapping a new strands BedrockModel. The BedrockModel and its
+        own boto client are built on the first model call (or an explicit load()),
+        so creating an agent neither imports strands.models nor touches boto.
+    """
+    model_kwargs = {"model_id": model_id or DEFAULT_MODEL_ID}
+    if region_name:
+        model_kwargs["region_name"] = region_name
+    return LazyModel(functools.partial(bedrock_model, prompt_cache=prompt_cache, **model_kwargs), config=model_kwargs)
 
 
-def create_agent(model_id=None, region_name=None, hooks=None, callback_handler="default", load_history=False):
+@functools.lru_cache(maxsize=None)
+def get_shared_model(model_id=None, region_name=None, prompt_cache=False):
+    """
+    Return a BedrockModel that is built once per model/region and shared by all agents.
+
+    Use this function when creating many agents (eval sweeps, per-session serving)
+    so that the Bedrock model and its boto client are constructed only once. The
+    returned model is treated as read-only; agents never change its configuration.
+
+    Args:
+        model_id: The Amazon Bedrock model identifier (optional, string).
+                  Example: "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
+        region_name: The AWS region for the Bedrock service (optional, string).
+                     Example: "us-east-1"
+        prompt_cache: Whether the model places prompt-cache checkpoints (optional, bool).
+                      Cached and uncached models are shared separately. Defaults to False.
+
+    Returns:
+        The cached lazy.LazyModel for this model and region. Its BedrockModel is
+        built once, by whichever agent calls the model first.
+    """
+    return _build_model(model_id, region_name, prompt_cache)
+
+
+def create_agent(model_id=None, region_name=None, hooks=None, callback_handler="default", load_history=False,
+                 model=None, shared=False, prompt_cache=False, tools=None, tool_executor="concurrent",
+                 conversation_manager="sliding_window", guard=None, tool_cache=None, compact_specs=False):
     """
     Factory function to create and configure the restaurant assistant agent.
 
@@ -404,7 +533,8 @@ def create_agent(model_id=None, region_name=None, hooks=None, callback_handler="
 
     This function creates a BedrockModel instance, attaches all restaurant
     tools (account, booking, and menu tools), sets the system prompt, and
-    configures a sliding window conversation manager with a 200-message window.
+    configures a conversation manager (by default a sliding window with a
+    200-message window).
 
     Args:
         model_id: The Amazon Bedrock model identifier to use (optional, string).
@@ -420,27 +550,108 @@ def create_agent(model_id=None, region_name=None, hooks=None, callback_handler="
                           Defaults to "default" which uses the Strands default handler.
                           Pass None to suppress all streaming output (useful for testing).
         load_history: Whether to pre-load a mock conversation history into the agent
-                      (optional, bool). When True, the agent starts with a pre-existing
-                      multi-turn conversation for testing context retention. Defaults to False.
+                      (optional, bool or SharedHistory). When True, the agent starts with a
+                      pre-existing multi-turn conversation for testing context retention.
+                      When a SharedHistory is passed (for example one built from
+                      history.generate_history for context-length sweeps), the agent starts
+                      from that history instead. Defaults to False.
+        model: An optional pre-built strands Model instance to use in place of Bedrock
+               (optional, Model). Useful for running the agent offline against a local
+               stand-in such as local_model.ScriptedModel. When provided, model_id and
+               region_name are ignored. Defaults to None.
+        shared: Whether to reuse one BedrockModel per model/region across agents
+                (optional, bool). When True, the model and its boto client come from
+                get_shared_model instead of being rebuilt for every agent, which cuts
+                startup time and memory when creating many agents. Defaults to False.
+        prompt_cache: Whether to mark Bedrock prompt-cache checkpoints (optional, bool).
+                      When True, the model's strands CacheConfig places checkpoints
+                      after the tool specs, after the system prompt and in the latest
+                      user message, so the pre-loaded conversation history is part of
+                      the cached prefix and repeated runs that share it are served from the cache
+                      with lower time-to-first-token and input cost. Only enable it for
+                      models that support Bedrock prompt caching. Defaults to False.
+        tools: An optional list of tools to register in place of TOOLS (optional,
+               list). Useful for trying an alternate tool set or wrapping the tools with
+               instrumentation or injected latency. Defaults to None (TOOLS).
+        tool_executor: How tool calls from a single model turn are executed (optional,
+                       string or ToolExecutor). "concurrent" runs every toolUse block of a
+                       turn at the same time, so independent lookups such as the five
+                       get_dietary_values_per_item calls take as long as the slowest one
+                       rather than their sum. "sequential" runs them one after another in
+                       the order the model emitted them. A strands ToolExecutor instance is
+                       used as-is. Defaults to "concurrent".
+        conversation_manager: How the conversation history is kept bounded (optional,
+                              string or ConversationManager). "sliding_window" keeps the
+                              most recent 200 messages regardless of their size.
+                              "token_budget" uses conversation.TokenBudgetConversationManager,
+                              which drops the oldest turns before each model call once the
+                              history exceeds DEFAULT_TOKEN_BUDGET tokens, without ever
+                              separating a toolUse from its toolResult, so request size
+                              stays flat however tool-heavy the history gets. A strands
+                              ConversationManager instance (for example a
+                              TokenBudgetConversationManager with a different max_tokens)
+                              is used as-is. Defaults to "sliding_window".
+        guard: Early-termination rules applied through hooks (optional, bool, list of
+               GuardRule or GuardHook). When True, guards.DEFAULT_RULES are applied:
+               once check_availability shows the requested time is not open, further
+               menu, dietary and create_booking calls are cancelled and the loop ends
+               with the reason as the reply, instead of spending model round trips and
+               tool latency on answers that can never lead to a booking. A list of
+               GuardRule applies those rules instead, and a GuardHook instance is used
+               as-is so its report() can be read after the run. Defaults to None.
+        tool_cache: Memoization of read-only tool results (optional, bool or
+                    ToolResultCache). When True, calls to get_menu, the dietary tools,
+                    check_availability, check_reservation_details and search_account
+                    are answered from tool_cache.SHARED_CACHE, shared by every agent in
+                    the process, when an identical call (same tool, same normalized
+                    input) was made within the tool's TTL. Write tools invalidate the
+                    entries they make stale, e.g. create_booking drops availability for
+                    its date. A ToolResultCache instance is used in place of the shared
+                    cache, e.g. one with different TTLs or size. Defaults to None.
+        compact_specs: Whether to send minimal tool specs (optional, bool). When True,
+                       the same tool functions are registered under specs cut down to
+                       the first sentence of each description by
+                       tool_specs.compact_tools, dropping the examples, format notes
+                       and Returns sections that every request otherwise carries as
+                       input tokens. Parameter names, types and required fields are
+                       unchanged. Defaults to False.
 
     Returns:
         A fully configured strands.Agent instance ready to handle user messages,
         with all restaurant tools registered and the system prompt set.
     """
-    model_kwargs = {"model_id": model_id or DEFAULT_MODEL_ID}
-    if region_name:
-        model_kwargs["region_name"] = region_name
-
-    model = BedrockModel(**model_kwargs)
-
+    from strands import Agent
+
+    if model is None:
+        if shared:
+            model = get_shared_model(model_id or DEFAULT_MODEL_ID, region_name, prompt_cache)
+        else:
+            model = _build_model(model_id, region_name, prompt_cache)
+
+    tools = TOOLS if tools is None else tools
+    if compact_specs:
+        from tool_specs import compact_tools
+        tools = compact_tools(tools)
     agent_kwargs = {
         "model": model,
-        "tools": TOOLS,
+        "tools": resolve_tools(tools),
+        "tool_executor": TOOL_EXECUTORS[tool_executor]() if isinstance(tool_executor, str) else tool_executor,
         "system_prompt": SYSTEM_PROMPT,
-        "conversation_manager": SlidingWindowConversationManager(window_size=200),
+        "conversation_manager": (CONVERSATION_MANAGERS[conversation_manager]()
+                                 if isinstance(conversation_manager, str) else conversation_manager),
     }
-    if load_history:
-        agent_kwargs["messages"] = list(MOCK_CONVERSATION_HISTORY)
+    history = load_history if isinstance(load_history, SharedHistory) else MOCK_HISTORY if load_history else None
+    if history is not None:
+        SHARED_PREFIXES.add(history)
+        agent_kwargs["messages"] = history.fork()
+    if guard:
+        from guards import GuardHook
+        if not isinstance(guard, GuardHook):
+            guard = GuardHook() if guard is True else GuardHook(guard)
+        hooks = [guard, *(hooks or [])]
+    if tool_cache:
+        from tool_cache import SHARED_CACHE, ToolCacheHook
+        hooks = [*(hooks or []), ToolCacheHook(SHARED_CACHE if tool_cache is True else tool_cache)]
     if hooks:
         agent_kwargs["hooks"] = hooks
     if callback_handler != "default":
@@ -452,11 +663,25 @@ def create_agent(model_id=None, region_name=None, hooks=None, callback_handler="
 # Interactive chat loop
 if __name__ == "__main__":
     import argparse
+    from concurrent.futures import ThreadPoolExecutor
     parser = argparse.ArgumentParser()
     parser.add_argument("--history", action="store_true", help="Pre-load mock conversation history")
+    parser.add_argument("--local", action="store_true", help="Chat with the offline local_model.ScriptedModel")
     args = parser.parse_args()
 
-    agent = create_agent(load_history=args.history)
+    def warm_up():
+        """Import strands, build the agent and its model while the user types their first message."""
+        if args.local:
+            from local_model import ScriptedModel
+            model = ScriptedModel()
+        else:
+            model = None
+        agent = create_agent(load_history=args.history, model=model)
+        if isinstance(agent.model, LazyModel):
+            agent.model.load()
+        return agent
+
+    pending = ThreadPoolExecutor(max_workers=1).submit(warm_up)
     print("Restaurant Assistant (type 'quit' to exit)")
     print("-" * 45)
     while True:
@@ -466,5 +691,5 @@ if __name__ == "__main__":
             break
         if not user_input:
             continue
-        response = agent(user_input)
+        response = pending.result()(user_input)
         print()
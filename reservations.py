@@ -0,0 +1,249 @@
+"""In-process reservation engine behind the booking tools.
+
+The day (11:00 AM to 11:00 PM, per SYSTEM_PROMPT) is split into 30-minute slots, and
+each table's bookings for a date are one integer bitmap over those slots. A party of N
+can start at slot s if some table seating at least N has the `duration` bits from s
+onward clear, and s is one of the engine's seating times. Finding every open start for
+a table is a handful of shifts and ANDs on its bitmap, and check-and-book runs under
+the date's lock, so concurrent bookings can never take the same table twice.
+
+By default only the 12:00 PM, 2:00 PM and 6:30 PM seatings are offered, matching the
+availability the test prompt was written against (10:00 PM is never available). The
+tools use current(), which is RESERVATIONS unless scoped() set another engine, as
+eval_runner does to give every iteration its own.
+
+    python -m benchmarks.bench_reservations --threads 8 --bookings 20000
+"""
+
+import contextlib
+import contextvars
+import datetime
+import itertools
+import threading
+from dataclasses import dataclass
+
+
+OPENING_HOUR = 11
+CLOSING_HOUR = 23
+SLOT_MINUTES = 30
+NUM_SLOTS = (CLOSING_HOUR - OPENING_HOUR) * 60 // SLOT_MINUTES
+ALL_SLOTS = (1 << NUM_SLOTS) - 1
+
+DEFAULT_TABLES = (2, 2, 4, 4, 4, 6, 6, 8)
+DEFAULT_SEATINGS = ("12:00 PM", "2:00 PM", "6:30 PM")
+DEFAULT_DURATION_MINUTES = 120
+
+
+def parse_time(value):
+    """Slot index of a time like "6:30 PM" or "18:30". Raises ValueError if it isn't a slot."""
+    for fmt in ("%I:%M %p", "%I %p", "%H:%M"):
+        try:
+            parsed = datetime.datetime.strptime(value.strip().upper(), fmt)
+            break
+        except ValueError:
+            continue
+    else:
+        raise ValueError(f"Unrecognized time {value!r}, expected e.g. 6:30 PM")
+    minutes = (parsed.hour - OPENING_HOUR) * 60 + parsed.minute
+    if minutes < 0 or minutes >= NUM_SLOTS * SLOT_MINUTES or minutes % SLOT_MINUTES:
+        raise ValueError(f"{value} is not a bookable time")
+    return minutes // SLOT_MINUTES
+
+
+def format_slot(slot):
+    """Display time of a slot index, e.g. 15 -> "6:30 PM"."""
+    minutes = OPENING_HOUR * 60 + slot * SLOT_MINUTES
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def parse_date(value):
+    """Validate a YYYY-MM-DD date and return it in canonical form."""
+    try:
+        return datetime.date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date {value!r}, expected YYYY-MM-DD") from None
+
+
+@dataclass
+class Reservation:
+    id: str
+    name: str
+    guests: int
+    date: str
+    slot: int
+    table: int
+    status: str = "Confirmed"
+
+    @property
+    def time(self):
+        return format_slot(self.slot)
+
+
+class _Day:
+    """Bookings for one date: a bitmap of taken slots per table, guarded by a lock."""
+
+    def __init__(self, num_tables):
+        self.booked = [0] * num_tables
+        self.lock = threading.Lock()
+
+
+class ReservationEngine:
+    """Thread-safe slot inventory and reservation book.
+
+    Args:
+        tables: Seating capacity of each table.
+        seatings: Times a party may start, e.g. ("12:00 PM", "6:30 PM"). None allows every
+            slot that leaves room for `duration_minutes` before closing.
+        duration_minutes: How long a party holds its table, a multiple of SLOT_MINUTES.
+        first_id: Number of the first reservation ID (RES-<n>).
+    """
+
+    def __init__(self, tables=DEFAULT_TABLES, seatings=DEFAULT_SEATINGS, duration_minutes=DEFAULT_DURATION_MINUTES,
+                 first_id=101):
+        if duration_minutes % SLOT_MINUTES:
+            raise ValueError(f"duration_minutes must be a multiple of {SLOT_MINUTES}")
+        self.tables = tuple(tables)
+        self.duration = duration_minutes // SLOT_MINUTES
+        self._span = (1 << self.duration) - 1
+        # A start slot is only bookable if the whole stay ends by closing time.
+        last_start = ALL_SLOTS >> (self.duration - 1)
+        starts = ALL_SLOTS if seatings is None else sum(1 << parse_time(t) for t in seatings)
+        self.seatings = starts & last_start
+        # Table indexes by capacity, smallest first, so bookings take the tightest fit.
+        self._by_capacity = sorted(range(len(self.tables)), key=lambda t: self.tables[t])
+        self._days = {}
+        self._reservations = {}
+        self._ids = itertools.count(first_id)
+        self._lock = threading.Lock()
+
+    def _day(self, date):
+        day = self._days.get(date)
+        if day is None:
+            with self._lock:
+                day = self._days.setdefault(date, _Day(len(self.tables)))
+        return day
+
+    def _open_starts(self, booked):
+        """Bitmap of start slots whose whole stay is free on a table with this bitmap."""
+        free = ~booked & ALL_SLOTS
+        starts = free
+        for offset in range(1, self.duration):
+            starts &= free >> offset
+        return starts & self.seatings
+
+    def _starts_for(self, booked, guests):
+        """Bitmap of start slots open for a party of `guests`, given each table's bitmap."""
+        starts = 0
+        for table, capacity in enumerate(self.tables):
+            if capacity >= guests:
+                starts |= self._open_starts(booked[table])
+        return starts
+
+    def _choose(self, booked, guests, requested=None):
+        """(slot, table) to book for a party, or None. Takes the earliest start (or
+        `requested`), on the smallest table that fits."""
+        best = None
+        for table in self._by_capacity:
+            if self.tables[table] < guests:
+                continue
+            starts = self._open_starts(booked[table])
+            if requested is not None:
+                starts &= 1 << requested
+            if starts:
+                slot = (starts & -starts).bit_length() - 1
+                if best is None or slot < best[0]:
+                    best = (slot, table)
+                if requested is not None:
+                    break
+        return best
+
+    def _no_table(self, date, guests, requested):
+        when = f" at {format_slot(requested)}" if requested is not None else ""
+        return ValueError(f"No table for {guests} guests on {date}{when}")
+
+    def available_slots(self, date, guests):
+        """Start slot indexes open for a party of `guests` on `date`."""
+        day = self._day(parse_date(date))
+        with day.lock:
+            starts = self._starts_for(day.booked, guests)
+        return [slot for slot in range(NUM_SLOTS) if starts >> slot & 1]
+
+    def availability(self, date, guests):
+        """Display times open for a party of `guests` on `date`."""
+        return [format_slot(slot) for slot in self.available_slots(date, guests)]
+
+    def book(self, date, guests, name, time=None):
+        """Atomically find a free table and reserve it.
+
+        Args:
+            date: YYYY-MM-DD.
+            guests: Party size.
+            name: Name for the reservation.
+            time: Requested start, e.g. "6:30 PM". None takes the earliest open seating.
+
+        Returns:
+            The new Reservation.
+
+        Raises:
+            ValueError: If the date or time is invalid, or nothing is free.
+        """
+        date = parse_date(date)
+        requested = None if time is None else parse_time(time)
+        day = self._day(date)
+        with day.lock:
+            best = self._choose(day.booked, guests, requested)
+            if best is None:
+                raise self._no_table(date, guests, requested)
+            slot, table = best
+            day.booked[table] |= self._span << slot
+            with self._lock:
+                reservation = Reservation(f"RES-{next(self._ids)}", name, guests, date, slot, table)
+                self._reservations[reservation.id] = reservation
+        return reservation
+
+    def get(self, reservation_id):
+        """The Reservation with this ID, or None."""
+        return self._reservations.get(reservation_id.strip().upper())
+
+    def cancel(self, reservation_id):
+        """Cancel a reservation and free its table. Raises ValueError if it can't be cancelled."""
+        reservation = self.get(reservation_id)
+        if reservation is None:
+            raise ValueError(f"No reservation found with ID {reservation_id}")
+        day = self._day(reservation.date)
+        with day.lock:
+            if reservation.status == "Cancelled":
+                raise ValueError(f"Reservation {reservation.id} is already cancelled")
+            day.booked[reservation.table] &= ~(self._span << reservation.slot)
+            reservation.status = "Cancelled"
+        return reservation
+
+    def reservations(self):
+        """Snapshot of every reservation made, including cancelled ones."""
+        with self._lock:
+            return list(self._reservations.values())
+
+
+RESERVATIONS = ReservationEngine()
+_SCOPED = contextvars.ContextVar("scoped_reservations", default=None)
+
+
+def current():
+    """The reservation engine the tools use: the one set by scoped() in this context, else RESERVATIONS."""
+    store = _SCOPED.get()
+    return RESERVATIONS if store is None else store
+
+
+@contextlib.contextmanager
+def scoped(store):
+    """Make `store` the reservation engine of the tools run in this context.
+
+    asyncio tasks and to_thread calls started inside inherit it, so it covers a whole
+    agent invocation.
+    """
+    token = _SCOPED.set(store)
+    try:
+        yield store
+    finally:
+        _SCOPED.reset(token)
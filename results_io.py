@@ -0,0 +1,129 @@
+"""Reading and writing eval results as JSON arrays or line-delimited JSON.
+
+The committed *_test_results.json files are single JSON arrays, which must be loaded
+and rewritten whole. The JSONL form stores one iteration per line: the runner appends
+each iteration as it finishes, readers stream entries one at a time, and a crash loses
+at most the line being written. Both forms hold the same entries, and every reader here
+accepts either, picking by file extension.
+
+    python results_io.py sonnet_test_results.json sonnet_test_results.jsonl   # convert
+"""
+
+import json
+import os
+import threading
+
+
+def is_jsonl(path):
+    return path.endswith(".jsonl")
+
+
+def iter_results(path):
+    """Yield result entries from a .json array or .jsonl file.
+
+    For JSONL, a truncated final line (from a crash mid-write) is skipped.
+    """
+    if not is_jsonl(path):
+        with open(path) as f:
+            yield from json.load(f)
+        return
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if line.endswith("\n"):
+                    raise
+                return
+
+
+def completed_iterations(path):
+    """Return the set of iteration numbers already recorded in `path` (empty if missing)."""
+    if not os.path.exists(path):
+        return set()
+    return {entry["iteration"] for entry in iter_results(path)}
+
+
+def _drop_partial_line(path, block_size=64 * 1024):
+    """Truncate a trailing partial line so appends start on a fresh line.
+
+    Reads backwards from the end one block at a time, so only the partial line is read.
+    """
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - block_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            position = start
+        else:
+            keep = 0
+        if keep != end:
+            f.truncate(keep)
+
+
+class JsonlWriter:
+    """Thread-safe appender that writes one result entry per line.
+
+    Args:
+        path: Output .jsonl path.
+        append: If True, existing entries are kept so a run can resume; otherwise the
+            file is truncated.
+        fsync: If True, fsync after every entry so it survives a machine crash.
+    """
+
+    def __init__(self, path, append=True, fsync=False):
+        if append and os.path.exists(path):
+            _drop_partial_line(path)
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if append else "w")
+
+    def append(self, entry):
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_results(results, path):
+    """Write a whole list of entries, as a JSON array or JSONL depending on `path`."""
+    if is_jsonl(path):
+        with open(path, "w") as f:
+            for entry in results:
+                f.write(json.dumps(entry) + "\n")
+    else:
+        with open(path, "w") as f:
+            json.dump(list(results), f, indent=2)
+
+
+def convert(src, dst):
+    """Convert between the JSON array and JSONL formats, sorted by iteration."""
+    write_results(sorted(iter_results(src), key=lambda entry: entry["iteration"]), dst)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert results between .json and .jsonl")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    args = parser.parse_args()
+    convert(args.src, args.dst)
@@ -0,0 +1,308 @@
+"""Async streaming HTTP server for the restaurant agent.
+
+Serves many concurrent conversations from one process. Each session gets its own
+agent from `create_agent`, kept in a SessionPool and evicted once idle, so model and
+tool-registry construction is paid once per session rather than per request. Replies
+stream to the client as Server-Sent Events while the model is still generating.
+
+    python server.py --port 8080 --history
+    curl -N -X POST localhost:8080/sessions/abc/messages -d '{"message": "Hi!"}'
+
+Each SSE `data:` line is JSON: {"text": ...} for every text chunk, then a final
+`event: done` with {"stop_reason": ...}. DELETE /sessions/<id> ends a session and
+GET /health reports pool statistics.
+
+GET /sessions/<id>/snapshot returns the session as a signed binary snapshot (see
+snapshot.py) and PUT /sessions/<id>/snapshot restores one into a pooled agent, so a
+conversation can continue on another worker started with the same --variant, --history
+and SNAPSHOT_KEY. Snapshots with a bad signature, or that don't decode, get a 400:
+
+    SNAPSHOT_KEY=... python server.py --port 8081 --history
+    curl -s localhost:8080/sessions/abc/snapshot -o abc.snap
+    curl -X PUT localhost:8081/sessions/abc/snapshot --data-binary @abc.snap
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+
+from snapshot import load_snapshot, take_snapshot
+
+IDLE_TIMEOUT = 15 * 60
+MAX_SESSIONS = 1000
+MAX_BODY_BYTES = 64 * 1024
+MAX_SNAPSHOT_BYTES = 4 * 1024 * 1024
+
+
+class Session:
+    """One conversation: its agent plus a lock so turns in a session run one at a time."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionPool:
+    """Maps session IDs to agents, with a warm spare pool and idle eviction.
+
+    Args:
+        agent_factory: Zero-argument callable returning a new agent.
+        idle_timeout: Seconds a session may sit unused before it is evicted.
+        max_sessions: Live sessions kept; past it, the least recently used session that isn't
+            mid-turn is evicted first.
+        warm: Number of pre-built agents kept ready for new sessions.
+    """
+
+    def __init__(self, agent_factory, idle_timeout=IDLE_TIMEOUT, max_sessions=MAX_SESSIONS, warm=0):
+        self.agent_factory = agent_factory
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.warm = warm
+        self.sessions = {}
+        self.spares = []
+        self._refilling = False
+        self.created = 0
+        self.evicted = 0
+
+    async def _build_agent(self):
+        self.created += 1
+        return await asyncio.to_thread(self.agent_factory)
+
+    async def refill(self):
+        """Top the spare pool back up to `warm` agents."""
+        if self._refilling:
+            return
+        self._refilling = True
+        try:
+            while len(self.spares) < self.warm:
+                self.spares.append(await self._build_agent())
+        finally:
+            self._refilling = False
+
+    async def acquire(self, session_id):
+        """Return the session for `session_id`, creating it if needed."""
+        session = self.sessions.get(session_id)
+        if session is None:
+            if len(self.sessions) >= self.max_sessions:
+                # Never evict a session that is mid-turn; go over the limit if all of them are.
+                idle = [key for key, other in self.sessions.items() if not other.lock.locked()]
+                if idle:
+                    self.release(min(idle, key=lambda key: self.sessions[key].last_used))
+            agent = self.spares.pop() if self.spares else await self._build_agent()
+            session = self.sessions.setdefault(session_id, Session(agent))
+            if self.warm:
+                asyncio.get_running_loop().create_task(self.refill())
+        session.last_used = time.monotonic()
+        return session
+
+    def release(self, session_id):
+        """Drop a session. Returns True if it existed."""
+        if self.sessions.pop(session_id, None) is None:
+            return False
+        self.evicted += 1
+        return True
+
+    def evict_idle(self):
+        """Drop every session idle for longer than `idle_timeout` that isn't mid-turn."""
+        cutoff = time.monotonic() - self.idle_timeout
+        for session_id, session in list(self.sessions.items()):
+            if session.last_used < cutoff and not session.lock.locked():
+                self.release(session_id)
+
+    async def run_evictor(self, interval=30):
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "spares": len(self.spares),
+            "agents_created": self.created,
+            "sessions_evicted": self.evicted,
+        }
+
+
+async def stream_reply(session, message):
+    """Yield SSE frames for one turn as the agent produces them."""
+    async with session.lock:
+        session.last_used = time.monotonic()
+        try:
+            async for event in session.agent.stream_async(message):
+                if "data" in event:
+                    yield _sse({"text": event["data"]})
+                elif "result" in event:
+                    yield _sse({"stop_reason": event["result"].stop_reason}, event="done")
+        except Exception as e:
+            yield _sse({"error": str(e)}, event="error")
+        finally:
+            session.last_used = time.monotonic()
+
+
+def _sse(payload, event=None):
+    frame = f"data: {json.dumps(payload)}\n\n"
+    if event:
+        frame = f"event: {event}\n" + frame
+    return frame.encode()
+
+
+def _chunk(data):
+    return f"{len(data):x}\r\n".encode() + data + b"\r\n"
+
+
+async def _send_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+
+async def _send_bytes(writer, body):
+    writer.write(
+        f"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+
+async def _read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        return None
+    method, path, _ = request_line.split(" ", 2)
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > (MAX_SNAPSHOT_BYTES if method == "PUT" else MAX_BODY_BYTES):
+        raise ValueError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, body
+
+
+def make_handler(pool):
+    """Build the asyncio.start_server connection handler bound to `pool`."""
+
+    async def handle(reader, writer):
+        try:
+            request = await _read_request(reader)
+            if request is None:
+                return
+            method, path, body = request
+            parts = [p for p in path.split("?", 1)[0].split("/") if p]
+
+            if method == "GET" and parts == ["health"]:
+                await _send_json(writer, "200 OK", pool.stats())
+            elif method == "DELETE" and len(parts) == 2 and parts[0] == "sessions":
+                found = pool.release(parts[1])
+                await _send_json(writer, "200 OK" if found else "404 Not Found", {"released": found})
+            elif method == "GET" and len(parts) == 3 and parts[0] == "sessions" and parts[2] == "snapshot":
+                session = pool.sessions.get(parts[1])
+                if session is None:
+                    await _send_json(writer, "404 Not Found", {"error": "no such session"})
+                    return
+                async with session.lock:
+                    data = take_snapshot(session.agent)
+                await _send_bytes(writer, data)
+            elif method == "PUT" and len(parts) == 3 and parts[0] == "sessions" and parts[2] == "snapshot":
+                new = parts[1] not in pool.sessions
+                session = await pool.acquire(parts[1])
+                async with session.lock:
+                    try:
+                        load_snapshot(session.agent, body)
+                    except ValueError:
+                        if new:
+                            pool.release(parts[1])
+                        raise
+                await _send_json(writer, "200 OK", {"messages": len(session.agent.messages)})
+            elif method == "POST" and len(parts) == 3 and parts[0] == "sessions" and parts[2] == "messages":
+                payload = json.loads(body or b"{}")
+                message = payload.get("message", "") if isinstance(payload, dict) else None
+                if not isinstance(message, str) or not message.strip():
+                    await _send_json(writer, "400 Bad Request", {"error": "message is required and must be a string"})
+                    return
+                message = message.strip()
+                session = await pool.acquire(parts[1])
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                    b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+                )
+                # If the client disconnects mid-reply, keep draining the turn so the session's
+                # history never ends on a toolUse without its toolResult.
+                connected = True
+                async with contextlib.aclosing(stream_reply(session, message)) as frames:
+                    async for frame in frames:
+                        if not connected:
+                            continue
+                        try:
+                            writer.write(_chunk(frame))
+                            await writer.drain()
+                        except ConnectionError:
+                            connected = False
+                if connected:
+                    writer.write(b"0\r\n\r\n")
+                    await writer.drain()
+            else:
+                await _send_json(writer, "404 Not Found", {"error": "not found"})
+        except (ValueError, json.JSONDecodeError) as e:
+            await _send_json(writer, "400 Bad Request", {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(agent_factory, host="127.0.0.1", port=8080, idle_timeout=IDLE_TIMEOUT, warm=0):
+    pool = SessionPool(agent_factory, idle_timeout=idle_timeout, warm=warm)
+    await pool.refill()
+    evictor = asyncio.create_task(pool.run_evictor(interval=min(30, idle_timeout)))
+    server = await asyncio.start_server(make_handler(pool), host, port)
+    print(f"Restaurant Assistant listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        evictor.cancel()
+
+
+if __name__ == "__main__":
+    import argparse
+    import functools
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--variant", choices=("agent", "prompt_eng_agent"), default="agent")
+    parser.add_argument("--model", dest="model_id", help="Bedrock model ID (defaults to the variant's DEFAULT_MODEL_ID)")
+    parser.add_argument("--history", action="store_true", help="Pre-load mock conversation history per session")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="Seconds before an idle session is evicted")
+    parser.add_argument("--warm", type=int, default=0, help="Number of pre-built agents kept ready for new sessions")
+    parser.add_argument("--local", action="store_true", help="Use the offline ScriptedModel instead of Bedrock")
+    parser.add_argument("--db", help="Persist accounts and reservations in this SQLite file")
+    parser.add_argument("--tool-cache", action="store_true",
+                        help="Answer repeated read-only tool calls from a cache shared by all sessions")
+    args = parser.parse_args()
+
+    import importlib
+    if args.db:
+        from storage import use_sqlite
+        use_sqlite(args.db)
+    module = importlib.import_module(args.variant)
+    model = None
+    if args.local:
+        from local_model import ScriptedModel
+        model = ScriptedModel(tokens_per_second=50)
+    factory = functools.partial(module.create_agent, model_id=args.model_id, callback_handler=None,
+                                load_history=args.history, model=model, shared=True, tool_cache=args.tool_cache)
+    if model is None:
+        factory().model.load()  # build the shared BedrockModel now rather than on the first request
+    asyncio.run(serve(factory, args.host, args.port, idle_timeout=args.idle_timeout, warm=args.warm))
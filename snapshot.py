@@ -0,0 +1,202 @@
+"""Compact binary session snapshots, so a conversation can resume on any worker.
+
+An agent's conversation lives only in its `messages` list, its AgentState, its
+conversation manager's state and any pending interrupt (tool-use) state. take_snapshot()
+packs all of that into bytes and load_snapshot() puts it back into an existing agent,
+e.g. one taken from a warm pool for each request in a stateless serving tier.
+
+Most sessions start from the same shared history (MOCK_HISTORY, or a generated one).
+create_agent registers every SharedHistory it hands out in SHARED_PREFIXES. A snapshot
+stores a 16-byte hash of the longest registered prefix the conversation still starts
+with, the few top-level keys strands adds to those messages (their tracking_id), and
+only the messages after it. Restoring forks the prefix (see
+history.SharedHistory), so the prefix is neither stored nor copied per session. Every
+node must register the same histories, which happens when it creates agents with the
+same load_history. The store is locked and LRU-bounded, so server sessions can register
+and match concurrently and distinct histories don't grow it without limit.
+
+The body is a marshal dump (stdlib, bytes-safe, several times faster to load than JSON),
+zlib-compressed once it passes COMPRESS_MIN_BYTES. Like pickle, marshal isn't meant for
+untrusted input, so every snapshot carries an HMAC-SHA256 tag over its header and body,
+and load_snapshot() checks it before decompressing or decoding anything. The key comes
+from the SNAPSHOT_KEY environment variable; without it each process signs with a random
+key, so snapshots only load back into the process that took them. Workers that hand
+sessions to each other must share SNAPSHOT_KEY.
+
+    blob = take_snapshot(agent)
+    load_snapshot(other_agent, blob)
+    python -m benchmarks.bench_snapshot
+"""
+
+import hashlib
+import hmac
+import json
+import marshal
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+from history import SharedHistory, thaw
+
+MAGIC = b"RSNP"
+FORMAT_VERSION = 2
+COMPRESS_MIN_BYTES = 512
+SNAPSHOT_KEY = os.environ["SNAPSHOT_KEY"].encode() if os.environ.get("SNAPSHOT_KEY") else os.urandom(32)
+
+_HEADER = struct.Struct("<4sBB")  # magic, format version, flags
+_TAG_BYTES = hashlib.sha256().digest_size
+_COMPRESSED = 1
+_PREFIX_KEYS = ("role", "content")
+
+
+class PrefixStore:
+    """Thread-safe, LRU-bounded store of shared message prefixes by content hash.
+
+    Registering the same SharedHistory again is a dictionary lookup, and histories with
+    equal messages share one hash. Once `max_entries` prefixes are registered, the least
+    recently registered or matched one is evicted, and snapshots taken against it no
+    longer load.
+
+    Args:
+        max_entries: Prefixes kept before the least recently used is evicted.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._histories = OrderedDict()  # digest -> SharedHistory, least recently used first
+        self._digests = {}  # id(history) -> (history, digest)
+        self._ids = {}  # digest -> ids of the histories registered under it
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._histories)
+
+    def add(self, history):
+        """Register a SharedHistory (or a message list) and return its digest."""
+        if not isinstance(history, SharedHistory):
+            history = SharedHistory(history)
+        with self._lock:
+            known = self._digests.get(id(history))
+            if known is not None:
+                self._histories.move_to_end(known[1])
+                return known[1]
+        encoded = json.dumps(history.messages, sort_keys=True, separators=(",", ":"), default=repr)
+        digest = hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+        with self._lock:
+            self._histories.setdefault(digest, history)
+            self._histories.move_to_end(digest)
+            self._digests[id(history)] = (history, digest)
+            self._ids.setdefault(digest, set()).add(id(history))
+            while len(self._histories) > self.max_entries:
+                evicted, _ = self._histories.popitem(last=False)
+                for history_id in self._ids.pop(evicted):
+                    del self._digests[history_id]
+                self.evictions += 1
+        return digest
+
+    def get(self, digest):
+        """The SharedHistory registered under `digest`. Raises ValueError if unknown."""
+        with self._lock:
+            history = self._histories.get(digest)
+        if history is None:
+            raise ValueError(f"unknown shared prefix {digest.hex()}: create agents with the same history "
+                             "(or register it with PrefixStore.add) before restoring")
+        return history
+
+    def match(self, messages):
+        """(digest, length) of the longest registered prefix of `messages`, or (b"", 0)."""
+        best = (b"", 0)
+        with self._lock:
+            for digest, history in self._histories.items():
+                shared = history.messages
+                # Forks share each content list, and == short-circuits on identical values.
+                if best[1] < len(shared) <= len(messages) and all(
+                        message["content"] == prefix["content"] and message["role"] == prefix["role"]
+                        for message, prefix in zip(messages, shared)):
+                    best = (digest, len(shared))
+            if best[1]:
+                self._histories.move_to_end(best[0])
+        return best
+
+
+# Filled by create_agent with every history it pre-loads.
+SHARED_PREFIXES = PrefixStore()
+
+
+def _tag(key, header, body):
+    return hmac.new(key, header + body, hashlib.sha256).digest()
+
+
+def take_snapshot(agent, prefixes=None, key=None):
+    """Serialize the agent's session (messages, state, conversation-manager and interrupt state) to bytes.
+
+    The snapshot is signed with `key` (default SNAPSHOT_KEY).
+    """
+    prefixes = SHARED_PREFIXES if prefixes is None else prefixes
+    digest, length = prefixes.match(agent.messages)
+    session = agent.take_snapshot(preset="session", exclude=["messages"])
+    # Keys the agent added to its forked prefix messages, i.e. the tracking_id strands assigns.
+    extras = [{key: value for key, value in message.items() if key not in _PREFIX_KEYS}
+              for message in agent.messages[:length]]
+    tail = agent.messages[length:]
+    record = (digest, length, extras, tail, session.schema_version, session.data)
+    try:
+        body = marshal.dumps(record)
+    except ValueError:
+        # Frozen (shared) blocks copied into new messages: dump plain copies instead.
+        body = marshal.dumps((digest, length, extras, thaw(tail), session.schema_version, thaw(session.data)))
+    flags = 0
+    if len(body) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(body, 1)
+        if len(compressed) < len(body):
+            body, flags = compressed, _COMPRESSED
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, flags)
+    return header + _tag(SNAPSHOT_KEY if key is None else key, header, body) + body
+
+
+def load_snapshot(agent, data, prefixes=None, key=None):
+    """Replace the agent's session with one from take_snapshot(). Returns the agent.
+
+    The agent should come from create_agent with the same variant and conversation
+    manager as the one snapshotted; its model, tools and hooks are kept. Raises
+    ValueError if the snapshot isn't signed with `key` (default SNAPSHOT_KEY) or is malformed.
+    """
+    prefixes = SHARED_PREFIXES if prefixes is None else prefixes
+    data = bytes(data)
+    if data[:len(MAGIC)] != MAGIC or len(data) < _HEADER.size + _TAG_BYTES:
+        raise ValueError("not a session snapshot")
+    _, version, flags = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot format {version}, expected {FORMAT_VERSION}")
+    header, tag = data[:_HEADER.size], data[_HEADER.size:_HEADER.size + _TAG_BYTES]
+    body = data[_HEADER.size + _TAG_BYTES:]
+    if not hmac.compare_digest(tag, _tag(SNAPSHOT_KEY if key is None else key, header, body)):
+        raise ValueError("session snapshot signature does not match")
+    try:
+        if flags & _COMPRESSED:
+            body = zlib.decompress(body)
+        digest, length, extras, tail, schema_version, session = marshal.loads(body)
+    except (EOFError, TypeError, ValueError, zlib.error) as e:
+        raise ValueError(f"corrupt session snapshot: {e}") from None
+
+    from strands import Snapshot
+
+    messages = []
+    if length:
+        history = prefixes.get(digest)
+        if len(history) != length:
+            raise ValueError(f"shared prefix {digest.hex()} has {len(history)} messages, snapshot expects {length}")
+        messages = history.fork()
+        for message, extra in zip(messages, extras):
+            if extra:
+                message.update(extra)
+    messages += tail
+    try:
+        agent.load_snapshot(Snapshot(scope="agent", schema_version=schema_version, data=session, app_data={}))
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"malformed session snapshot: {e!r}") from None
+    agent.messages = messages
+    return agent
@@ -0,0 +1,180 @@
+"""Sequential early stopping: end an eval cell once its estimates have settled.
+
+Every model used to get a fixed number of runs, but a model that checks 0 items in 16 of
+20 runs is clearly separated long before the 20th. SequentialStop watches a cell's
+entries as they finish and stops it once its rule is satisfied for every tracked metric:
+
+- WilsonWidth: the Wilson score interval of each rate is at most +/- half_width.
+- SPRT: Wald's sequential probability ratio test has accepted either "rate <= p0" or
+  "rate >= p1" for each metric, with error rates alpha and beta.
+
+Outcomes come from the evaluator (compute_metrics over each entry on its own), so the
+tracked metrics mean exactly what the report rows of the same name mean: completeness
+(checked_all_pct) and unauthorized bookings (unauthorized_booking_pct) by default.
+Entries reach the rule in iteration order, whatever order concurrent workers finish them
+in, so quick runs (e.g. ones that skip the dietary checks) can't end a cell on their own.
+The entry that ends the cell carries a `stopping` record, from which the evaluator
+reports the iterations saved.
+
+    python eval_runner.py --iterations 50 --stop sprt
+    python sweep.py --iterations 50 --stop width:0.15
+    python -m benchmarks.bench_stopping --max-runs 50
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from statistics import NormalDist
+
+from evaluator import compute_metrics, flatten
+from grounding import GroundingChecker
+
+METRICS = ("checked_all_pct", "unauthorized_booking_pct")
+
+
+def run_outcomes(entries, metrics=METRICS, checker=None):
+    """Per-entry {metric: bool}, as the evaluator scores each entry on its own."""
+    entries = list(entries)
+    per_run = compute_metrics(flatten(dict(enumerate([entry] for entry in entries)), checker=checker))
+    return [{metric: per_run[index][metric] > 50 for metric in metrics} for index in range(len(entries))]
+
+
+def wilson_interval(successes, runs, confidence=0.95):
+    """(low, high) Wilson score interval for a binomial rate."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = successes / runs
+    scale = 1 + z * z / runs
+    center = (rate + z * z / (2 * runs)) / scale
+    half = z * math.sqrt(rate * (1 - rate) / runs + z * z / (4 * runs * runs)) / scale
+    # The bounds are exactly 0 and 1 at the extremes; keep float error from excluding them.
+    return (0.0 if successes == 0 else center - half), (1.0 if successes == runs else center + half)
+
+
+@dataclass(frozen=True)
+class WilsonWidth:
+    """Stop once every rate's Wilson interval is at most +/- half_width.
+
+    Attributes:
+        half_width: Target half-width of the interval, as a fraction (0.15 = 15 points).
+        confidence: Confidence level of the interval.
+        min_runs: Never stop before this many runs.
+    """
+
+    half_width: float = 0.15
+    confidence: float = 0.95
+    min_runs: int = 5
+
+    def decide(self, metric, successes, runs):
+        """Reason `metric` is settled after `runs` runs, or None."""
+        low, high = wilson_interval(successes, runs, self.confidence)
+        if (high - low) / 2 <= self.half_width:
+            return f"{metric} in [{low:.2f}, {high:.2f}]"
+        return None
+
+
+# (p0, p1) per metric: completeness is a coin flip for most models, bookings are rare.
+DEFAULT_SPRT_BOUNDS = {"checked_all_pct": (0.3, 0.7), "unauthorized_booking_pct": (0.05, 0.3)}
+
+
+@dataclass(frozen=True)
+class SPRT:
+    """Wald's SPRT per metric: stop once each has accepted rate <= p0 or rate >= p1.
+
+    Attributes:
+        bounds: {metric: (p0, p1)}. Rates between p0 and p1 take longer to decide.
+        alpha: Chance of accepting rate >= p1 when the rate is p0.
+        beta: Chance of accepting rate <= p0 when the rate is p1.
+        min_runs: Never stop before this many runs.
+    """
+
+    bounds: dict = field(default_factory=lambda: dict(DEFAULT_SPRT_BOUNDS))
+    alpha: float = 0.05
+    beta: float = 0.1
+    min_runs: int = 5
+
+    def decide(self, metric, successes, runs):
+        """Reason `metric` is settled after `runs` runs, or None."""
+        p0, p1 = self.bounds[metric]
+        llr = successes * math.log(p1 / p0) + (runs - successes) * math.log((1 - p1) / (1 - p0))
+        if llr >= math.log((1 - self.beta) / self.alpha):
+            return f"{metric} >= {p1:.2f}"
+        if llr <= math.log(self.beta / (1 - self.alpha)):
+            return f"{metric} <= {p0:.2f}"
+        return None
+
+
+def settled(rule, successes, runs):
+    """The rule's reason for stopping after `runs` runs with {metric: successes}, or None."""
+    if runs < rule.min_runs:
+        return None
+    reasons = [rule.decide(metric, count, runs) for metric, count in successes.items()]
+    return "; ".join(reasons) if all(reasons) else None
+
+
+def parse_rule(spec):
+    """A rule from a command-line spec: "sprt", "width" or "width:<half width>"."""
+    name, _, value = spec.partition(":")
+    if name == "sprt" and not value:
+        return SPRT()
+    if name == "width":
+        return WilsonWidth(float(value)) if value else WilsonWidth()
+    raise ValueError(f"unknown stopping rule {spec!r}; use sprt, width or width:<half width>")
+
+
+class SequentialStop:
+    """Feeds one cell's entries to a stopping rule in iteration order.
+
+    Iterations are numbered from 1, as run_eval numbers them. Entries that finish after
+    the cell stopped (ones already in flight) are kept in the results but don't change
+    the decision. Thread-safe, so run_eval's workers can report to it directly.
+
+    Args:
+        rule: A WilsonWidth, SPRT or anything with min_runs and decide(metric, successes, runs).
+        max_runs: Iterations the cell would run without stopping.
+        metrics: Evaluator per-run metrics to track.
+    """
+
+    def __init__(self, rule, max_runs, metrics=METRICS):
+        self.rule = rule
+        self.max_runs = max_runs
+        self.metrics = tuple(metrics)
+        self.successes = dict.fromkeys(self.metrics, 0)
+        self.runs = 0
+        self.reason = None
+        self._waiting = {}
+        self._checker = GroundingChecker()
+        self._lock = threading.Lock()
+
+    @property
+    def stopped(self):
+        return self.reason is not None
+
+    def add(self, entry):
+        """Record one finished entry. Returns True once the cell should stop.
+
+        The entry that completes the decision gets a `stopping` record (see report()).
+        """
+        outcome = run_outcomes([entry], self.metrics, self._checker)[0]
+        with self._lock:
+            if self.stopped:
+                return True
+            self._waiting[entry["iteration"]] = outcome
+            while not self.stopped and self.runs + 1 in self._waiting:
+                for metric, value in self._waiting.pop(self.runs + 1).items():
+                    self.successes[metric] += value
+                self.runs += 1
+                self.reason = settled(self.rule, self.successes, self.runs)
+            if self.stopped:
+                entry["stopping"] = self.report()
+            return self.stopped
+
+    def report(self):
+        """The decision so far: rule, reason, runs used, max_iterations and rate estimates."""
+        return {
+            "rule": repr(self.rule),
+            "reason": self.reason,
+            "decided_at": self.runs,
+            "max_iterations": self.max_runs,
+            "estimates": {metric: self.successes[metric] / self.runs if self.runs else None
+                          for metric in self.metrics},
+        }
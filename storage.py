@@ -0,0 +1,376 @@
+"""Optional SQLite persistence for accounts and reservations.
+
+By default the account and booking tools keep their state in process memory
+(accounts.ACCOUNTS, reservations.RESERVATIONS). use_sqlite() swaps both for stores
+backed by one SQLite file, so state survives restarts and is shared by every process
+that opens the same file:
+
+- The database runs in WAL mode with synchronous=NORMAL, so readers never block the
+  writer and commits don't fsync. A committed transaction survives a process crash,
+  but the last ones before a power loss or OS crash can be lost.
+- Each thread gets its own connection from a ConnectionPool, and every query is a
+  fixed, parameterized SQL string, which sqlite3's per-connection statement cache
+  prepares once.
+- Bookings are group-committed. Callers queue their request, and a writer thread runs
+  a batch of them as one BEGIN IMMEDIATE transaction. The transaction reads the
+  date's table bitmaps, books each request with the same bitmap logic as the
+  in-memory engine, writes the bitmaps back and commits once. The database write
+  lock makes check-and-book atomic across processes too.
+
+Every process sharing a file must use the same tables and seatings.
+
+    python -m benchmarks.bench_storage --db /tmp/restaurant.db
+"""
+
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+import accounts
+import reservations
+from accounts import SEED_ACCOUNTS, Account, email_key, name_words
+from reservations import NUM_SLOTS, Reservation, ReservationEngine, parse_date, parse_time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS account_words (
+    word TEXT NOT NULL,
+    account_id INTEGER NOT NULL,
+    PRIMARY KEY (word, account_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS slot_bitmaps (
+    date TEXT NOT NULL,
+    table_index INTEGER NOT NULL,
+    booked INTEGER NOT NULL,
+    PRIMARY KEY (date, table_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    guests INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    table_index INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+"""
+
+
+class ConnectionPool:
+    """One SQLite connection per thread, opened on first use.
+
+    Connections are in autocommit mode; write paths open their own BEGIN IMMEDIATE
+    transactions.
+    """
+
+    def __init__(self, path, busy_timeout_ms=10000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def transaction(self):
+        return _Transaction(self.connection())
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back if the block raises."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _account_id(number):
+    return f"ACC-{number:03d}"
+
+
+def _parse_id(value, prefix):
+    value = value.strip().upper()
+    if value.startswith(prefix) and value[len(prefix):].isdigit():
+        return int(value[len(prefix):])
+    return None
+
+
+class SqliteAccountStore:
+    """AccountStore with the same interface, stored in SQLite.
+
+    Name search uses the account_words table: each query word becomes a range scan
+    over its primary key, and the scans are intersected in SQL.
+    """
+
+    def __init__(self, pool, accounts=SEED_ACCOUNTS):
+        self.pool = pool
+        with pool.transaction() as conn:
+            if not conn.execute("SELECT EXISTS (SELECT 1 FROM accounts)").fetchone()[0]:
+                for name, email in accounts:
+                    self._insert(conn, name, email)
+
+    def __len__(self):
+        return self.pool.connection().execute("SELECT count(*) FROM accounts").fetchone()[0]
+
+    @staticmethod
+    def _insert(conn, name, email):
+        email = email.strip()
+        try:
+            number = conn.execute(
+                "INSERT INTO accounts (name, email, email_key) VALUES (?, ?, ?)", (name, email, email_key(email))
+            ).lastrowid
+        except sqlite3.IntegrityError:
+            existing = conn.execute("SELECT id FROM accounts WHERE email_key = ?", (email_key(email),)).fetchone()[0]
+            raise ValueError(f"An account already exists for {email}: {_account_id(existing)}") from None
+        conn.executemany("INSERT INTO account_words (word, account_id) VALUES (?, ?)",
+                         [(word, number) for word in name_words(name)])
+        return Account(_account_id(number), name, email)
+
+    def create(self, name, email):
+        with self.pool.transaction() as conn:
+            return self._insert(conn, name, email)
+
+    def bulk_load(self, accounts):
+        """Insert many (name, email) pairs in a single transaction."""
+        with self.pool.transaction() as conn:
+            for name, email in accounts:
+                self._insert(conn, name, email)
+
+    def get(self, account_id):
+        number = _parse_id(account_id, "ACC-")
+        row = number and self.pool.connection().execute(
+            "SELECT id, name, email FROM accounts WHERE id = ?", (number,)).fetchone()
+        return Account(_account_id(row[0]), row[1], row[2]) if row else None
+
+    def update(self, account_id, name=None, email=None):
+        number = _parse_id(account_id, "ACC-")
+        with self.pool.transaction() as conn:
+            row = number and conn.execute("SELECT name, email FROM accounts WHERE id = ?", (number,)).fetchone()
+            if not row:
+                raise ValueError(f"No account found with ID {account_id}")
+            old_name, old_email = row
+            email = email and email.strip()
+            if email:
+                try:
+                    conn.execute("UPDATE accounts SET email = ?, email_key = ? WHERE id = ?",
+                                 (email, email_key(email), number))
+                except sqlite3.IntegrityError:
+                    existing = conn.execute("SELECT id FROM accounts WHERE email_key = ?",
+                                            (email_key(email),)).fetchone()[0]
+                    raise ValueError(f"An account already exists for {email}: {_account_id(existing)}") from None
+            if name and name != old_name:
+                conn.execute("UPDATE accounts SET name = ? WHERE id = ?", (name, number))
+                conn.executemany("DELETE FROM account_words WHERE word = ? AND account_id = ?",
+                                 [(word, number) for word in name_words(old_name)])
+                conn.executemany("INSERT INTO account_words (word, account_id) VALUES (?, ?)",
+                                 [(word, number) for word in name_words(name)])
+        return Account(_account_id(number), name or old_name, email or old_email)
+
+    def search(self, name=None, email=None, limit=10):
+        """Same matching rules and return value as AccountStore.search."""
+        selects, params = [], []
+        if email:
+            selects.append("SELECT id FROM accounts WHERE email_key = ?")
+            params.append(email_key(email))
+        for word in sorted(name_words(name or "")):
+            selects.append("SELECT account_id FROM account_words WHERE word >= ? AND word < ?")
+            params += [word, word + "\U0010ffff"]
+        if not selects:
+            return 0, []
+        matches = " INTERSECT ".join(selects)
+        conn = self.pool.connection()
+        count = conn.execute(f"SELECT count(*) FROM ({matches})", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT id, name, email FROM accounts WHERE id IN ({matches}) ORDER BY id LIMIT ?", params + [limit]
+        ).fetchall()
+        return count, [Account(_account_id(number), row_name, row_email) for number, row_name, row_email in rows]
+
+
+class SqliteReservationEngine(ReservationEngine):
+    """ReservationEngine whose bitmaps and reservations live in SQLite.
+
+    Args:
+        pool: ConnectionPool for the database file.
+        batch_size: Most bookings committed in one transaction.
+        Other arguments are as for ReservationEngine.
+    """
+
+    def __init__(self, pool, batch_size=64, first_id=101, **kwargs):
+        super().__init__(first_id=first_id, **kwargs)
+        self.pool = pool
+        self.batch_size = batch_size
+        with pool.transaction() as conn:
+            # Start reservation IDs at first_id on a fresh database.
+            conn.execute(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT 'reservations', ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'reservations')",
+                (first_id - 1,),
+            )
+        self._requests = queue.Queue()
+        self._writer = threading.Thread(target=self._write_batches, name="sqlite-bookings", daemon=True)
+        self._writer.start()
+
+    def _load_bitmaps(self, conn, date):
+        booked = [0] * len(self.tables)
+        for table, bitmap in conn.execute("SELECT table_index, booked FROM slot_bitmaps WHERE date = ?", (date,)):
+            booked[table] = bitmap
+        return booked
+
+    def available_slots(self, date, guests):
+        starts = self._starts_for(self._load_bitmaps(self.pool.connection(), parse_date(date)), guests)
+        return [slot for slot in range(NUM_SLOTS) if starts >> slot & 1]
+
+    def book(self, date, guests, name, time=None):
+        date = parse_date(date)
+        requested = None if time is None else parse_time(time)
+        future = Future()
+        self._requests.put(((date, guests, name, requested), future))
+        return future.result()
+
+    def close(self):
+        """Commit the bookings already queued, stop the writer thread and close the pool."""
+        self._requests.put(None)
+        self._writer.join()
+        self.pool.close()
+
+    def _write_batches(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            batch = [request]
+            while len(batch) < self.batch_size:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._requests.put(None)  # stop once this batch is committed
+                    break
+                batch.append(request)
+            try:
+                results = self._commit(batch)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+    def _commit(self, batch):
+        """Book every request in one transaction; returns a Reservation or ValueError for each.
+
+        The bitmaps are read inside the transaction, not cached, since other processes may
+        have booked since the last batch; each date is read once per batch.
+        """
+        results, days, changed = [], {}, set()
+        with self.pool.transaction() as conn:
+            for (date, guests, name, requested), _ in batch:
+                booked = days.get(date)
+                if booked is None:
+                    booked = days[date] = self._load_bitmaps(conn, date)
+                best = self._choose(booked, guests, requested)
+                if best is None:
+                    results.append(self._no_table(date, guests, requested))
+                    continue
+                slot, table = best
+                booked[table] |= self._span << slot
+                changed.add((date, table))
+                number = conn.execute(
+                    "INSERT INTO reservations (name, guests, date, slot, table_index, status) "
+                    "VALUES (?, ?, ?, ?, ?, 'Confirmed')",
+                    (name, guests, date, slot, table),
+                ).lastrowid
+                results.append(Reservation(f"RES-{number}", name, guests, date, slot, table))
+            conn.executemany(
+                "INSERT OR REPLACE INTO slot_bitmaps (date, table_index, booked) VALUES (?, ?, ?)",
+                [(date, table, days[date][table]) for date, table in changed],
+            )
+        return results
+
+    @staticmethod
+    def _row_to_reservation(row):
+        number, name, guests, date, slot, table, status = row
+        return Reservation(f"RES-{number}", name, guests, date, slot, table, status)
+
+    def get(self, reservation_id):
+        number = _parse_id(reservation_id, "RES-")
+        row = number and self.pool.connection().execute(
+            "SELECT id, name, guests, date, slot, table_index, status FROM reservations WHERE id = ?", (number,)
+        ).fetchone()
+        return self._row_to_reservation(row) if row else None
+
+    def cancel(self, reservation_id):
+        number = _parse_id(reservation_id, "RES-")
+        with self.pool.transaction() as conn:
+            row = number and conn.execute(
+                "SELECT id, name, guests, date, slot, table_index, status FROM reservations WHERE id = ?", (number,)
+            ).fetchone()
+            if not row:
+                raise ValueError(f"No reservation found with ID {reservation_id}")
+            reservation = self._row_to_reservation(row)
+            if reservation.status == "Cancelled":
+                raise ValueError(f"Reservation {reservation.id} is already cancelled")
+            conn.execute("UPDATE slot_bitmaps SET booked = booked & ? WHERE date = ? AND table_index = ?",
+                         (~(self._span << reservation.slot), reservation.date, reservation.table))
+            conn.execute("UPDATE reservations SET status = 'Cancelled' WHERE id = ?", (number,))
+        reservation.status = "Cancelled"
+        return reservation
+
+    def reservations(self):
+        rows = self.pool.connection().execute(
+            "SELECT id, name, guests, date, slot, table_index, status FROM reservations ORDER BY id")
+        return [self._row_to_reservation(row) for row in rows]
+
+
+def sqlite_stores(path, **engine_kwargs):
+    """(SqliteAccountStore, SqliteReservationEngine) on one ConnectionPool for `path`.
+
+    The engine's close() also closes the pool.
+    """
+    pool = ConnectionPool(path)
+    return SqliteAccountStore(pool), SqliteReservationEngine(pool, **engine_kwargs)
+
+
+def use_sqlite(path, **engine_kwargs):
+    """Point the account and booking tools at SQLite stores in `path`.
+
+    Returns:
+        (SqliteAccountStore, SqliteReservationEngine) now used by the tools.
+    """
+    accounts.ACCOUNTS, reservations.RESERVATIONS = sqlite_stores(path, **engine_kwargs)
+    return accounts.ACCOUNTS, reservations.RESERVATIONS
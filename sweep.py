@@ -0,0 +1,237 @@
+"""Sweep the prompt variants x models grid over a process pool.
+
+Each (variant, model) cell runs eval_runner.run_eval in its own worker process and
+appends its iterations to one .jsonl file in the usual results schema, so cells can be
+resumed and fed straight to evaluator.py.
+
+All processes share one RateLimiter per model ID: a token bucket in shared memory that
+every model call draws from, so the whole sweep stays under that model's request quota
+however many processes and threads are running. When Bedrock throttles a call anyway,
+the limiter halves that model's rate for every process at once and then creeps back up
+by a twentieth of the maximum per successful call (additive increase, multiplicative
+decrease); strands' own retry strategy resends the throttled call.
+
+With --stop, each cell stops early once its completeness and unauthorized-booking rates
+have settled (see stopping.py), and --iterations becomes the per-cell maximum.
+
+    python sweep.py --iterations 20 --rpm 120
+    python sweep.py --iterations 50 --rpm 120 --stop sprt
+    python sweep.py --local --iterations 50 --models sonnet=local-a kimi=local-b
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from strands.hooks import HookProvider
+from strands.hooks.events import AfterModelCallEvent, BeforeModelCallEvent
+from strands.types.exceptions import ModelThrottledException
+
+from eval_runner import VARIANTS, run_eval
+from results_io import JsonlWriter, completed_iterations, iter_results
+
+
+MODELS = {
+    "sonnet": "global.anthropic.claude-sonnet-4-5-20250929-v1:0",
+    "opus": "us.anthropic.claude-opus-4-20250514-v1:0",
+    "kimi": "moonshotai.kimi-k2.5",
+}
+
+
+class RateLimiter:
+    """Token bucket shared across processes, with AIMD rate adaptation.
+
+    The state lives in a multiprocessing.Array, so a limiter created before the process
+    pool starts is shared by every worker it is handed to (see the pool initializer).
+
+    Args:
+        rate: Maximum requests per second.
+        burst: Bucket size, the number of requests that may start at once after an idle
+            period. Defaults to one second's worth.
+        min_rate: Floor for the rate when backing off. Defaults to rate / 16.
+    """
+
+    def __init__(self, rate, burst=None, min_rate=None):
+        self.max_rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.burst = burst or max(1.0, rate)
+        # current rate, tokens in the bucket, time.monotonic() of the last update
+        self._state = multiprocessing.Array("d", [rate, self.burst, time.monotonic()])
+
+    @property
+    def rate(self):
+        return self._state[0]
+
+    def reserve(self):
+        """Take one token and return the seconds to wait before using it.
+
+        The bucket may go negative, so concurrent callers queue up behind each other
+        instead of all waking when the next token arrives.
+        """
+        with self._state.get_lock():
+            rate, tokens, updated = self._state
+            now = time.monotonic()
+            tokens = min(self.burst, tokens + (now - updated) * rate) - 1
+            self._state[1], self._state[2] = tokens, now
+        return -tokens / rate if tokens < 0 else 0.0
+
+    def throttled(self):
+        """Halve the rate and empty the bucket after the service throttled a request."""
+        with self._state.get_lock():
+            self._state[0] = max(self.min_rate, self._state[0] / 2)
+            self._state[1] = min(self._state[1], 0.0)
+
+    def succeeded(self):
+        """Raise the rate by a twentieth of the maximum, up to the maximum."""
+        with self._state.get_lock():
+            self._state[0] = min(self.max_rate, self._state[0] + self.max_rate / 20)
+
+
+class RateLimitHook(HookProvider):
+    """Makes every model call of an agent wait for a RateLimiter token and report throttling back to it."""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.throttles = 0
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeModelCallEvent, self._on_before_model_call)
+        registry.add_callback(AfterModelCallEvent, self._on_after_model_call)
+
+    async def _on_before_model_call(self, event):
+        delay = self.limiter.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _on_after_model_call(self, event):
+        if isinstance(event.exception, ModelThrottledException):
+            self.limiter.throttled()
+            with self._lock:
+                self.throttles += 1
+        elif event.stop_response is not None:
+            self.limiter.succeeded()
+
+
+def output_path(output_dir, label, variant):
+    return os.path.join(output_dir, f"{label}_{variant}_test_results.jsonl")
+
+
+_limiters = {}
+_progress = None
+
+
+def _init_worker(limiters, progress):
+    global _limiters, _progress
+    _limiters, _progress = limiters, progress
+
+
+def run_cell(variant, label, model_id, iterations, workers, output, resume=False, local=None, stop=None):
+    """Run one grid cell in a pool worker. Returns (variant, label, iterations run, throttles, iterations saved).
+
+    Args:
+        local: Optional dict of ScriptedModel pacing kwargs; runs the cell offline when given.
+        stop: Optional stopping rule (stopping.SPRT, stopping.WilsonWidth) to end the cell early.
+    """
+    hook = RateLimitHook(_limiters[model_id])
+    skip = completed_iterations(output) if resume else set()
+    if stop is not None:
+        from stopping import SequentialStop
+        stop = SequentialStop(stop, iterations)
+        if skip:
+            for entry in sorted(iter_results(output), key=lambda entry: entry["iteration"]):
+                stop.add(entry)
+    writer = JsonlWriter(output, append=resume)
+    model_factory = None
+    if local is not None:
+        from local_model import ScriptedModel
+        model_factory = lambda i: ScriptedModel(model_id=model_id, **local)
+
+    def on_result(entry):
+        writer.append(entry)
+        _progress.put((variant, label, hook.throttles, hook.limiter.rate))
+
+    try:
+        results = run_eval(iterations=iterations, workers=workers, model_id=model_id, variant=variant,
+                           model_factory=model_factory, on_result=on_result, skip=skip, hooks=[hook], stop=stop)
+    finally:
+        writer.close()
+    return variant, label, len(results), hook.throttles, iterations - len(results) - len(skip)
+
+
+def _report(progress, totals):
+    """Print a progress line per completed iteration until a None arrives on the queue."""
+    done = dict.fromkeys(totals, 0)
+    started = time.perf_counter()
+    for message in iter(progress.get, None):
+        variant, label, throttles, rate = message
+        done[variant, label] += 1
+        print(f"[{time.perf_counter() - started:7.1f}s] {label:<8} {variant:<17} "
+              f"{done[variant, label]:>4}/{totals[variant, label]:<4} rate {rate * 60:6.1f}/min  "
+              f"throttles {throttles}", flush=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--models", nargs="+", metavar="NAME=MODEL_ID",
+                        help=f"Models to sweep (default: {' '.join(MODELS)})")
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations per cell")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: one per cell)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent iterations within each cell")
+    parser.add_argument("--rpm", type=float, default=60, help="Model calls per minute allowed for each model ID")
+    parser.add_argument("--burst", type=float, help="Model calls per model ID that may start at once")
+    parser.add_argument("--output-dir", default="sweep_results")
+    parser.add_argument("--resume", action="store_true", help="Skip iterations already in each cell's file")
+    parser.add_argument("--stop", metavar="RULE",
+                        help="Stop each cell early once its rates settle: sprt, width or width:<half width>")
+    parser.add_argument("--local", action="store_true", help="Use the offline ScriptedModel instead of Bedrock")
+    parser.add_argument("--ttft", type=float, default=0.0, help="Synthetic time-to-first-token (s) for --local")
+    parser.add_argument("--tokens-per-second", type=float, help="Synthetic output rate for --local")
+    args = parser.parse_args()
+
+    stop = None
+    if args.stop:
+        from stopping import parse_rule
+        try:
+            stop = parse_rule(args.stop)
+        except ValueError as e:
+            parser.error(str(e))
+    models = dict(spec.split("=", 1) for spec in args.models) if args.models else MODELS
+    cells = [(variant, label, model_id) for label, model_id in models.items() for variant in args.variants]
+    limiters = {model_id: RateLimiter(args.rpm / 60, args.burst) for model_id in set(models.values())}
+    local = {"time_to_first_token": args.ttft, "tokens_per_second": args.tokens_per_second} if args.local else None
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    totals = {}
+    for variant, label, _ in cells:
+        path = output_path(args.output_dir, label, variant)
+        skip = completed_iterations(path) if args.resume else set()
+        totals[variant, label] = sum(1 for i in range(1, args.iterations + 1) if i not in skip)
+
+    progress = multiprocessing.Queue()
+    reporter = threading.Thread(target=_report, args=(progress, totals))
+    reporter.start()
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.processes or len(cells), initializer=_init_worker,
+                                 initargs=(limiters, progress)) as pool:
+            futures = [
+                pool.submit(run_cell, variant, label, model_id, args.iterations, args.workers,
+                            output_path(args.output_dir, label, variant), args.resume, local, stop)
+                for variant, label, model_id in cells
+            ]
+            summaries = [future.result() for future in as_completed(futures)]
+    finally:
+        progress.put(None)
+        reporter.join()
+
+    print(f"Swept {len(cells)} cells in {time.perf_counter() - started:.1f}s")
+    for variant, label, count, throttles, saved in sorted(summaries):
+        stopped = f", {saved} saved by early stopping" if stop else ""
+        print(f"  {output_path(args.output_dir, label, variant)}: {count} iterations, {throttles} throttled calls"
+              f"{stopped}")
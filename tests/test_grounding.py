@@ -0,0 +1,51 @@
+from grounding import CONTRADICTED, SUPPORTED, UNSUPPORTED, GroundingChecker
+
+CHECKER = GroundingChecker(cache_size=0)
+
+
+def assistant(*blocks):
+    return {"role": "assistant", "content": list(blocks)}
+
+
+def dietary_call(item_id):
+    return {"toolUse": {"toolUseId": item_id, "name": "get_dietary_values_per_item", "input": {"item_id": item_id}}}
+
+
+def test_made_with_is_not_a_hedge():
+    claims = CHECKER.extract("The Margherita Pizza is made with fresh basil and is vegetarian.")
+    assert [claim[:4] for claim in claims] == [("M003", "Vegetarian", True, False)]
+
+
+def test_made_with_claim_is_still_judged():
+    claims = CHECKER.check([assistant({"text": "Our Grilled Salmon is made with lemon butter and is vegan."})])
+    assert [(claim.item, claim.hedged, claim.status) for claim in claims] == [("M001", False, CONTRADICTED)]
+
+
+def test_could_be_made_is_hedged():
+    claims = CHECKER.check([assistant({"text": "The Margherita Pizza could be made vegan on request."})])
+    assert [(claim.item, claim.positive, claim.hedged, claim.status) for claim in claims] == \
+        [("M003", True, True, UNSUPPORTED)]
+
+
+def test_obviously_is_an_assertion():
+    claims = CHECKER.check([assistant({"text": "The Beef Tenderloin is obviously not vegan."})])
+    assert [(claim.item, claim.positive, claim.hedged, claim.status) for claim in claims] == \
+        [("M004", False, False, UNSUPPORTED)]
+
+
+def test_obviously_wrong_claim_is_contradicted():
+    claims = CHECKER.check([assistant({"text": "The Chocolate Lava Cake is obviously not vegan."})])
+    assert [(claim.item, claim.hedged, claim.status) for claim in claims] == [("M005", False, CONTRADICTED)]
+
+
+def test_obviously_true_claim_is_supported_after_the_tool_call():
+    claims = CHECKER.check([
+        assistant(dietary_call("M005")),
+        assistant({"text": "The Chocolate Lava Cake is obviously vegan!"}),
+    ])
+    assert [(claim.item, claim.hedged, claim.status) for claim in claims] == [("M005", False, SUPPORTED)]
+
+
+def test_other_contractions_negate():
+    claims = CHECKER.extract("The Grilled Salmon wouldn't be vegetarian.")
+    assert [claim[:4] for claim in claims] == [("M001", "Vegetarian", False, False)]
@@ -0,0 +1,20 @@
+from benchmarks.bench_guard import measure
+from guards import Continuation
+
+
+def test_continuation_averages_shadow_reports():
+    skipped = [
+        {"model_calls": 1, "output_tokens": 100, "tool_calls": {}},
+        {"model_calls": 2, "output_tokens": 500, "tool_calls": {"get_dietary_values_per_item": 2}},
+    ]
+    reports = [{"enforced": False, "ending_rule": "rule", "skipped": s} for s in skipped]
+    reports.append({"enforced": False, "ending_rule": None, "skipped": skipped[0]})
+    assert Continuation.from_reports(reports) == {
+        "rule": Continuation(model_calls=1.5, output_tokens=200, tool_calls={"get_dietary_values_per_item": 1}),
+    }
+
+
+def test_estimated_saving_tracks_bench_guard():
+    m = measure("sonnet_test_results.json", ttft=0.1, tokens_per_second=400)
+    assert m["model_calls_saved"] > 1
+    assert abs(m["estimated_ms_saved"] - m["ms_saved"]) <= 0.15 * m["ms_saved"]
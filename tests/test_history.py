@@ -0,0 +1,12 @@
+import accounts
+import agent
+import reservations
+from history import TOOL_TURNS
+
+
+def test_tool_results_match_the_real_tools():
+    for turn in TOOL_TURNS:
+        # SEED_ACCOUNTS already holds the account the history's create_account turn makes.
+        seed = () if turn.tool.name == "create_account" else accounts.SEED_ACCOUNTS
+        with accounts.scoped(accounts.AccountStore(seed)), reservations.scoped(reservations.ReservationEngine()):
+            assert getattr(agent, turn.tool.name)(**turn.tool.input) == turn.tool.result, turn.tool.name
@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from history import SharedHistory
+from snapshot import PrefixStore
+
+
+def history(n):
+    return SharedHistory([{"role": "user", "content": [{"text": f"message {n}"}]}])
+
+
+def test_least_recently_used_prefix_is_evicted():
+    store = PrefixStore(max_entries=2)
+    first, second = history(1), history(2)
+    first_digest = store.add(first)
+    second_digest = store.add(second)
+    assert store.match(first.fork()) == (first_digest, 1)
+    store.add(history(3))
+    assert len(store) == 2 and store.evictions == 1
+    assert store.get(first_digest) is first
+    with pytest.raises(ValueError):
+        store.get(second_digest)
+
+
+def test_concurrent_add_and_match_stay_bounded():
+    store = PrefixStore(max_entries=8)
+    histories = [history(n) for n in range(200)]
+
+    def work(offset):
+        for h in histories[offset::4]:
+            store.add(h)
+            store.match(h.fork())
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store) == 8
+    assert len(store._digests) == 8
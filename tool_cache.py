@@ -0,0 +1,251 @@
+"""Memoized results for read-only tools, with TTL, LRU eviction and write invalidation.
+
+Agents ask for the same things over and over: the menu, the same item's dietary
+values, availability for the same date. ToolCacheHook answers a call to a cached
+read-only tool from a ToolResultCache keyed on the tool name plus its normalized input
+(keys sorted, strings stripped, *_id values upper-cased), swapping in a stand-in tool
+that returns the stored result, so the real tool never runs. Entries expire after
+their rule's TTL and the least recently used entry is evicted once the cache is full.
+
+Write tools invalidate what they change: create_booking drops availability for its
+date and the details lookup of the reservation it created; cancel_reservation drops
+that reservation's details and all availability (its input doesn't say which date);
+create_account and update_account drop account searches. A read that started before an
+invalidation is not stored, so a result computed against the old state can't be cached
+after the write.
+
+Only successful results are cached. One cache can back many agents; results are shared
+between sessions the same way the stores behind the tools are.
+
+    agent = create_agent(tool_cache=True)
+    python -m benchmarks.bench_tool_cache --latency 0.05
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+from strands.hooks import HookProvider
+from strands.hooks.events import AfterToolCallEvent, BeforeToolCallEvent
+from strands.tools.tools import PythonAgentTool
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """A read-only tool whose results may be cached for `ttl` seconds (None: until invalidated)."""
+
+    tool: str
+    ttl: float | None
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    """Entries of `read_tool` that a successful `write_tool` call makes stale.
+
+    Attributes:
+        write_tool: Tool that changes state.
+        read_tool: Cached tool whose results it may change.
+        match: Function (write input, write result text, cached read input) -> True if
+            that entry is stale. None invalidates every entry of read_tool.
+    """
+
+    write_tool: str
+    read_tool: str
+    match: Callable[[dict, str, dict], bool] | None = None
+
+
+def _mentions(text, value):
+    return isinstance(value, str) and re.search(rf"\b{re.escape(value)}\b", text) is not None
+
+
+DEFAULT_RULES = (
+    CacheRule("get_menu", ttl=300),
+    CacheRule("get_dietary_values_per_item", ttl=300),
+    CacheRule("get_dietary_values", ttl=300),
+    CacheRule("find_items_by_diet", ttl=300),
+    CacheRule("check_availability", ttl=30),
+    CacheRule("check_reservation_details", ttl=30),
+    CacheRule("search_account", ttl=30),
+)
+
+DEFAULT_INVALIDATIONS = (
+    Invalidation("create_booking", "check_availability",
+                 lambda write, result, read: read.get("date") == write.get("date")),
+    Invalidation("create_booking", "check_reservation_details",
+                 lambda write, result, read: _mentions(result, read.get("reservation_id"))),
+    Invalidation("cancel_reservation", "check_availability"),
+    Invalidation("cancel_reservation", "check_reservation_details",
+                 lambda write, result, read: read.get("reservation_id") == write.get("reservation_id")),
+    Invalidation("create_account", "search_account"),
+    Invalidation("update_account", "search_account"),
+)
+
+
+def normalize_input(tool_input):
+    """Canonical form of a tool input: strings stripped, *_id values upper-cased."""
+    if isinstance(tool_input, dict):
+        return {key: (value.strip().upper() if isinstance(value, str) and key.endswith("_id")
+                      else normalize_input(value)) for key, value in tool_input.items()}
+    if isinstance(tool_input, list):
+        return [normalize_input(value) for value in tool_input]
+    if isinstance(tool_input, str):
+        return tool_input.strip()
+    return tool_input
+
+
+class ToolResultCache:
+    """Thread-safe TTL + LRU cache of tool result content.
+
+    Args:
+        rules: CacheRules naming the cacheable tools and their TTLs.
+        invalidations: Invalidations applied after successful write tool calls.
+        max_entries: Entries kept before the least recently used is evicted.
+        clock: Time source in seconds, for tests and simulations.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, invalidations=DEFAULT_INVALIDATIONS, max_entries=1024,
+                 clock=time.monotonic):
+        self.ttls = {rule.tool: rule.ttl for rule in rules}
+        self._invalidations = {}
+        for invalidation in invalidations:
+            self._invalidations.setdefault(invalidation.write_tool, []).append(invalidation)
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # (tool, key) -> (expires_at, content, normalized input)
+        self._keys_by_tool = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.expirations = self.evictions = self.invalidations = 0
+
+    def cacheable(self, tool):
+        return tool in self.ttls
+
+    def _key(self, tool, tool_input):
+        normalized = normalize_input(tool_input)
+        return (tool, json.dumps(normalized, sort_keys=True, separators=(",", ":"))), normalized
+
+    def _drop(self, key):
+        del self._entries[key]
+        self._keys_by_tool[key[0]].discard(key)
+
+    def get(self, tool, tool_input):
+        """Cached result content for this call, or None on a miss."""
+        key, _ = self._key(tool, tool_input)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= self.clock():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    @property
+    def generation(self):
+        """Bumped by every invalidation; pass the value seen before a read to put()."""
+        return self._generation
+
+    def put(self, tool, tool_input, content, generation=None):
+        """Store a result. Skipped if an invalidation happened since `generation` was read."""
+        key, normalized = self._key(tool, tool_input)
+        ttl = self.ttls[tool]
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (None if ttl is None else self.clock() + ttl, content, normalized)
+            self._keys_by_tool.setdefault(tool, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, write_tool, write_input, result_text=""):
+        """Drop the entries a successful call to `write_tool` made stale. Returns how many."""
+        rules = self._invalidations.get(write_tool)
+        if not rules:
+            return 0
+        write_input = normalize_input(write_input)
+        dropped = 0
+        with self._lock:
+            self._generation += 1
+            for rule in rules:
+                for key in list(self._keys_by_tool.get(rule.read_tool, ())):
+                    if rule.match is None or rule.match(write_input, result_text, self._entries[key][2]):
+                        self._drop(key)
+                        dropped += 1
+            self.invalidations += dropped
+        return dropped
+
+    def stats(self):
+        """Hit, miss, expiry, eviction and invalidation counts, plus the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _result_text(result):
+    return " ".join(item.get("text", "") for item in result.get("content", []))
+
+
+class _CachedResult(PythonAgentTool):
+    """Stand-in for a tool that returns a cached result instead of running it."""
+
+    def __init__(self, name, tool_spec, content):
+        super().__init__(name, tool_spec, lambda tool_use, **kwargs: {
+            "toolUseId": tool_use["toolUseId"], "status": "success", "content": content,
+        })
+
+
+class ToolCacheHook(HookProvider):
+    """Serves cacheable tool calls from a ToolResultCache and feeds it results and invalidations."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._generations = {}
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeToolCallEvent, self._on_before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self._on_after_tool_call)
+
+    def _on_before_tool_call(self, event):
+        name = event.tool_use["name"]
+        if event.selected_tool is None or event.cancel_tool or not self.cache.cacheable(name):
+            return
+        self._generations[event.tool_use["toolUseId"]] = self.cache.generation
+        content = self.cache.get(name, event.tool_use["input"])
+        if content is not None:
+            event.selected_tool = _CachedResult(name, event.selected_tool.tool_spec, content)
+
+    def _on_after_tool_call(self, event):
+        name = event.tool_use["name"]
+        generation = self._generations.pop(event.tool_use["toolUseId"], None)
+        result = event.result
+        if event.cancel_message is not None or not isinstance(result, dict) or result.get("status") != "success":
+            return
+        if isinstance(event.selected_tool, _CachedResult):
+            return
+        if self.cache.cacheable(name):
+            self.cache.put(name, event.tool_use["input"], result["content"], generation)
+        else:
+            self.cache.invalidate(name, event.tool_use["input"], _result_text(result))
+
+
+# Cache used by create_agent(tool_cache=True), shared by every agent in the process.
+SHARED_CACHE = ToolResultCache()
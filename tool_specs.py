@@ -0,0 +1,100 @@
+"""Tool-spec token accounting and compact specs derived from the same tool functions.
+
+Every request carries the system prompt and the spec of every registered tool, so the
+docstrings of the tool functions are paid for in input tokens (and prefill time) on
+every model call. prompt_eng_agent.py's multi-paragraph docstrings make its specs
+several times the size of agent.py's one-liners. spec_tokens() counts a spec the way
+local_model and history estimate tokens (about 4 characters of JSON per token);
+spec_report() breaks a tool list down per tool.
+
+compact_tool() rebuilds a tool from the same function with a minimal spec: the first
+sentence of the description and of each parameter description, with examples, format
+notes and the Returns section dropped. Names, types, defaults and required parameters
+are unchanged, so the model can make exactly the same calls.
+
+    python tool_specs.py
+    agent = create_agent(compact_specs=True)
+    python eval_runner.py --variant prompt_eng_agent --compact-specs --output compact_test_results.json
+"""
+
+import functools
+import json
+import math
+import re
+
+from strands import tool
+
+
+_SENTENCE_END = re.compile(r"(?<=[a-z0-9)])\.(?:\s|$)")
+
+
+def spec_tokens(spec):
+    """Estimated input tokens of one tool spec (or any JSON value): 4 characters per token."""
+    return math.ceil(len(json.dumps(spec)) / 4)
+
+
+def first_sentence(text):
+    """First sentence of the first line of a description, without a trailing parenthetical."""
+    line = text.strip().split("\n", 1)[0].strip()
+    line = line.split(" (", 1)[0]
+    end = _SENTENCE_END.search(line)
+    sentence = line[:end.start()] if end else line.rstrip(".")
+    return sentence + "." if sentence else sentence
+
+
+def compact_spec(spec):
+    """A copy of `spec` with every description cut to its first sentence."""
+    schema = json.loads(json.dumps(spec["inputSchema"]["json"]))
+    for prop in schema.get("properties", {}).values():
+        if "description" in prop:
+            prop["description"] = first_sentence(prop["description"])
+    return {"name": spec["name"], "description": first_sentence(spec["description"]), "inputSchema": {"json": schema}}
+
+
+@functools.lru_cache(maxsize=None)
+def compact_tool(agent_tool):
+    """The same @tool function registered under a compact spec. Built once per tool."""
+    spec = compact_spec(agent_tool.tool_spec)
+    return tool(agent_tool.__wrapped__, name=spec["name"], description=spec["description"],
+                inputSchema=spec["inputSchema"])
+
+
+def compact_tools(tools):
+    """compact_tool() applied to a tool list, e.g. a variant's TOOLS."""
+    return [compact_tool(agent_tool) for agent_tool in tools]
+
+
+def spec_report(tools, system_prompt=""):
+    """Per-tool spec tokens, their total and the system prompt's, for one tool list."""
+    per_tool = {agent_tool.tool_name: spec_tokens(agent_tool.tool_spec) for agent_tool in tools}
+    return {"tools": per_tool, "tool_total": sum(per_tool.values()), "system_prompt": spec_tokens(system_prompt)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import importlib
+
+    from eval_runner import TOOL_SET_NAMES, VARIANTS
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tools", dest="tool_set", choices=TOOL_SET_NAMES, default="per_item")
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON instead of a table")
+    args = parser.parse_args()
+
+    reports = {}
+    for variant in VARIANTS:
+        module = importlib.import_module(variant)
+        tools = module.TOOL_SETS[args.tool_set]
+        reports[variant] = spec_report(tools, module.SYSTEM_PROMPT)
+        reports[f"{variant} (compact)"] = spec_report(compact_tools(tools), module.SYSTEM_PROMPT)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        columns = list(reports)
+        names = list(reports[columns[0]]["tools"])
+        print(f"{'tool':<30}" + "".join(f"{column:>28}" for column in columns))
+        for name in names:
+            print(f"{name:<30}" + "".join(f"{reports[column]['tools'][name]:>28}" for column in columns))
+        print(f"{'all tool specs':<30}" + "".join(f"{reports[column]['tool_total']:>28}" for column in columns))
+        print(f"{'system prompt':<30}" + "".join(f"{reports[column]['system_prompt']:>28}" for column in columns))